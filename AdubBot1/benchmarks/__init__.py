@@ -0,0 +1 @@
+# Benchmarks of the bot's hot paths. Run them from the AdubBot1 directory, e.g. python -m benchmarks.suite
@@ -0,0 +1,173 @@
+# Reports how much memory the bot allocates per tick. Ticks are recorded from a simulated 1v1 and then fed to a fresh
+# bot, which is measured in two passes:
+#   - tracemalloc gives the peak of the memory allocated during each tick (the temporaries) and what is retained
+#   - cProfile counts the constructor calls of the state classes below, i.e. how many of them are created per tick
+# Results can be saved as JSON and compared, to show the effect of a change.
+#
+# Usage, from the AdubBot1 directory:
+#   python -m benchmarks.allocations --save before.json
+#   python -m benchmarks.allocations --compare before.json
+
+import argparse
+import cProfile
+import json
+import pstats
+import statistics
+import sys
+import tracemalloc
+from typing import Dict, List, Tuple
+
+from rlbot.agents.base_agent import SimpleControllerState
+from rlbot.utils.structures.ball_prediction_struct import BallPrediction
+
+from headless.framework import AgentHost
+from headless.simulator import Simulator
+
+from util.info import Ball, Car
+from util.predict import DummyObject, UncertainEvent
+from util.sequence import StepResult
+from util.vec import Vec3, Mat33
+
+WARMUP_TICKS = 120
+
+TRACKED_CLASSES = {
+    "Vec3": (Vec3, lambda: Vec3()),
+    "Mat33": (Mat33, lambda: Mat33()),
+    "DummyObject": (DummyObject, lambda: DummyObject()),
+    "UncertainEvent": (UncertainEvent, lambda: UncertainEvent(False, 0.0)),
+    "SimpleControllerState": (SimpleControllerState, lambda: SimpleControllerState()),
+    "StepResult": (StepResult, lambda: StepResult(None, False)),
+    "Ball": (Ball, lambda: Ball()),
+    "Car": (Car, lambda: Car()),
+}
+
+
+def instance_size(obj) -> int:
+    """ Bytes used by the object itself and its __dict__, if it has one. Attribute values are not counted """
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def record_ticks(seconds: float, seed: int) -> List[Tuple[object, BallPrediction]]:
+    """ Plays a 1v1 from a kickoff and returns every tick's packet and ball prediction """
+    sim = Simulator(1, 1, seed=seed)
+    sim.reset_kickoff()
+    ticks = []
+    for _ in range(int(seconds * 120)):
+        prediction = sim.future.prediction_at(sim.ball, sim.tick, sim.time)
+        ticks.append((sim.packet(), BallPrediction.from_buffer_copy(prediction)))
+        sim.step()
+    sim.retire()
+    return ticks
+
+
+def measure_memory(ticks) -> Dict[str, float]:
+    host = AgentHost()
+    for packet, prediction in ticks[:WARMUP_TICKS]:
+        host.tick(packet, prediction)
+
+    peaks = []
+    retained = 0
+    tracemalloc.start()
+    for packet, prediction in ticks[WARMUP_TICKS:]:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        host.tick(packet, prediction)
+        current, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+        retained += current - before
+    tracemalloc.stop()
+    host.retire()
+    return {
+        "peak_bytes_median": statistics.median(peaks),
+        "peak_bytes_max": max(peaks),
+        "retained_bytes_per_tick": retained / len(peaks),
+    }
+
+
+def count_allocations(ticks) -> Dict[str, float]:
+    host = AgentHost()
+    for packet, prediction in ticks[:WARMUP_TICKS]:
+        host.tick(packet, prediction)
+
+    profile = cProfile.Profile()
+    profile.enable()
+    for packet, prediction in ticks[WARMUP_TICKS:]:
+        host.tick(packet, prediction)
+    profile.disable()
+    host.retire()
+
+    # Constructors are found by the file and line of their __init__
+    constructors = {}
+    for name, (cls, _) in TRACKED_CLASSES.items():
+        code = cls.__init__.__code__
+        constructors[(code.co_filename, code.co_firstlineno)] = name
+    counts = {name: 0 for name in TRACKED_CLASSES}
+    for (filename, line, function), stat in pstats.Stats(profile).stats.items():
+        name = constructors.get((filename, line))
+        if name is not None and function == "__init__":
+            counts[name] += stat[1]  # Number of calls, including recursive ones
+    num_ticks = len(ticks) - WARMUP_TICKS
+    return {name: count / num_ticks for name, count in counts.items()}
+
+
+def measure(seconds: float, seed: int) -> dict:
+    ticks = record_ticks(seconds, seed)
+    sizes = {name: instance_size(make()) for name, (_, make) in TRACKED_CLASSES.items()}
+    counts = count_allocations(ticks)
+    return {
+        "ticks": len(ticks) - WARMUP_TICKS,
+        "memory": measure_memory(ticks),
+        "objects_per_tick": counts,
+        "object_bytes_per_tick": {name: counts[name] * sizes[name] for name in counts},
+        "instance_bytes": sizes,
+    }
+
+
+def print_report(result: dict, baseline: dict=None):
+    def fmt(value: float, unit: str, base: float=None) -> str:
+        text = f"{value:12.1f} {unit}"
+        if base is not None:
+            change = (value - base) / base * 100 if base else 0.0
+            text += f"   was {base:12.1f} ({change:+6.1f}%)"
+        return text
+
+    print(f"{result['ticks']} ticks of a simulated 1v1, after {WARMUP_TICKS} warmup ticks")
+    print("\nMemory allocated per tick (tracemalloc)")
+    for key, label in [("peak_bytes_median", "peak, median"), ("peak_bytes_max", "peak, max"),
+                       ("retained_bytes_per_tick", "retained")]:
+        base = baseline["memory"][key] if baseline else None
+        print(f"  {label:<22}{fmt(result['memory'][key], 'B', base)}")
+
+    print("\nObjects created per tick (cProfile), and their size without attribute values")
+    for name in TRACKED_CLASSES:
+        count = result["objects_per_tick"][name]
+        size = result["object_bytes_per_tick"][name]
+        base_count = baseline["objects_per_tick"].get(name) if baseline else None
+        base_size = baseline["object_bytes_per_tick"].get(name) if baseline else None
+        print(f"  {name:<22}{fmt(count, '/tick', base_count)}")
+        print(f"  {'':<22}{fmt(size, 'B', base_size)}   ({result['instance_bytes'][name]} B each)")
+    total = sum(result["object_bytes_per_tick"].values())
+    base_total = sum(baseline["object_bytes_per_tick"].values()) if baseline else None
+    print(f"  {'total':<22}{fmt(total, 'B', base_total)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report the bot's memory allocations per tick")
+    parser.add_argument("--seconds", type=float, default=10.0, help="seconds of play to record")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare against results saved with --save")
+    args = parser.parse_args()
+
+    result = measure(args.seconds, args.seed)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+    print_report(result, baseline)
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(result, file, indent=2)
@@ -0,0 +1,37 @@
+# Measures the per-tick cost of GameInfo.read_packet on synthetic packets.
+# Run from the AdubBot1 directory: python -m benchmarks.bench_read_packet
+
+import random
+import time
+
+from headless.game_state import make_field_info, make_packet
+
+from util.info import GameInfo
+
+CAR_COUNTS = [2, 6, 64]
+PACKETS_PER_RUN = 50
+ITERATIONS = 2000
+
+
+def bench_read_packet(num_cars: int, iterations: int = ITERATIONS) -> float:
+    """
+    Returns the average time in microseconds it takes to parse one packet with num_cars cars.
+    """
+    rng = random.Random(num_cars)
+    packets = [make_packet(num_cars, rng, time=10.0 + i / 120) for i in range(PACKETS_PER_RUN)]
+
+    info = GameInfo(0, 0)
+    info.read_field_info(make_field_info())
+    info.read_packet(packets[0])  # First packet allocates the cars
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        info.read_packet(packets[i % PACKETS_PER_RUN])
+    end = time.perf_counter()
+
+    return (end - start) / iterations * 1e6
+
+
+if __name__ == "__main__":
+    for count in CAR_COUNTS:
+        print(f"read_packet, {count:>2} cars: {bench_read_packet(count):8.1f} us/tick")
@@ -0,0 +1,46 @@
+# Measures how much of the per-tick parsing is saved when several bots in one process share a WorldModel.
+# Run from the AdubBot1 directory: python -m benchmarks.bench_world_model
+
+import random
+import time
+
+from headless.ball_prediction import predict_packet
+from headless.game_state import make_field_info, make_packet
+
+from util.info import GameInfo
+from util.world_model import WorldModel
+
+BOT_COUNTS = [1, 2, 6, 10]
+PACKETS = 200
+
+
+def bench_world_model(num_bots: int, shared: bool) -> float:
+    """
+    Returns the average time in microseconds all bots spend per packet building frames and reading the packet.
+    """
+    rng = random.Random(num_bots)
+    packets = [make_packet(num_bots, rng, time=10.0 + i / 120) for i in range(PACKETS)]
+    predictions = [predict_packet(packet) for packet in packets]
+
+    field_info = make_field_info()
+    infos = [GameInfo(i, i % 2) for i in range(num_bots)]
+    for info in infos:
+        info.read_field_info(field_info)
+    shared_model = WorldModel()
+    models = [shared_model if shared else WorldModel() for _ in range(num_bots)]
+
+    start = time.perf_counter()
+    for packet, prediction in zip(packets, predictions):
+        for info, model in zip(infos, models):
+            frame = model.get_frame(packet, lambda: prediction)
+            info.read_packet(packet, frame)
+    end = time.perf_counter()
+
+    return (end - start) / PACKETS * 1e6
+
+
+if __name__ == "__main__":
+    for count in BOT_COUNTS:
+        separate = bench_world_model(count, shared=False)
+        shared = bench_world_model(count, shared=True)
+        print(f"{count:>2} bots: separate {separate:8.1f} us/packet, shared {shared:8.1f} us/packet")
@@ -0,0 +1,127 @@
+# Measures how long the bot takes to start: from launching a fresh Python process to the first valid get_output.
+# The time is split into phases (interpreter start, importing bot.py, creating and initializing the agent, the first
+# tick) and the import phase is broken down per module with python -X importtime.
+#
+# Usage, from the AdubBot1 directory:
+#   python -m benchmarks.startup             # median of 5 fresh processes
+#   python -m benchmarks.startup --runs 20 --modules 30
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+PHASES = ["interpreter", "import bot", "initialize_agent", "first get_output"]
+BOT_PACKAGES = {"bot", "behaviors", "controllers", "maneuvers", "util"}
+IMPORTS_DONE = "-- bot.py imported --"
+
+
+def child():
+    """ Runs in the measured process. Prints the monotonic time at the end of each phase as JSON """
+    started = time.monotonic()
+    import headless  # Only puts src/ on the path
+
+    import bot
+    imported = time.monotonic()
+    print(IMPORTS_DONE, file=sys.stderr, flush=True)
+
+    # Setting up the host and the packet isn't part of the bot's startup. It is measured and left out of the total
+    import random
+    from headless.framework import AgentHost
+    from headless.game_state import make_packet
+    packet = make_packet(2, random.Random(0))
+    host_start = time.monotonic()
+
+    host = AgentHost(bot.MyBot, catch_errors=False)
+    initialized = time.monotonic()
+    host.tick(packet)
+    first_output = time.monotonic()
+    host.retire()
+
+    from util.table_cache import load_times
+    print(json.dumps({"started": started, "imported": imported, "host_start": host_start,
+                      "initialized": initialized, "first_output": first_output, "tables": load_times}))
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, float]]:
+    """ Returns (module, self time in seconds) for every import made by bot.py in python -X importtime output """
+    modules = []
+    for line in stderr.splitlines():
+        if line == IMPORTS_DONE:
+            break
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us) / 1e6))
+    return modules
+
+
+def measure_once() -> Tuple[Dict[str, float], List[Tuple[str, float]], Dict[str, Tuple[float, str]]]:
+    launched = time.monotonic()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-m", "benchmarks.startup", "--child"],
+                          capture_output=True, text=True, check=True)
+    marks = json.loads(proc.stdout.strip().splitlines()[-1])
+    phases = {
+        "interpreter": marks["started"] - launched,
+        "import bot": marks["imported"] - marks["started"],
+        "initialize_agent": marks["initialized"] - marks["host_start"],
+        "first get_output": marks["first_output"] - marks["initialized"],
+    }
+    phases["total"] = sum(phases.values())
+    return phases, parse_importtime(proc.stderr), marks["tables"]
+
+
+def group(module: str) -> str:
+    """ The bot's own modules are listed one by one, everything else by top level package """
+    top = module.split(".")[0]
+    return module if top in BOT_PACKAGES else top
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the bot's startup time")
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes to measure")
+    parser.add_argument("--modules", type=int, default=20, help="number of modules to list")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        sys.exit(0)
+
+    phase_times = defaultdict(list)
+    module_times = defaultdict(list)
+    table_times = defaultdict(list)
+    for _ in range(args.runs):
+        phases, modules, tables = measure_once()
+        for name, (seconds, status) in tables.items():
+            table_times[name].append((seconds, status))
+        for phase, seconds in phases.items():
+            phase_times[phase].append(seconds)
+        grouped = defaultdict(float)
+        for module, seconds in modules:
+            grouped[group(module)] += seconds
+        for name, seconds in grouped.items():
+            module_times[name].append(seconds)
+
+    print(f"Median of {args.runs} runs")
+    for phase in PHASES + ["total"]:
+        print(f"{phase:<20} {statistics.median(phase_times[phase]) * 1e3:8.1f} ms")
+
+    print("\nTime spent importing bot.py, per module (self time, the bot's own modules listed individually)")
+    medians = sorted(((statistics.median(times), name) for name, times in module_times.items()), reverse=True)
+    for seconds, name in medians[:args.modules]:
+        print(f"{name:<40} {seconds * 1e3:8.2f} ms")
+    bot_total = sum(seconds for seconds, name in medians if name.split(".")[0] in BOT_PACKAGES)
+    print(f"{'(all of the bot modules)':<40} {bot_total * 1e3:8.2f} ms")
+
+    if table_times:
+        # The first run may have built tables that the later runs loaded from the cache
+        print("\nPrecomputed tables (see util/table_cache.py)")
+        for name, times in sorted(table_times.items()):
+            built = sum(1 for _, status in times if status == "built")
+            print(f"{name:<40} {statistics.median(seconds for seconds, _ in times) * 1e3:8.2f} ms, "
+                  f"built in {built} of {len(times)} runs")
@@ -0,0 +1,337 @@
+# A benchmark suite for the bot's hot paths, from single vector operations up to a full MyBot.get_output tick.
+# All states are synthetic and seeded, so two runs measure the same work. Results can be saved as JSON and compared
+# against a stored baseline; a benchmark regresses when its fastest repeat gets slower by more than its threshold.
+# The fastest repeat is used rather than the median, since other processes only ever make a repeat slower.
+#
+# Timings depend on the machine, so no baseline is checked in. Make one locally first, on the reference commit and on
+# the machine the comparison will run on, e.g. from a checkout made with git worktree.
+#
+# Usage, from the AdubBot1 directory:
+#   python -m benchmarks.suite --save benchmarks/baseline.json     # on the reference commit, makes the baseline
+#   python -m benchmarks.suite --compare benchmarks/baseline.json  # after a change, exits with 1 on regressions
+#   python -m benchmarks.suite --filter vec --filter field_sdf     # only benchmarks whose names contain a filter
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from headless.ball_prediction import predict_packet
+from headless.framework import AgentHost
+from headless.game_state import make_field_info, make_packet
+
+from controllers.aim_cone import AimCone
+from util import predict
+from util.ball_prediction_analysis import find_slice_at_time, predict_future_goal
+from util.field_sdf import sdf_wall_dist, sdf_normal
+from util.vec import Vec3, Mat33, norm, normalize, dot, cross, euler_to_rotation
+
+SEED = 1234
+STATES = 16  # Number of different game states the bot level benchmarks cycle through
+REPEATS = 15
+MIN_REPEAT_TIME = 0.05  # Seconds. Each repeat calls the benchmark often enough to take at least this long
+
+DEFAULT_THRESHOLD = 0.25  # Allowed relative slowdown of the fastest repeat before a benchmark counts as a regression
+
+
+class Benchmark:
+    def __init__(self, name: str, setup: Callable[[random.Random], Callable[[], int]], threshold: float=None):
+        self.name = name
+        self.setup = setup  # Returns a function that does some work and returns the number of operations it did
+        self.threshold = threshold
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str, threshold: float=None):
+    """ Registers the decorated setup function as a benchmark """
+    def register(setup):
+        BENCHMARKS.append(Benchmark(name, setup, threshold))
+        return setup
+    return register
+
+
+# Helpers
+
+def random_vec(rng: random.Random, lo=(-4000, -5000, 0), hi=(4000, 5000, 2000)) -> Vec3:
+    return Vec3(rng.uniform(lo[0], hi[0]), rng.uniform(lo[1], hi[1]), rng.uniform(lo[2], hi[2]))
+
+
+def make_host(packet, field_info) -> AgentHost:
+    """ Returns a host of a MyBot that has read the given packet """
+    host = AgentHost(name="Benchmark", field_info=field_info)
+    host.tick(packet)
+    return host
+
+
+def make_bots(rng: random.Random, num_cars: int=2) -> list:
+    field_info = make_field_info()
+    return [make_host(make_packet(num_cars, rng, time=10.0 + i), field_info).agent for i in range(STATES)]
+
+
+def enemy_goal_cone(bot) -> AimCone:
+    ball = bot.info.ball
+    return AimCone(bot.info.enemy_goal_right - ball.pos, bot.info.enemy_goal_left - ball.pos)
+
+
+# Micro benchmarks
+
+@benchmark("vec.arithmetic")
+def bench_vec_arithmetic(rng):
+    pairs = [(random_vec(rng), random_vec(rng)) for _ in range(64)]
+
+    def run():
+        for a, b in pairs:
+            normalize(cross(a - b, (a + b) * 0.5))
+            norm(a)
+            dot(a, b)
+        return len(pairs)
+    return run
+
+
+@benchmark("vec.rotation")
+def bench_vec_rotation(rng):
+    angles = [Vec3(rng.uniform(-1.5, 1.5), rng.uniform(-3.1, 3.1), rng.uniform(-3.1, 3.1)) for _ in range(64)]
+    v = Vec3(1, 2, 3)
+
+    def run():
+        for pyr in angles:
+            rot = euler_to_rotation(pyr)
+            dot(rot, v)
+            dot(rot, Mat33.identity())
+        return len(angles)
+    return run
+
+
+@benchmark("field_sdf.wall_dist")
+def bench_field_sdf_wall_dist(rng):
+    points = [random_vec(rng, (-4500, -5500, -100), (4500, 5500, 2200)) for _ in range(64)]
+
+    def run():
+        for point in points:
+            sdf_wall_dist(point)
+        return len(points)
+    return run
+
+
+@benchmark("field_sdf.normal")
+def bench_field_sdf_normal(rng):
+    points = [random_vec(rng, (-4100, -5100, 20), (4100, 5100, 2000)) for _ in range(64)]
+
+    def run():
+        for point in points:
+            sdf_normal(point)
+        return len(points)
+    return run
+
+
+@benchmark("predict.arrival_at_height")
+def bench_predict_arrival_at_height(rng):
+    objs = [predict.DummyObject() for _ in range(64)]
+    for obj in objs:
+        obj.pos = random_vec(rng, (-4000, -5000, 93), (4000, 5000, 1800))
+        obj.vel = random_vec(rng, (-2000, -2000, -1000), (2000, 2000, 1000))
+
+    def run():
+        for obj in objs:
+            predict.arrival_at_height(obj, 300, "ANY")
+            predict.arrival_at_height(obj, 93, "DOWN")
+        return len(objs)
+    return run
+
+
+@benchmark("predict.time_till_reach_ball")
+def bench_predict_time_till_reach_ball(rng):
+    bots = make_bots(rng)
+
+    def run():
+        for bot in bots:
+            predict.time_till_reach_ball(bot.info.my_car, bot.info.ball)
+        return len(bots)
+    return run
+
+
+@benchmark("ball_prediction_analysis.predict_future_goal")
+def bench_predict_future_goal(rng):
+    predictions = [predict_packet(make_packet(0, rng)) for _ in range(STATES)]
+
+    def run():
+        for prediction in predictions:
+            predict_future_goal(prediction)
+        return len(predictions)
+    return run
+
+
+@benchmark("ball_prediction_analysis.find_slice_at_time")
+def bench_find_slice_at_time(rng):
+    predictions = [predict_packet(make_packet(0, rng)) for _ in range(STATES)]
+    times = [rng.uniform(10.0, 16.0) for _ in predictions]
+
+    def run():
+        for prediction, t in zip(predictions, times):
+            find_slice_at_time(prediction, t)
+        return len(predictions)
+    return run
+
+
+# Bot level benchmarks
+
+@benchmark("drive.go_towards_point")
+def bench_drive_go_towards_point(rng):
+    bots = make_bots(rng)
+    targets = [random_vec(rng, (-3500, -4500, 0), (3500, 4500, 0)) for _ in bots]
+
+    def run():
+        for bot, target in zip(bots, targets):
+            # The clock doesn't run, so a dodge started here would never end and be all that is measured
+            bot.drive.dodge = None
+            bot.drive.recovery = None
+            bot.drive.go_towards_point(bot, target, target_vel=2000, slide=True, boost_min=0)
+        return len(bots)
+    return run
+
+
+@benchmark("shooting.with_aiming")
+def bench_shooting_with_aiming(rng):
+    bots = make_bots(rng)
+    cones = [enemy_goal_cone(bot) for bot in bots]
+
+    def run():
+        for bot, cone in zip(bots, cones):
+            bot.maneuver = None
+            hit_time = predict.time_till_reach_ball(bot.info.my_car, bot.info.ball)
+            bot.shoot.with_aiming(bot, cone, hit_time)
+        return len(bots)
+    return run
+
+
+@benchmark("utsystem.evaluate")
+def bench_utsystem_evaluate(rng):
+    bots = make_bots(rng)
+
+    def run():
+        for bot in bots:
+            bot.ut.evaluate(bot)
+        return len(bots)
+    return run
+
+
+def bench_get_output(rng, num_cars: int):
+    field_info = make_field_info()
+    packets = [make_packet(num_cars, rng, time=10.0 + i / 120) for i in range(STATES * 4)]
+    predictions = [predict_packet(packet) for packet in packets]
+    host = make_host(packets[0], field_info)
+
+    # The packets are replayed in a loop, so once per lap the game time jumps back. The bot copes with that
+    def run():
+        for packet, prediction in zip(packets, predictions):
+            host.tick(packet, prediction)
+        return len(packets)
+    return run
+
+
+benchmark("bot.get_output.2_cars", threshold=0.25)(lambda rng: bench_get_output(rng, 2))
+benchmark("bot.get_output.6_cars", threshold=0.25)(lambda rng: bench_get_output(rng, 6))
+
+
+# Running and comparing
+
+def prepare_benchmark(bench: Benchmark) -> Tuple[Callable[[], int], int]:
+    """ Sets the benchmark up and returns its run function and how many calls of it make up one repeat """
+    run = bench.setup(random.Random(SEED))
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            run()
+        if time.perf_counter() - start >= MIN_REPEAT_TIME:
+            return run, calls
+        calls *= 2
+
+
+def time_repeat(run: Callable[[], int], calls: int) -> Tuple[float, int]:
+    """ Returns the time per operation in microseconds of one repeat, and the number of operations """
+    ops = 0
+    start = time.perf_counter()
+    for _ in range(calls):
+        ops += run()
+    return (time.perf_counter() - start) / ops * 1e6, ops
+
+
+def run_suite(filters: List[str]=None) -> Dict[str, dict]:
+    """
+    Returns the median and min time per operation in microseconds over REPEATS repeats of every benchmark. The repeats
+    are interleaved, one of every benchmark per round, so a moment where the machine is busy only slows down one
+    repeat of each benchmark instead of all repeats of one
+    """
+    benches = [bench for bench in BENCHMARKS if not filters or any(f in bench.name for f in filters)]
+    prepared = [prepare_benchmark(bench) for bench in benches]
+    per_op = {bench.name: [] for bench in benches}
+    ops = {}
+    for _ in range(REPEATS):
+        for bench, (run, calls) in zip(benches, prepared):
+            seconds, ops[bench.name] = time_repeat(run, calls)
+            per_op[bench.name].append(seconds)
+
+    results = {}
+    for bench in benches:
+        times = per_op[bench.name]
+        results[bench.name] = {"median_us": statistics.median(times), "min_us": min(times), "ops": ops[bench.name]}
+        print(f"{bench.name:<48} {results[bench.name]['min_us']:10.2f} us/op")
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], default_threshold: float) -> List[str]:
+    """ Prints the change of every benchmark against the baseline and returns the names of regressed benchmarks """
+    thresholds = {bench.name: bench.threshold for bench in BENCHMARKS}
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<48} not in baseline")
+            continue
+        change = result["min_us"] / baseline[name]["min_us"] - 1
+        threshold = thresholds.get(name) or default_threshold
+        regressed = change > threshold
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<48} {change * 100:+7.1f}% (threshold {threshold * 100:.0f}%){'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the bot's hot paths on synthetic game states")
+    parser.add_argument("--filter", action="append", help="only run benchmarks whose names contain this")
+    parser.add_argument("--save", help="save the results to this json file")
+    parser.add_argument("--compare", help="compare the results against this json file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed relative slowdown for benchmarks without their own threshold")
+    args = parser.parse_args()
+
+    if args.compare and not Path(args.compare).exists():
+        sys.exit(f"No baseline at {args.compare}. Make one with --save on the reference commit first")
+
+    results = run_suite(args.filter)
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "seed": SEED,
+                "results": results,
+            }, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+        print()
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
@@ -0,0 +1,10 @@
+# Tools for running the bot without the game: a stand-in for the RLBot framework (framework.py, game_state.py,
+# ball_prediction.py and renderer.py) and replaying recorded matches (replay.py).
+# The bot's modules import each other relative to src/, so src/ is put on the path here.
+
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).absolute().parent.parent / 'src'
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
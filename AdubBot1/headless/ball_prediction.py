@@ -0,0 +1,141 @@
+# A stand-in for the framework's ball prediction. The ball follows a ballistic path with air drag and bounces off the
+# arena, which is described by util/field_sdf.py. It is not as accurate as the game's own prediction, but the bot only
+# needs plausible paths when running without the game.
+
+import math
+from typing import Tuple
+
+from rlbot.utils.structures.ball_prediction_struct import BallPrediction
+from rlbot.utils.structures.game_data_struct import GameTickPacket
+
+from util.field_sdf import sdf_wall_dist, sdf_normal
+from util.info import GRAVITY, Ball, Field
+from util.vec import Vec3, dot
+
+SLICES = 360
+SLICE_DT = 1 / 60
+SUBSTEPS = 2
+
+DRAG = 0.0305  # Fraction of the velocity lost per second
+MAX_SPEED = 6000
+RESTITUTION = 0.6  # Fraction of the velocity along the surface normal that is kept in a bounce
+SURFACE_FRICTION = 0.35  # Fraction of the velocity along the surface that is lost in a bounce
+ROLL_SPEED = 50  # Impacts slower than this along the normal don't bounce. The ball rolls along the surface instead
+
+# Inside this region the only surfaces the ball can touch are the flat floor and ceiling, so the SDF is not needed
+FLAT_HALF_WIDTH = 3800
+FLAT_HALF_LENGTH = 4800
+FLAT_CORNER = 7200  # Max |x| + |y|
+
+# field_sdf rounds the goal mouths off too much for the ball to fit, so the ball's path into a goal is handled here.
+# Below the crossbar and between the posts only the floor and the back of the goal can be hit
+GOAL_MOUTH_HALF_WIDTH = Field.GOAL_WIDTH / 2 - Ball.RADIUS
+GOAL_MOUTH_HEIGHT = Field.GOAL_HEIGHT - Ball.RADIUS
+GOAL_BACK_Y = Field.LENGTH / 2 + 880 - Ball.RADIUS
+
+
+def is_away_from_walls(x: float, y: float) -> bool:
+    """ True if the only surfaces near this spot are the flat floor and ceiling """
+    return abs(x) < FLAT_HALF_WIDTH and abs(y) < FLAT_HALF_LENGTH and abs(x) + abs(y) < FLAT_CORNER
+
+
+def _bounce(vel: Vec3, normal: Vec3) -> Vec3:
+    vel_normal = dot(vel, normal)
+    if vel_normal >= 0:
+        return vel  # Moving away from the surface already
+    normal_part = normal * vel_normal
+    tangent_part = vel - normal_part
+    if -vel_normal < ROLL_SPEED:
+        return tangent_part
+    return tangent_part * (1 - SURFACE_FRICTION) - normal_part * RESTITUTION
+
+
+def step_ball_components(x, y, z, vx, vy, vz, dt):
+    """ Same as step_ball, but on plain floats, since this runs hundreds of times per prediction """
+    vz += GRAVITY.z * dt
+    damping = 1 - DRAG * dt
+    vx *= damping
+    vy *= damping
+    vz *= damping
+    speed = math.sqrt(vx * vx + vy * vy + vz * vz)
+    if speed > MAX_SPEED:
+        scale = MAX_SPEED / speed
+        vx *= scale
+        vy *= scale
+        vz *= scale
+    x += vx * dt
+    y += vy * dt
+    z += vz * dt
+
+    in_goal_mouth = abs(x) < GOAL_MOUTH_HALF_WIDTH and z < GOAL_MOUTH_HEIGHT
+    if in_goal_mouth or is_away_from_walls(x, y):
+        # Only the floor and the ceiling are close. Their normals are (0, 0, 1) and (0, 0, -1)
+        if (z < Ball.RADIUS and vz < 0) or (z > Field.HEIGHT - Ball.RADIUS and vz > 0):
+            z = Ball.RADIUS if z < Ball.RADIUS else Field.HEIGHT - Ball.RADIUS
+            if abs(vz) < ROLL_SPEED:
+                vz = 0.0
+            else:
+                vx *= 1 - SURFACE_FRICTION
+                vy *= 1 - SURFACE_FRICTION
+                vz *= -RESTITUTION
+        if abs(y) > GOAL_BACK_Y and vy * y > 0:
+            y = math.copysign(GOAL_BACK_Y, y)
+            vy *= -RESTITUTION
+    else:
+        pos = Vec3(x, y, z)
+        dist = sdf_wall_dist(pos)
+        if dist < Ball.RADIUS:
+            normal = sdf_normal(pos)
+            pos = pos + normal * (Ball.RADIUS - dist)
+            vel = _bounce(Vec3(vx, vy, vz), normal)
+            return pos.x, pos.y, pos.z, vel.x, vel.y, vel.z
+
+    return x, y, z, vx, vy, vz
+
+
+def step_ball(pos: Vec3, vel: Vec3, dt: float) -> Tuple[Vec3, Vec3]:
+    """ Moves the ball forward by dt seconds and returns its new position and velocity """
+    x, y, z, vx, vy, vz = step_ball_components(pos.x, pos.y, pos.z, vel.x, vel.y, vel.z, dt)
+    return Vec3(x, y, z), Vec3(vx, vy, vz)
+
+
+def predict_ball(pos: Vec3, vel: Vec3, time: float, slices: int=SLICES) -> BallPrediction:
+    """ Returns a ball prediction starting at the given position, velocity and game time """
+    prediction = BallPrediction()
+    prediction.num_slices = slices
+    dt = SLICE_DT / SUBSTEPS
+    x, y, z, vx, vy, vz = pos.x, pos.y, pos.z, vel.x, vel.y, vel.z
+    for i in range(slices):
+        ball_slice = prediction.slices[i]
+        ball_slice.game_seconds = time + i * SLICE_DT
+        phy = ball_slice.physics
+        phy.location.x, phy.location.y, phy.location.z = x, y, z
+        phy.velocity.x, phy.velocity.y, phy.velocity.z = vx, vy, vz
+        for _ in range(SUBSTEPS):
+            x, y, z, vx, vy, vz = step_ball_components(x, y, z, vx, vy, vz, dt)
+    return prediction
+
+
+def predict_packet(packet: GameTickPacket, slices: int=SLICES) -> BallPrediction:
+    """ Returns a ball prediction starting at the ball of the packet """
+    ball = packet.game_ball.physics
+    return predict_ball(Vec3(ball.location), Vec3(ball.velocity), packet.game_info.seconds_elapsed, slices)
+
+
+class BallPredictionProvider:
+    """
+    Provides the ball prediction of a packet, the way the framework does. The prediction is only computed once per
+    packet, however many times it is asked for.
+    """
+
+    def __init__(self, slices: int=SLICES):
+        self.slices = slices
+        self._time = math.nan
+        self._prediction = BallPrediction()
+
+    def get(self, packet: GameTickPacket) -> BallPrediction:
+        time = packet.game_info.seconds_elapsed
+        if time != self._time:
+            self._prediction = predict_packet(packet, self.slices)
+            self._time = time
+        return self._prediction
@@ -0,0 +1,83 @@
+# Plays the part of the RLBot framework, so agents can be created and ticked in a plain Python process.
+#
+# rlbot's ctypes structs and BaseAgent work without the game. What needs the game is everything the framework hands
+# to an agent: the field info, the ball prediction, the renderer, quick chats and game state setting. AgentHost
+# provides local versions of those.
+
+import traceback
+from typing import List, Optional, Tuple
+
+from rlbot.agents.base_agent import BaseAgent, SimpleControllerState
+from rlbot.utils.structures.ball_prediction_struct import BallPrediction
+from rlbot.utils.structures.game_data_struct import GameTickPacket, FieldInfoPacket
+
+from headless.ball_prediction import BallPredictionProvider
+from headless.game_state import make_field_info
+from headless.renderer import RecordingRenderer
+
+MAX_ERRORS = 20
+
+
+class AgentHost:
+    """
+    Creates an agent and wires it up like the framework would. Call tick() with each packet.
+    The ball prediction given to the agent is computed from the packet, unless one is passed to tick(). Hosts of
+    agents in the same match can share a BallPredictionProvider, so each packet's prediction is computed once.
+
+    Like the framework, exceptions raised by the agent's get_output are caught and the previous controls are kept.
+    The first MAX_ERRORS tracebacks are kept in errors. Pass catch_errors=False to let exceptions propagate instead.
+    """
+
+    def __init__(self, agent_class=None, name: str="Headless", team: int=0, index: int=0,
+                 field_info: FieldInfoPacket=None, renderer=None, record_rendering: bool=False,
+                 ball_prediction_provider: BallPredictionProvider=None, catch_errors: bool=True):
+        if agent_class is None:
+            from bot import MyBot
+            agent_class = MyBot
+
+        self.field_info = field_info if field_info is not None else make_field_info()
+        self.ball_prediction_provider = ball_prediction_provider or BallPredictionProvider()
+        self.renderer = renderer if renderer is not None else RecordingRenderer(record=record_rendering)
+        self.packet: Optional[GameTickPacket] = None
+        self.ball_prediction: Optional[BallPrediction] = None
+        self.quick_chats: List[Tuple[bool, int]] = []  # (team_only, quick chat)
+        self.game_states = []  # Game states the agent asked to set. They are not applied
+        self.catch_errors = catch_errors
+        self.errors: List[str] = []
+        self.error_count = 0
+        self.controls = SimpleControllerState()
+
+        self.agent: BaseAgent = agent_class(name, team, index)
+        self.agent._register_field_info(lambda: self.field_info)
+        self.agent._register_ball_prediction_struct(self._get_ball_prediction)
+        self.agent._register_quick_chat(self._send_quick_chat)
+        self.agent._register_set_game_state(self.game_states.append)
+        self.agent._set_renderer(self.renderer)
+        self.agent.initialize_agent()
+
+    def tick(self, packet: GameTickPacket, ball_prediction: BallPrediction=None) -> SimpleControllerState:
+        self.packet = packet
+        self.ball_prediction = ball_prediction
+        try:
+            controls = self.agent.get_output(packet)
+        except Exception:
+            if not self.catch_errors:
+                raise
+            self.error_count += 1
+            if len(self.errors) < MAX_ERRORS:
+                self.errors.append(traceback.format_exc())
+            return self.controls
+        if controls is not None:
+            self.controls = controls
+        return self.controls
+
+    def retire(self):
+        self.agent.retire()
+
+    def _get_ball_prediction(self) -> BallPrediction:
+        if self.ball_prediction is None:
+            self.ball_prediction = self.ball_prediction_provider.get(self.packet)
+        return self.ball_prediction
+
+    def _send_quick_chat(self, team_only, quick_chat):
+        self.quick_chats.append((team_only, quick_chat))
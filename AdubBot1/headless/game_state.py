@@ -0,0 +1,135 @@
+# This module builds the rlbot structs the framework would otherwise send: field info and game tick packets, either
+# with explicit states or in random but plausible ones.
+
+import math
+import random
+
+from rlbot.utils.structures.game_data_struct import GameTickPacket, FieldInfoPacket
+
+from util.vec import Vec3, norm
+
+# Standard soccar boost pad layout (x, y, z, is_full_boost), in the order the game reports them
+SOCCAR_BOOST_PADS = [
+    (0.0, -4240.0, 70.0, False), (-1792.0, -4184.0, 70.0, False), (1792.0, -4184.0, 70.0, False),
+    (-3072.0, -4096.0, 73.0, True), (3072.0, -4096.0, 73.0, True), (-940.0, -3308.0, 70.0, False),
+    (940.0, -3308.0, 70.0, False), (0.0, -2816.0, 70.0, False), (-3584.0, -2484.0, 70.0, False),
+    (3584.0, -2484.0, 70.0, False), (-1788.0, -2300.0, 70.0, False), (1788.0, -2300.0, 70.0, False),
+    (-2048.0, -1036.0, 70.0, False), (0.0, -1024.0, 70.0, False), (2048.0, -1036.0, 70.0, False),
+    (-3584.0, 0.0, 73.0, True), (-1024.0, 0.0, 70.0, False), (1024.0, 0.0, 70.0, False),
+    (3584.0, 0.0, 73.0, True), (-2048.0, 1036.0, 70.0, False), (0.0, 1024.0, 70.0, False),
+    (2048.0, 1036.0, 70.0, False), (-1788.0, 2300.0, 70.0, False), (1788.0, 2300.0, 70.0, False),
+    (-3584.0, 2484.0, 70.0, False), (3584.0, 2484.0, 70.0, False), (0.0, 2816.0, 70.0, False),
+    (-940.0, 3310.0, 70.0, False), (940.0, 3308.0, 70.0, False), (-3072.0, 4096.0, 73.0, True),
+    (3072.0, 4096.0, 73.0, True), (-1792.0, 4184.0, 70.0, False), (1792.0, 4184.0, 70.0, False),
+    (0.0, 4240.0, 70.0, False),
+]
+
+
+def make_field_info() -> FieldInfoPacket:
+    field_info = FieldInfoPacket()
+    field_info.num_boosts = len(SOCCAR_BOOST_PADS)
+    for i, (x, y, z, is_full_boost) in enumerate(SOCCAR_BOOST_PADS):
+        pad = field_info.boost_pads[i]
+        pad.location.x = x
+        pad.location.y = y
+        pad.location.z = z
+        pad.is_full_boost = is_full_boost
+    return field_info
+
+
+def make_empty_packet(time: float=0.0) -> GameTickPacket:
+    """ Returns a packet of an active round with no cars, the ball at rest in the center and all pads active """
+    packet = GameTickPacket()
+    packet.game_info.seconds_elapsed = time
+    packet.game_info.is_round_active = True
+    set_ball(packet, Vec3(0, 0, 93))
+    set_all_pads_active(packet)
+    return packet
+
+
+def set_ball(packet: GameTickPacket, pos: Vec3, vel: Vec3=Vec3(), ang_vel: Vec3=Vec3()):
+    ball = packet.game_ball.physics
+    _set_vector(ball.location, pos)
+    _set_vector(ball.velocity, vel)
+    _set_vector(ball.angular_velocity, ang_vel)
+
+
+def set_car(packet: GameTickPacket, index: int, pos: Vec3, vel: Vec3=Vec3(), yaw: float=0.0, team: int=None,
+            boost: int=33, on_ground: bool=True, pitch: float=0.0, roll: float=0.0, ang_vel: Vec3=Vec3()):
+    """ Sets the state of a car. Cars with an index at or above packet.num_cars are added """
+    car = packet.game_cars[index]
+    car.name = f"Car {index}"
+    car.team = index % 2 if team is None else team
+    car.boost = boost
+    car.has_wheel_contact = on_ground
+    car.jumped = not on_ground
+    car.is_super_sonic = norm(vel) >= 2200
+    phy = car.physics
+    _set_vector(phy.location, pos)
+    _set_vector(phy.velocity, vel)
+    _set_vector(phy.angular_velocity, ang_vel)
+    phy.rotation.pitch = pitch
+    phy.rotation.yaw = yaw
+    phy.rotation.roll = roll
+    packet.num_cars = max(packet.num_cars, index + 1)
+
+
+def set_all_pads_active(packet: GameTickPacket):
+    packet.num_boost = len(SOCCAR_BOOST_PADS)
+    for i in range(packet.num_boost):
+        packet.game_boosts[i].is_active = True
+        packet.game_boosts[i].timer = 0.0
+
+
+def _set_vector(vec, value: Vec3):
+    vec.x = value.x
+    vec.y = value.y
+    vec.z = value.z
+
+
+def _randomize_vector(vec, rng: random.Random, lo, hi):
+    vec.x = rng.uniform(lo[0], hi[0])
+    vec.y = rng.uniform(lo[1], hi[1])
+    vec.z = rng.uniform(lo[2], hi[2])
+
+
+def make_packet(num_cars: int, rng: random.Random, time: float = 10.0) -> GameTickPacket:
+    """
+    Returns a packet with the ball and num_cars cars in random, but plausible, states.
+    """
+    packet = GameTickPacket()
+    packet.game_info.seconds_elapsed = time
+    packet.game_info.is_round_active = True
+
+    ball = packet.game_ball.physics
+    _randomize_vector(ball.location, rng, (-4000, -5000, 93), (4000, 5000, 1800))
+    _randomize_vector(ball.velocity, rng, (-2000, -2000, -1000), (2000, 2000, 1000))
+    _randomize_vector(ball.angular_velocity, rng, (-6, -6, -6), (6, 6, 6))
+
+    packet.num_cars = num_cars
+    for i in range(num_cars):
+        car = packet.game_cars[i]
+        car.name = f"Car {i}"
+        car.team = i % 2
+        car.boost = rng.randint(0, 100)
+        car.has_wheel_contact = rng.random() < 0.8
+        car.jumped = not car.has_wheel_contact
+        car.is_super_sonic = rng.random() < 0.2
+        phy = car.physics
+        _randomize_vector(phy.location, rng, (-4000, -5000, 17), (4000, 5000, 17))
+        speed = rng.uniform(0, 2300)
+        direction = rng.uniform(-math.pi, math.pi)
+        phy.velocity.x = speed * math.cos(direction)
+        phy.velocity.y = speed * math.sin(direction)
+        _randomize_vector(phy.angular_velocity, rng, (-5.5, -5.5, -5.5), (5.5, 5.5, 5.5))
+        phy.rotation.pitch = rng.uniform(-0.2, 0.2)
+        phy.rotation.yaw = rng.uniform(-math.pi, math.pi)
+        phy.rotation.roll = rng.uniform(-0.2, 0.2)
+
+    packet.num_boost = len(SOCCAR_BOOST_PADS)
+    for i in range(packet.num_boost):
+        pad = packet.game_boosts[i]
+        pad.is_active = rng.random() < 0.7
+        pad.timer = 0.0 if pad.is_active else rng.uniform(0, 4)
+
+    return packet
@@ -0,0 +1,44 @@
+# A renderer that accepts every call the bot makes to the rlbot renderer, but draws nothing. It counts the calls and
+# records the draw calls of the latest rendering group, so rendering can stay enabled when the bot runs without the
+# game, and tools can inspect what the bot would have drawn.
+
+from collections import Counter
+from typing import List, Tuple
+
+
+class RecordingRenderer:
+    COLORS = ["black", "white", "gray", "blue", "red", "green", "lime", "yellow", "orange", "cyan", "pink", "purple",
+              "teal"]
+
+    def __init__(self, record: bool=True):
+        self.record = record
+        self.calls = Counter()
+        self.drawn: List[Tuple[str, tuple]] = []  # (method name, args) of the draw calls since begin_rendering
+        self._drawing: List[Tuple[str, tuple]] = []
+
+    def begin_rendering(self, group_id='default'):
+        self.calls["begin_rendering"] += 1
+        self._drawing = []
+
+    def end_rendering(self):
+        self.calls["end_rendering"] += 1
+        self.drawn = self._drawing
+
+    def create_color(self, alpha, red, green, blue):
+        return alpha, red, green, blue
+
+    def team_color(self, team=None, alt_color=False):
+        return 255, 0, 0, 0
+
+    def __getattr__(self, name):
+        # Named colors, e.g. renderer.red()
+        if name in RecordingRenderer.COLORS:
+            return lambda: name
+
+        # Everything else is a draw call
+        def draw(*args, **kwargs):
+            self.calls[name] += 1
+            if self.record:
+                self._drawing.append((name, args))
+            return self
+        return draw
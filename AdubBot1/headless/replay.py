@@ -0,0 +1,83 @@
+# Feeds a recorded tick log through MyBot without the game, at full speed, and reports how long each tick took
+# and which controls the bot returned. Logs recorded without ball predictions get them rebuilt from the packets with
+# headless/ball_prediction.py, which is close to the game's but not the same.
+#
+# Usage, from the AdubBot1 directory:
+#   python -m headless.replay ticks_0_1234.bin [--controls controls.csv]
+
+import argparse
+import csv
+import time
+from typing import List
+
+from headless.ball_prediction import predict_packet
+from headless.framework import AgentHost
+
+from util.tick_log import TickLogReader
+
+CONTROL_NAMES = ["throttle", "steer", "pitch", "yaw", "roll", "jump", "boost", "handbrake"]
+
+
+class ReplayResult:
+    def __init__(self):
+        self.latencies: List[float] = []  # Seconds per tick
+        self.game_times: List[float] = []
+        self.controls: List[tuple] = []
+
+    def percentile(self, p: float) -> float:
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+    def summary(self) -> str:
+        if not self.latencies:
+            return "No ticks replayed"
+        mean = sum(self.latencies) / len(self.latencies)
+        return (f"{len(self.latencies)} ticks, mean {mean * 1e3:.3f} ms, p50 {self.percentile(50) * 1e3:.3f} ms, "
+                f"p95 {self.percentile(95) * 1e3:.3f} ms, p99 {self.percentile(99) * 1e3:.3f} ms, "
+                f"max {max(self.latencies) * 1e3:.3f} ms")
+
+
+def replay(path, bot_class=None) -> ReplayResult:
+    """
+    Replays the tick log at path through a fresh bot (MyBot unless another class is given) and returns the latency
+    and controls of every tick.
+    """
+    log = TickLogReader(path)
+    host = AgentHost(bot_class, "Replay", log.team, log.index)
+
+    result = ReplayResult()
+    for packet, ball_prediction in log:
+        host.field_info = log.field_info
+        if ball_prediction is None:
+            ball_prediction = predict_packet(packet)
+
+        start = time.perf_counter()
+        controls = host.tick(packet, ball_prediction)
+        end = time.perf_counter()
+
+        result.latencies.append(end - start)
+        result.game_times.append(packet.game_info.seconds_elapsed)
+        result.controls.append(tuple(float(getattr(controls, name)) for name in CONTROL_NAMES))
+
+    host.retire()
+    return result
+
+
+def write_controls(result: ReplayResult, path):
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["game_time", "latency_ms"] + CONTROL_NAMES)
+        for game_time, latency, controls in zip(result.game_times, result.latencies, result.controls):
+            writer.writerow([f"{game_time:.4f}", f"{latency * 1e3:.4f}"] + [f"{c:.3f}" for c in controls])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a tick log through the bot without the game")
+    parser.add_argument("log", help="tick log recorded by the bot")
+    parser.add_argument("--controls", help="write per-tick latency and controls to this csv file")
+    args = parser.parse_args()
+
+    result = replay(args.log)
+    print(result.summary())
+    if args.controls:
+        write_controls(result, args.controls)
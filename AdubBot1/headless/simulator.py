@@ -0,0 +1,536 @@
+# A headless match simulator. Ball and cars move with simplified physics at a fixed tick rate, and every car is driven
+# by a bot hosted through headless.framework. It runs as fast as the bots can think, which makes it possible to play
+# thousands of kickoffs or shots without the game.
+#
+# What is simulated: ground driving (throttle, boost, braking, steering with the bot's own turn curvature), jumps,
+# double jumps and dodges, air control, arena collisions through util/field_sdf.py, car-ball contact, boost pads,
+# goals and kickoffs. What is not: driving on walls, car-car collisions and demolitions. The kickoff countdown is off
+# by default, see Simulator.kickoff_countdown.
+#
+# Usage, from the AdubBot1 directory:
+#   python -m headless.simulator --kickoffs 100 --blue 1 --orange 1
+
+import argparse
+import ctypes
+import math
+import random
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from rlbot.agents.base_agent import SimpleControllerState
+from rlbot.utils.structures.ball_prediction_struct import BallPrediction
+from rlbot.utils.structures.game_data_struct import GameTickPacket
+
+from headless.ball_prediction import SLICES, step_ball_components, is_away_from_walls
+from headless.framework import AgentHost
+from headless.game_state import SOCCAR_BOOST_PADS, make_field_info, set_ball, set_car
+
+from util.dynamics import turn_curvature, throttle_accel, MAX_CAR_SPEED, BOOST_ACCEL, BRAKE_ACCEL, COAST_ACCEL
+from util.ball_prediction_analysis import GOAL_THRESHOLD
+from util.boost_pad_tracker import BIG_PAD_RESPAWN_TIME, SMALL_PAD_RESPAWN_TIME, PAD_PICKUP_RADIUS
+from util.field_sdf import sdf_wall_dist, sdf_normal
+from util.info import GRAVITY, Ball, Field
+from util.vec import Vec3, dot, norm, normalize, xy, euler_to_rotation
+from util.world_model import SLICE_DTYPE
+
+TICK_RATE = 120
+DT = 1 / TICK_RATE
+
+CAR_REST_HEIGHT = 17
+CAR_RADIUS = 50  # Used for wall collisions
+# The car's hitbox (an Octane's) as a box with half extents along forward, left and up, offset from the car's position
+HITBOX_HALF_SIZE = Vec3(59.0, 42.0, 18.0)
+HITBOX_OFFSET = Vec3(13.9, 0.0, 20.8)
+CAR_MASS = 180
+BALL_MASS = 30
+HIT_RESTITUTION = 0.6
+
+BOOST_USAGE = 33.3  # Boost amount per second
+HANDBRAKE_TURN_FACTOR = 1.5
+
+JUMP_SPEED = 292
+DODGE_SPEED = 500
+DODGE_WINDOW = 1.25  # Seconds after the first jump where a second jump is allowed
+AIR_ROTATION_SPEED = 5.5  # Radians per second at full input
+
+# (x, y, yaw) of the kickoff spawns of the blue team. The orange spawns are mirrored
+KICKOFF_SPAWNS = [
+    (-2048, -2560, 0.25 * math.pi), (2048, -2560, 0.75 * math.pi),
+    (-256, -3840, 0.5 * math.pi), (256, -3840, 0.5 * math.pi),
+    (0, -4608, 0.5 * math.pi),
+]
+
+# Seconds the prediction is computed ahead. It is reused until a car touches the ball or it runs out
+PREDICTION_HORIZON = 8.0
+
+
+class SimCar:
+    __slots__ = ("index", "team", "pos", "vel", "pitch", "yaw", "roll", "ang_vel", "boost", "on_ground", "jumped",
+                 "double_jumped", "jump_time", "jump_held")
+
+    def __init__(self, index: int, team: int):
+        self.index = index
+        self.team = team
+        self.reset(Vec3(0, 0, CAR_REST_HEIGHT), 0.0)
+
+    def reset(self, pos: Vec3, yaw: float, boost: float=33):
+        self.pos = pos
+        self.vel = Vec3()
+        self.pitch = 0.0
+        self.yaw = yaw
+        self.roll = 0.0
+        self.ang_vel = Vec3()
+        self.boost = boost
+        self.on_ground = pos.z <= CAR_REST_HEIGHT + 1
+        self.jumped = False
+        self.double_jumped = False
+        self.jump_time = -math.inf
+        self.jump_held = False
+
+    def forward(self) -> Vec3:
+        cp = math.cos(self.pitch)
+        return Vec3(cp * math.cos(self.yaw), cp * math.sin(self.yaw), math.sin(self.pitch))
+
+    def left(self) -> Vec3:
+        # Ignores pitch and roll. Only used for dodges
+        return Vec3(-math.sin(self.yaw), math.cos(self.yaw), 0)
+
+    def step(self, controls: SimpleControllerState, now: float, dt: float):
+        jump_pressed = controls.jump and not self.jump_held
+        self.jump_held = controls.jump
+        boosting = controls.boost and self.boost > 0
+        if boosting:
+            self.boost = max(0.0, self.boost - BOOST_USAGE * dt)
+
+        if self.on_ground:
+            self._step_ground(controls, boosting, dt)
+            if jump_pressed:
+                self.vel = self.vel + Vec3(0, 0, JUMP_SPEED)
+                self.on_ground = False
+                self.jumped = True
+                self.jump_time = now
+        else:
+            self._step_air(controls, boosting, dt)
+            if jump_pressed and not self.double_jumped and now - self.jump_time < DODGE_WINDOW:
+                self._second_jump(controls)
+
+        speed = norm(self.vel)
+        if speed > MAX_CAR_SPEED:
+            self.vel = self.vel * (MAX_CAR_SPEED / speed)
+        self.pos = self.pos + self.vel * dt
+        self._collide_with_arena()
+
+    def _step_ground(self, controls: SimpleControllerState, boosting: bool, dt: float):
+        forward = Vec3(math.cos(self.yaw), math.sin(self.yaw), 0)
+        speed = dot(self.vel, forward)
+
+        if controls.throttle * speed < 0:
+            accel = math.copysign(BRAKE_ACCEL, controls.throttle)
+        elif abs(controls.throttle) > 0.01:
+            accel = controls.throttle * throttle_accel(abs(speed))
+        else:
+            accel = -math.copysign(min(COAST_ACCEL, abs(speed) / dt), speed)
+        if boosting:
+            accel += BOOST_ACCEL
+        speed = max(-MAX_CAR_SPEED, min(speed + accel * dt, MAX_CAR_SPEED))
+
+        yaw_rate = controls.steer * turn_curvature(abs(speed)) * speed
+        if controls.handbrake:
+            yaw_rate *= HANDBRAKE_TURN_FACTOR
+        self.yaw = math.atan2(math.sin(self.yaw + yaw_rate * dt), math.cos(self.yaw + yaw_rate * dt))
+        self.ang_vel = Vec3(0, 0, yaw_rate)
+        self.vel = Vec3(math.cos(self.yaw) * speed, math.sin(self.yaw) * speed, 0)
+
+    def _step_air(self, controls: SimpleControllerState, boosting: bool, dt: float):
+        self.vel = self.vel + GRAVITY * dt
+        if boosting:
+            self.vel = self.vel + self.forward() * (BOOST_ACCEL * dt)
+        rates = Vec3(controls.pitch, controls.yaw, controls.roll) * AIR_ROTATION_SPEED
+        self.pitch = max(-math.pi / 2, min(self.pitch + rates.x * dt, math.pi / 2))
+        self.yaw += rates.y * dt
+        self.roll += rates.z * dt
+        self.ang_vel = rates
+
+    def _second_jump(self, controls: SimpleControllerState):
+        self.double_jumped = True
+        direction = self.forward() * -controls.pitch + self.left() * controls.yaw
+        if norm(xy(direction)) > 0.1:
+            self.vel = self.vel + normalize(xy(direction)) * DODGE_SPEED
+        else:
+            self.vel = self.vel + Vec3(0, 0, JUMP_SPEED)
+
+    def _collide_with_arena(self):
+        if self.pos.z <= CAR_REST_HEIGHT and self.vel.z <= 0:
+            self.pos = Vec3(self.pos.x, self.pos.y, CAR_REST_HEIGHT)
+            self.vel = xy(self.vel)
+            if not self.on_ground:
+                self.on_ground = True
+                self.jumped = False
+                self.double_jumped = False
+                self.pitch = 0.0
+                self.roll = 0.0
+            return
+
+        if is_away_from_walls(self.pos.x, self.pos.y):
+            if self.pos.z > Field.HEIGHT - CAR_RADIUS:
+                self.pos = Vec3(self.pos.x, self.pos.y, Field.HEIGHT - CAR_RADIUS)
+                self.vel = Vec3(self.vel.x, self.vel.y, min(self.vel.z, 0))
+            return
+
+        # The car slides along walls instead of driving up them
+        dist = sdf_wall_dist(self.pos)
+        if dist < CAR_RADIUS:
+            normal = sdf_normal(self.pos)
+            self.pos = self.pos + normal * (CAR_RADIUS - dist)
+            into_wall = dot(self.vel, normal)
+            if into_wall < 0:
+                self.vel = self.vel - normal * into_wall
+
+
+class SimBall:
+    __slots__ = ("pos", "vel", "ang_vel")
+
+    def __init__(self):
+        self.pos = Vec3(0, 0, Ball.RADIUS)
+        self.vel = Vec3()
+        self.ang_vel = Vec3()
+
+    def step(self, dt: float):
+        x, y, z, vx, vy, vz = step_ball_components(self.pos.x, self.pos.y, self.pos.z,
+                                                   self.vel.x, self.vel.y, self.vel.z, dt)
+        self.pos = Vec3(x, y, z)
+        self.vel = Vec3(vx, vy, vz)
+
+
+class FutureBall:
+    """
+    The ball's path ahead, computed with the same steps as the simulation. Since the simulation is deterministic,
+    the path stays exact until a car touches the ball, so it only needs to be recomputed after touches or when it
+    runs out. The ball prediction for the bots is then a strided copy of it.
+    """
+
+    def __init__(self):
+        self.steps = int(PREDICTION_HORIZON * TICK_RATE)
+        self.pos = np.zeros((self.steps, 3))
+        self.vel = np.zeros((self.steps, 3))
+        self.start_tick = 0
+        self.valid = False
+        self.stride = TICK_RATE // 60  # Ticks per prediction slice
+        self.prediction = BallPrediction()
+        raw = (ctypes.c_ubyte * ctypes.sizeof(self.prediction.slices)).from_buffer(self.prediction.slices)
+        self._slices = np.frombuffer(raw, dtype=SLICE_DTYPE)
+
+    def invalidate(self):
+        self.valid = False
+
+    def prediction_at(self, ball: SimBall, tick: int, time: float) -> BallPrediction:
+        offset = tick - self.start_tick
+        if not self.valid or offset + (SLICES - 1) * self.stride >= self.steps:
+            self._compute(ball, tick)
+            offset = 0
+
+        indices = offset + np.arange(SLICES) * self.stride
+        self._slices["location"][:SLICES] = self.pos[indices]
+        self._slices["velocity"][:SLICES] = self.vel[indices]
+        self._slices["game_seconds"][:SLICES] = time + np.arange(SLICES) * (self.stride * DT)
+        self.prediction.num_slices = SLICES
+        return self.prediction
+
+    def _compute(self, ball: SimBall, tick: int):
+        x, y, z, vx, vy, vz = ball.pos.x, ball.pos.y, ball.pos.z, ball.vel.x, ball.vel.y, ball.vel.z
+        pos, vel = self.pos, self.vel
+        for i in range(self.steps):
+            pos[i] = x, y, z
+            vel[i] = vx, vy, vz
+            x, y, z, vx, vy, vz = step_ball_components(x, y, z, vx, vy, vz, DT)
+        self.start_tick = tick
+        self.valid = True
+
+
+class SimulationResult:
+    def __init__(self):
+        self.goals: List[Tuple[float, int]] = []  # (time, scoring team)
+        self.first_touch: Optional[Tuple[float, int]] = None  # (time, car index)
+        self.ticks = 0
+        self.sim_time = 0.0
+        self.bot_time = 0.0  # Seconds spent in the bots' get_output
+        self.total_time = 0.0  # Wall clock seconds
+
+    @property
+    def speedup(self) -> float:
+        """ How many times faster than realtime the simulation ran """
+        return self.sim_time / self.total_time if self.total_time > 0 else math.inf
+
+
+class Simulator:
+    """
+    A match between bots. Blue cars have the indices 0 to num_blue-1, orange cars come after.
+    The bots are asked for controls bot_tick_rate times per second, and the controls are held in between.
+    bot_class is used for every car, unless it is a list with one class per car.
+    """
+
+    def __init__(self, num_blue: int=1, num_orange: int=1, bot_class=None, seed: int=0, bot_tick_rate: int=TICK_RATE):
+        self.rng = random.Random(seed)
+        self.ticks_per_bot_tick = max(1, round(TICK_RATE / bot_tick_rate))
+        self.field_info = make_field_info()
+        self.cars = [SimCar(i, 0 if i < num_blue else 1) for i in range(num_blue + num_orange)]
+        bot_classes = bot_class if isinstance(bot_class, list) else [bot_class] * len(self.cars)
+        self.hosts = [AgentHost(cls, f"Sim {car.index}", car.team, car.index, field_info=self.field_info)
+                      for car, cls in zip(self.cars, bot_classes)]
+        self.controls = [SimpleControllerState() for _ in self.cars]
+        self.ball = SimBall()
+        self.future = FutureBall()
+        self.pad_active = [True] * len(SOCCAR_BOOST_PADS)
+        self.pad_timer = [0.0] * len(SOCCAR_BOOST_PADS)
+        self.score = [0, 0]
+        self.tick = 0
+        self.time = 0.0
+        self.is_kickoff = False
+        self.kickoff_countdown = 0.0  # Seconds nothing moves at the start of every kickoff, like the game's countdown
+        self.countdown_ticks = 0  # Ticks left of the current countdown
+        self.bot_time = 0.0
+
+    # Setting up
+
+    def reset_kickoff(self):
+        """ Puts the ball in the center and the cars on randomly chosen kickoff spawns """
+        self.ball = SimBall()
+        for team in (0, 1):
+            team_cars = [car for car in self.cars if car.team == team]
+            spawns = self.rng.sample(range(len(KICKOFF_SPAWNS)), len(team_cars))
+            for car, spawn in zip(team_cars, spawns):
+                x, y, yaw = KICKOFF_SPAWNS[spawn]
+                if team == 1:
+                    x, y, yaw = -x, -y, yaw - math.pi
+                car.reset(Vec3(x, y, CAR_REST_HEIGHT), yaw)
+        self.is_kickoff = True
+        self.countdown_ticks = round(self.kickoff_countdown * TICK_RATE)
+        self.future.invalidate()
+
+    def set_ball(self, pos: Vec3, vel: Vec3=Vec3()):
+        self.ball.pos = Vec3(pos)
+        self.ball.vel = Vec3(vel)
+        self.is_kickoff = False
+        self.future.invalidate()
+
+    def set_car(self, index: int, pos: Vec3, yaw: float=0.0, vel: Vec3=Vec3(), boost: float=33):
+        car = self.cars[index]
+        car.reset(Vec3(pos), yaw, boost)
+        car.vel = Vec3(vel)
+
+    def apply_game_state(self, game_state):
+        """
+        Applies an rlbot GameState, like the framework's set_game_state. Fields that are None are left unchanged.
+        Boost pads with a respawn time are inactive until it has passed.
+        """
+        if game_state.ball is not None and game_state.ball.physics is not None:
+            physics = game_state.ball.physics
+            self.set_ball(_merge(self.ball.pos, physics.location), _merge(self.ball.vel, physics.velocity))
+
+        for index, car_state in (game_state.cars or {}).items():
+            if index >= len(self.cars):
+                continue
+            car = self.cars[index]
+            physics = car_state.physics
+            if physics is not None:
+                pos = _merge(car.pos, physics.location)
+                vel = _merge(car.vel, physics.velocity)
+                yaw = physics.rotation.yaw if physics.rotation is not None and physics.rotation.yaw is not None \
+                    else car.yaw
+                car.reset(Vec3(pos.x, pos.y, max(pos.z, CAR_REST_HEIGHT)), yaw, car.boost)
+                car.vel = vel
+            if car_state.boost_amount is not None:
+                car.boost = car_state.boost_amount
+            if car_state.jumped is not None:
+                car.jumped = car_state.jumped
+            if car_state.double_jumped is not None:
+                car.double_jumped = car_state.double_jumped
+
+        for index, boost_state in (game_state.boosts or {}).items():
+            if index < len(self.pad_active) and boost_state.respawn_time is not None:
+                respawn_time = BIG_PAD_RESPAWN_TIME if SOCCAR_BOOST_PADS[index][3] else SMALL_PAD_RESPAWN_TIME
+                self.pad_active[index] = boost_state.respawn_time <= 0
+                self.pad_timer[index] = 0.0 if self.pad_active[index] else respawn_time - boost_state.respawn_time
+
+    # Running
+
+    def packet(self) -> GameTickPacket:
+        packet = GameTickPacket()
+        packet.game_info.seconds_elapsed = self.time
+        packet.game_info.frame_num = self.tick
+        packet.game_info.game_time_remaining = 300
+        packet.game_info.is_round_active = self.countdown_ticks == 0
+        packet.game_info.is_kickoff_pause = self.is_kickoff
+        packet.num_teams = 2
+        packet.teams[0].score = self.score[0]
+        packet.teams[1].team_index = 1
+        packet.teams[1].score = self.score[1]
+        set_ball(packet, self.ball.pos, self.ball.vel, self.ball.ang_vel)
+        for car in self.cars:
+            set_car(packet, car.index, car.pos, car.vel, car.yaw, car.team, int(car.boost), car.on_ground,
+                    car.pitch, car.roll, car.ang_vel)
+            packet.game_cars[car.index].jumped = car.jumped
+            packet.game_cars[car.index].double_jumped = car.double_jumped
+        packet.num_boost = len(SOCCAR_BOOST_PADS)
+        for i in range(packet.num_boost):
+            packet.game_boosts[i].is_active = self.pad_active[i]
+            packet.game_boosts[i].timer = self.pad_timer[i]
+        return packet
+
+    def step(self, result: SimulationResult=None) -> Optional[int]:
+        """ Advances the match by one tick. Returns the team that scored, if any """
+        if self.tick % self.ticks_per_bot_tick == 0:
+            packet = self.packet()
+            prediction = self.future.prediction_at(self.ball, self.tick, self.time)
+
+            start = time.perf_counter()
+            for i, host in enumerate(self.hosts):
+                self.controls[i] = host.tick(packet, prediction)
+            self.bot_time += time.perf_counter() - start
+
+        if self.countdown_ticks > 0:
+            # The clock runs, but nothing moves
+            self.countdown_ticks -= 1
+            self.tick += 1
+            self.time += DT
+            return None
+
+        for car, controls in zip(self.cars, self.controls):
+            car.step(controls, self.time, DT)
+        self.ball.step(DT)
+        self._touch_ball(result)
+        self._pick_up_boost()
+
+        self.tick += 1
+        self.time += DT
+
+        if abs(self.ball.pos.y) > GOAL_THRESHOLD:
+            scoring_team = 0 if self.ball.pos.y > 0 else 1
+            self.score[scoring_team] += 1
+            if result is not None:
+                result.goals.append((self.time, scoring_team))
+            self.reset_kickoff()
+            return scoring_team
+        return None
+
+    def run(self, seconds: float, stop_on_goal: bool=False, stop_on_touch: bool=False) -> SimulationResult:
+        result = SimulationResult()
+        start_bot_time = self.bot_time
+        start = time.perf_counter()
+        end_tick = self.tick + int(seconds * TICK_RATE)
+        while self.tick < end_tick:
+            scored = self.step(result)
+            result.ticks += 1
+            if (stop_on_goal and scored is not None) or (stop_on_touch and result.first_touch is not None):
+                break
+        result.total_time = time.perf_counter() - start
+        result.bot_time = self.bot_time - start_bot_time
+        result.sim_time = result.ticks * DT
+        return result
+
+    def retire(self):
+        for host in self.hosts:
+            host.retire()
+
+    # Interactions
+
+    def _touch_ball(self, result: Optional[SimulationResult]):
+        for car in self.cars:
+            # Closest point on the hitbox to the ball, found in the car's local coordinates
+            rot = euler_to_rotation(Vec3(car.pitch, car.yaw, car.roll))
+            axes = (rot.col(0), rot.col(1), rot.col(2))
+            center = car.pos + axes[0] * HITBOX_OFFSET.x + axes[2] * HITBOX_OFFSET.z
+            center_to_ball = self.ball.pos - center
+            if norm(center_to_ball) > Ball.RADIUS + norm(HITBOX_HALF_SIZE):
+                continue
+            closest = center
+            for axis, half_size in zip(axes, HITBOX_HALF_SIZE):
+                closest = closest + axis * max(-half_size, min(dot(center_to_ball, axis), half_size))
+            contact_to_ball = self.ball.pos - closest
+            dist = norm(contact_to_ball)
+            if dist >= Ball.RADIUS or dist == 0:
+                continue
+
+            normal = contact_to_ball / dist
+            closing_speed = dot(car.vel - self.ball.vel, normal)
+            self.ball.pos = closest + normal * Ball.RADIUS
+            if closing_speed > 0:
+                impulse = (1 + HIT_RESTITUTION) * closing_speed / (1 / BALL_MASS + 1 / CAR_MASS)
+                self.ball.vel = self.ball.vel + normal * (impulse / BALL_MASS)
+                car.vel = car.vel - normal * (impulse / CAR_MASS)
+            self.future.invalidate()
+            self.is_kickoff = False
+            if result is not None and result.first_touch is None:
+                result.first_touch = (self.time, car.index)
+
+    def _pick_up_boost(self):
+        for i, (x, y, z, is_big) in enumerate(SOCCAR_BOOST_PADS):
+            if not self.pad_active[i]:
+                self.pad_timer[i] += DT
+                if self.pad_timer[i] >= (BIG_PAD_RESPAWN_TIME if is_big else SMALL_PAD_RESPAWN_TIME):
+                    self.pad_active[i] = True
+                    self.pad_timer[i] = 0.0
+                continue
+            for car in self.cars:
+                if car.boost < 100 and (car.pos.x - x) ** 2 + (car.pos.y - y) ** 2 < PAD_PICKUP_RADIUS ** 2 \
+                        and car.pos.z < 200:
+                    car.boost = min(100.0, car.boost + (100 if is_big else 12))
+                    self.pad_active[i] = False
+                    break
+
+
+def _merge(current: Vec3, new) -> Vec3:
+    """ Returns the rlbot Vector3 new, where the components that are None are taken from current """
+    if new is None:
+        return current
+    return Vec3(current.x if new.x is None else new.x,
+                current.y if new.y is None else new.y,
+                current.z if new.z is None else new.z)
+
+
+def run_kickoffs(count: int, num_blue: int=1, num_orange: int=1, seconds: float=4.0, seed: int=0, bot_class=None,
+                 bot_tick_rate: int=TICK_RATE):
+    """
+    Plays count kickoffs. After each kickoff the match is played for the given number of seconds. Returns a list of
+    (first touch car index or -1, team with the ball on the opponent's half afterwards or -1, SimulationResult).
+    """
+    sim = Simulator(num_blue, num_orange, bot_class, seed, bot_tick_rate)
+    outcomes = []
+    for _ in range(count):
+        sim.reset_kickoff()
+        result = sim.run(seconds, stop_on_goal=True)
+        touch = result.first_touch[1] if result.first_touch is not None else -1
+        if result.goals:
+            advantage = result.goals[0][1]
+        elif abs(sim.ball.pos.y) > 500:
+            advantage = 0 if sim.ball.pos.y > 0 else 1
+        else:
+            advantage = -1
+        outcomes.append((touch, advantage, result))
+    sim.retire()
+    return outcomes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play kickoffs between bots without the game")
+    parser.add_argument("--kickoffs", type=int, default=20)
+    parser.add_argument("--blue", type=int, default=1, help="number of blue bots")
+    parser.add_argument("--orange", type=int, default=1, help="number of orange bots")
+    parser.add_argument("--seconds", type=float, default=4.0, help="seconds played after each kickoff")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bot-rate", type=int, default=TICK_RATE, help="bot ticks per second")
+    args = parser.parse_args()
+
+    outcomes = run_kickoffs(args.kickoffs, args.blue, args.orange, args.seconds, args.seed, bot_tick_rate=args.bot_rate)
+    results = [result for _, _, result in outcomes]
+    ticks = sum(result.ticks for result in results)
+    num_cars = args.blue + args.orange
+    print(f"{len(outcomes)} kickoffs, {sum(len(r.goals) for r in results)} goals")
+    print(f"Blue advantage: {sum(1 for _, a, _ in outcomes if a == 0)}, "
+          f"orange advantage: {sum(1 for _, a, _ in outcomes if a == 1)}, "
+          f"neutral: {sum(1 for _, a, _ in outcomes if a == -1)}")
+    bot_ticks = ticks / (TICK_RATE / args.bot_rate) * num_cars
+    print(f"{ticks} ticks, {sum(r.bot_time for r in results) / bot_ticks * 1e3:.3f} ms per bot tick, "
+          f"{sum(r.sim_time for r in results) / sum(r.total_time for r in results):.1f}x realtime")
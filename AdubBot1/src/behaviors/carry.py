@@ -4,22 +4,27 @@ from rlbot.agents.base_agent import SimpleControllerState
 
 from behaviors.utsystem import Choice
 from maneuvers.dodge import DodgeManeuver
-from util import predict
-from util.rlmath import clip01, lerp
+from util import predict, dribble
+from util.dribble import DribbleState
+from util.dynamics import turn_curvature
+from util.rlmath import clip, clip01, lerp
 from util.vec import norm, Vec3, angle_between, normalize, dot
 
 
 class Carry(Choice):
+    # Constants
+    extra_util_bias = 0.2
+    wait_before_flick = 0.28
+    flick_init_jump_duration = 0.07
+    required_distance_to_ball_for_flick = 173
+    offset_bias = 38
+    flick_before_falling = 0.25  # Flick if the ball will fall off this soon even when balancing
+    goal_steer_gain = 0.3  # How much to turn towards the goal while dribbling
+    balanced_side_accel = 300  # Balancing needs less sideways acceleration than this to turn towards the goal
+
     def __init__(self):
         self.is_dribbling = False
-        self.flick_timer = 0
-
-        # Constants
-        self.extra_util_bias = 0.2
-        self.wait_before_flick = 0.28
-        self.flick_init_jump_duration = 0.07
-        self.required_distance_to_ball_for_flick = 173
-        self.offset_bias = 38
+        self.dribble = DribbleState()
 
     def util(self, bot) -> float:
         car = bot.info.my_car
@@ -47,30 +52,46 @@ class Carry(Choice):
 
         car = bot.info.my_car
         ball = bot.info.ball
-        ball_landing = predict.next_ball_landing(bot)
         ball_to_goal = bot.info.enemy_goal - ball.pos
+        state = self.dribble.read(car, ball)
+        carrying = bot.info.spikes.carrying_index == car.index and state.is_above_roof()
+
+        if carrying:
+            # The ball is on the roof. Keep it balanced a bit in front of the middle, see util/dribble.py
+            accel_x, accel_y = dribble.balance_accel(state, self.offset_bias, 0.0)
+            falls_in = dribble.time_to_fall(state, accel_x, accel_y)
+            vel_f = dot(car.vel, car.forward)
+            speed = max(0.0, vel_f + accel_x * dribble.BALANCE_TIME)
+            # Turn to move under the ball sideways. Steering turns the car at a rate of its curvature, which gives a
+            # sideways acceleration of speed^2 * curvature at full lock. Turn towards the goal only while the ball
+            # is balanced, since turning pushes the ball sideways too
+            goal_local = dot(ball_to_goal, car.rot)
+            balanced = clip01(1 - abs(accel_y) / self.balanced_side_accel)
+            steer = balanced * self.goal_steer_gain * math.atan2(goal_local.y, goal_local.x) \
+                + accel_y / max(vel_f * vel_f * turn_curvature(abs(vel_f)), 1.0)
+            target = car.pos + (car.forward + car.left * clip(steer, -1, 1)) * 500
+        else:
+            falls_in = 0.0
+            ball_landing = predict.next_ball_landing(bot)
 
-        # Decide on target pos and speed
-        target = ball_landing.data["obj"].pos - self.offset_bias * normalize(ball_to_goal)
-        dist = norm(target - bot.info.my_car.pos)
-        speed = 1400 if ball_landing.time == 0 else dist / ball_landing.time
+            # Decide on target pos and speed
+            target = ball_landing.data["obj"].pos - self.offset_bias * normalize(ball_to_goal)
+            dist = norm(target - bot.info.my_car.pos)
+            speed = 1400 if ball_landing.time == 0 else dist / ball_landing.time
 
-        # Do a flick?
+        # Do a flick? Once the ball has been carried for a moment, when an enemy comes close or it is about to fall
         car_to_ball = ball.pos - car.pos
         dist = norm(car_to_ball)
         enemy, enemy_dist = bot.info.closest_enemy(ball.pos)
-        if dist <= self.required_distance_to_ball_for_flick:
-            self.flick_timer += bot.info.dt
-            if self.flick_timer > self.wait_before_flick and enemy_dist < 900:
-                bot.maneuver = DodgeManeuver(bot, bot.info.enemy_goal)  # use flick_init_jump_duration?
-        else:
-            self.flick_timer = 0
+        if carrying and dist <= self.required_distance_to_ball_for_flick \
+                and bot.info.spikes.carry_duration > self.wait_before_flick \
+                and ((enemy is not None and enemy_dist < 900) or falls_in < self.flick_before_falling):
+            bot.maneuver = DodgeManeuver(bot, bot.info.enemy_goal)  # use flick_init_jump_duration?
 
         if bot.do_rendering:
             bot.renderer.draw_line_3d(car.pos, target, bot.renderer.pink())
 
-        return bot.drive.go_towards_point(bot, target, target_vel=speed, slide=False, can_keep_speed=False, can_dodge=True, wall_offset_allowed=0)
+        return bot.drive.go_towards_point(bot, target, target_vel=speed, slide=False, can_keep_speed=False, can_dodge=not carrying, wall_offset_allowed=0)
 
     def reset(self):
         self.is_dribbling = False
-        self.flick_timer = 0
\ No newline at end of file
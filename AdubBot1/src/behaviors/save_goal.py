@@ -39,7 +39,7 @@ class SaveGoal(Choice):
         reachable_ball = predict.ball_predict(bot, reach_time)
         self.ball_to_goal_right = self.own_goal_right - reachable_ball.pos
         self.ball_to_goal_left = self.own_goal_left - reachable_ball.pos
-        self.aim_cone = AimCone(self.ball_to_goal_left, self.ball_to_goal_right)
+        self.aim_cone = AimCone.towards(reachable_ball.pos, self.own_goal_left, self.own_goal_right)
 
         if bot.do_rendering:
             self.aim_cone.draw(bot, reachable_ball.pos, r=200, g=0, b=160)
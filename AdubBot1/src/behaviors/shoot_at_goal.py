@@ -1,8 +1,9 @@
 from rlbot.agents.base_agent import SimpleControllerState
 
 from controllers.aim_cone import AimCone
+from controllers.shot_search import find_shots
 from behaviors.utsystem import Choice
-from maneuvers.collect_boost import CollectClosestBoostManeuver, filter_pads
+from maneuvers.collect_boost import CollectBoostOnRouteManeuver, filter_pads
 from util import predict, rendering
 from util.info import Field, Ball
 from util.rlmath import clip01, remap, is_closer_to_goal_than, lerp
@@ -31,7 +32,7 @@ class ShootAtGoal(Choice):
         reachable_ball = predict.ball_predict(bot, predict.time_till_reach_ball(bot.info.my_car, bot.info.ball))
         self.ball_to_goal_right = bot.info.enemy_goal_right - reachable_ball.pos
         self.ball_to_goal_left = bot.info.enemy_goal_left - reachable_ball.pos
-        self.aim_cone = AimCone(self.ball_to_goal_right, self.ball_to_goal_left)
+        self.aim_cone = AimCone.towards(reachable_ball.pos, bot.info.enemy_goal_right, bot.info.enemy_goal_left)
         car_to_ball = reachable_ball.pos - bot.info.my_car.pos
         in_position = self.aim_cone.contains_direction(car_to_ball)
 
@@ -46,6 +47,12 @@ class ShootAtGoal(Choice):
         ball = bot.info.ball
 
         my_hit_time = predict.time_till_reach_ball(car, ball)
+        if bot.world is not None:
+            # Aim for the best shot on the whole ball trajectory, if there is one
+            shots = find_shots(car, bot.world.trajectory, bot.world.time, bot.info.enemy_goal_right, bot.info.enemy_goal_left)
+            if shots:
+                my_hit_time = shots[0].time
+                self.aim_cone = AimCone.towards(shots[0].pos, bot.info.enemy_goal_right, bot.info.enemy_goal_left)
         shoot_controls = bot.shoot.with_aiming(bot, self.aim_cone, my_hit_time)
         if bot.do_rendering:
             self.aim_cone.draw(bot, bot.shoot.ball_when_hit.pos, b=0)
@@ -53,19 +60,24 @@ class ShootAtGoal(Choice):
         hit_pos = bot.shoot.ball_when_hit.pos
         dist = norm(car.pos - hit_pos)
         closest_enemy, enemy_dist = bot.info.closest_enemy(0.5 * (hit_pos + ball.pos))
+        # Without opponents, e.g. in training, pretend one waits in their goal
+        enemy_pos = bot.info.enemy_goal if closest_enemy is None else closest_enemy.pos
+        if closest_enemy is None:
+            enemy_dist = norm(enemy_pos - 0.5 * (hit_pos + ball.pos))
 
         if not bot.shoot.can_shoot and is_closer_to_goal_than(car.pos, hit_pos, bot.info.team):
             # Can't shoot but or at least on the right side: Chase
 
             goal_to_ball = normalize(hit_pos - bot.info.enemy_goal)
             offset_ball = hit_pos + goal_to_ball * Ball.RADIUS * 0.9
-            enemy_hit_time = predict.time_till_reach_ball(closest_enemy, ball)
-            enemy_hit_pos = predict.ball_predict(bot, enemy_hit_time).pos
-            if enemy_hit_time < 1.5 * my_hit_time:
-                self.temp_util_desire_boost -= bot.info.dt
-                if bot.do_rendering:
-                    bot.renderer.draw_line_3d(closest_enemy.pos, enemy_hit_pos, bot.renderer.red())
-                return bot.drive.go_home(bot)
+            if closest_enemy is not None:
+                enemy_hit_time = predict.time_till_reach_ball(closest_enemy, ball)
+                if enemy_hit_time < 1.5 * my_hit_time:
+                    self.temp_util_desire_boost -= bot.info.dt
+                    if bot.do_rendering:
+                        enemy_hit_pos = predict.ball_predict(bot, enemy_hit_time).pos
+                        bot.renderer.draw_line_3d(closest_enemy.pos, enemy_hit_pos, bot.renderer.red())
+                    return bot.drive.go_home(bot)
 
             if bot.do_rendering:
                 bot.renderer.draw_line_3d(car.pos, offset_ball, bot.renderer.yellow())
@@ -75,7 +87,7 @@ class ShootAtGoal(Choice):
         elif not bot.shoot.aim_is_ok and hit_pos.y * -bot.info.team_sign > 4250 and abs(hit_pos.x) > 900 and not dist < 420:
             # hit_pos is an enemy corner and we are not close: Avoid enemy corners and just wait
 
-            enemy_to_ball = normalize(hit_pos - closest_enemy.pos)
+            enemy_to_ball = normalize(hit_pos - enemy_pos)
             wait_point = hit_pos + enemy_to_ball * enemy_dist  # a point 50% closer to the center of the field
             wait_point = lerp(wait_point, ball.pos + Vec3(0, bot.info.team_sign * 3000, 0), 0.5)
 
@@ -86,16 +98,16 @@ class ShootAtGoal(Choice):
 
         elif not bot.shoot.can_shoot:
 
-            enemy_to_ball = normalize(xy(ball.pos - closest_enemy.pos))
+            enemy_to_ball = normalize(xy(ball.pos - enemy_pos))
             ball_to_my_goal = normalize(xy(bot.info.own_goal - ball.pos))
             dot_threat = dot(enemy_to_ball, ball_to_my_goal)  # 1 = enemy is in position, -1 = enemy is NOT in position
 
             if car.boost == 0 and ball.pos.y * bot.info.team_sign < 500 and dot_threat < 0.1:
 
                 collect_center = ball.pos.y * bot.info.team_sign <= 0
-                collect_small = closest_enemy.pos.y * bot.info.team_sign <= 0 or enemy_dist < 900
-                pads = filter_pads(bot, bot.info.big_boost_pads, big_only=not collect_small, enemy_side=False, center=collect_center)
-                bot.maneuver = CollectClosestBoostManeuver(bot, pads)
+                collect_small = enemy_pos.y * bot.info.team_sign <= 0 or enemy_dist < 900
+                pads = filter_pads(bot, bot.info.boost_pads, big_only=not collect_small, enemy_side=False, center=collect_center)
+                bot.maneuver = CollectBoostOnRouteManeuver(bot, bot.info.own_goal, pads=pads)
             # return home
             return bot.drive.go_home(bot)
 
@@ -13,10 +13,13 @@ class Choice:
 
 
 class utilSystem:
-    def __init__(self, choices, prev_bias=0.15):
+    prev_bias = 0.15  # Added to the score of the previous best choice
+
+    def __init__(self, choices, prev_bias=None):
         self.choices = choices
         self.current_best_index = -1
-        self.prev_bias = prev_bias
+        if prev_bias is not None:
+            self.prev_bias = prev_bias
 
     def evaluate(self, bot):
         best_index = -1
@@ -1,5 +1,7 @@
 # Import necessary modules for RLBot framework, custom controllers, behaviors, and utilities
 
+import time
+
 from rlbot.agents.base_agent import BaseAgent, SimpleControllerState
 from rlbot.messages.flat.QuickChatSelection import QuickChatSelection
 from rlbot.utils.structures.game_data_struct import GameTickPacket
@@ -12,6 +14,8 @@ from behaviors.shoot_at_goal import ShootAtGoal
 from controllers.fly import FlyController
 from maneuvers.kickoff import choose_kickoff_maneuver
 from util.info import GameInfo
+from util.latency import LatencyEstimator
+from util.world_model import WorldModel, shared_world_model
 from controllers.drive import DriveController
 from controllers.shooting import ShotController
 from controllers.aim_cone import AimCone
@@ -20,6 +24,14 @@ from behaviors.utsystem import utilSystem, Choice
 from util.vec import xy, Vec3, norm, dot
 
 RENDER = True  # enable or disable rendering
+# Share packet parsing and ball prediction caches with other bots in the same process. RLBot runs every Python bot
+# in its own process, so this only helps when several bots are hosted in one, e.g. headless/framework.py's AgentHost
+SHARE_WORLD_MODEL = False
+RECORD_TICKS = False  # record every packet to a tick log, see util/tick_log.py
+RECORD_BALL_PREDICTION = False  # also record the ball prediction in the tick log. It makes the log several times bigger
+LOG_MATCH = False  # log game state, controls and decisions to a columnar match log, see util/match_log.py
+LATENCY_FRAMES = 1  # extrapolate ball and cars by this many packet intervals of input latency, 0 to disable
+LATENCY_EXTRA = 0.0  # seconds of extra latency to extrapolate by, see util/latency.py
 
 class MyBot(BaseAgent):
     
@@ -27,6 +39,10 @@ class MyBot(BaseAgent):
         super().__init__(name, team, index)  # Initialize base agent
         self.do_rendering = RENDER  # Set rendering based on RENDER flag
         self.info = None  # GameInfo object for storing game data
+        self.world_model = None  # Builds the WorldFrame (cars, boost pads, ball prediction caches) for each packet
+        self.world = None  # WorldFrame of the current packet
+        self.recorder = None  # TickLogWriter if RECORD_TICKS is enabled
+        self.match_log = None  # MatchLogWriter if LOG_MATCH is enabled
         self.choice = None  # Current behavioral choice
         self.maneuver = None  # Current maneuver object
         self.doing_kickoff = False  # Flag for kickoff state
@@ -37,16 +53,31 @@ class MyBot(BaseAgent):
 
     def initialize_agent(self):
         # Setup game info and utility system at the start of the game
-        self.info = GameInfo(self.index, self.team)
+        self.info = GameInfo(self.index, self.team, LatencyEstimator(LATENCY_FRAMES, LATENCY_EXTRA))
+        self.world_model = shared_world_model() if SHARE_WORLD_MODEL else WorldModel()
+        # The logs are off by default, so their modules are only imported when they are enabled
+        if RECORD_TICKS:
+            from util.tick_log import TickLogWriter
+            self.recorder = TickLogWriter(f"ticks_{self.index}_{int(time.time())}.bin", self.index, self.team,
+                                          RECORD_BALL_PREDICTION)
+        if LOG_MATCH:
+            from util.match_log import MatchLogWriter
+            self.match_log = MatchLogWriter(f"match_{self.index}_{int(time.time())}")
         self.ut = utilSystem([DefaultBehaviour(), ShootAtGoal(), ClearBall(self), SaveGoal(self), Carry()])
 
     def get_output(self, packet: GameTickPacket) -> SimpleControllerState:
         # Process game tick packet to update game info
         if not self.info.field_info_loaded:
-            self.info.read_field_info(self.get_field_info())
+            field_info = self.get_field_info()
+            self.info.read_field_info(field_info)
             if not self.info.field_info_loaded:
                 return SimpleControllerState()  # Return empty controls if field info isn't loaded
-        self.info.read_packet(packet)
+            if self.recorder is not None:
+                self.recorder.write_field_info(field_info)
+        self.world = self.world_model.get_frame(packet, super().get_ball_prediction_struct)
+        self.info.read_packet(packet, self.world)
+        if self.recorder is not None:
+            self.recorder.write_tick(packet, self.world.ball_prediction)
 
         # End game celebration
         if packet.game_info.is_match_ended:
@@ -73,8 +104,23 @@ class MyBot(BaseAgent):
         # Feedback for next tick
         self.feedback(controller)
 
+        if self.match_log is not None:
+            self.match_log.write_tick(packet, self.world, self.info, controller, self.choice, self.maneuver)
+
         return controller  # Return the controller state for car movement
 
+    def retire(self):
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.match_log is not None:
+            self.match_log.close()
+
+    def get_ball_prediction_struct(self):
+        # The ball prediction is fetched once per packet and kept in the WorldFrame
+        if self.world is not None:
+            return self.world.ball_prediction
+        return super().get_ball_prediction_struct()
+
     def print(self, s):
         # Custom print function to log with team color
         team_name = "[BLUE]" if self.team == 0 else "[ORANGE]"
@@ -85,10 +131,14 @@ class MyBot(BaseAgent):
         if controller is None:
             self.print(f"None controller from state: {self.choice.__class__} & {self.maneuver.__class__}")
         else:
-            self.info.my_car.last_input.roll = controller.roll
-            self.info.my_car.last_input.pitch = controller.pitch
-            self.info.my_car.last_input.yaw = controller.yaw
-            self.info.my_car.last_input.boost = controller.boost
+            last_input = self.info.my_car.last_input
+            last_input.throttle = controller.throttle
+            last_input.steer = controller.steer
+            last_input.roll = controller.roll
+            last_input.pitch = controller.pitch
+            last_input.yaw = controller.yaw
+            last_input.boost = controller.boost
+            last_input.handbrake = controller.handbrake
 
     def use_brain(self) -> SimpleControllerState:
         # Decision making logic for kickoff and regular gameplay
@@ -1,35 +1,89 @@
 import math
+from collections import OrderedDict
+
+import numpy as np
 
 from util import rendering
 from util.curves import curve_from_arrival_dir
 from util.info import Field
 from util.rlmath import fix_ang, clip
-from util.vec import normalize, angle_between, Vec3, xy
+from util.vec import normalize, angle_between, Vec3, xy, norm
 
 
 class AimCone:
+    """
+    The directions between right_most and left_most, going counter-clockwise from right_most. The center and the span
+    are computed once, so a cone is cheap to test against. Cones aren't changed after they are made and can be shared,
+    see AimCone.towards().
+    """
+    __slots__ = ("right_ang", "right_dir", "left_ang", "left_dir", "_span", "_center_ang", "_center_dir", "_cos_half_span")
+
+    # Cones made by towards(), keyed by the origin snapped to a grid and the targets. The least recently used cone is
+    # dropped when the cache is full
+    _cache = OrderedDict()
+    CACHE_SIZE = 64
+    ORIGIN_STEP = 4  # Grid size for origins. The angles of a cone from 1000 uu away are off by at most 0.003 rad
+
     def __init__(self, right_most, left_most):
         self.right_ang = math.atan2(right_most.y, right_most.x)
         self.right_dir = normalize(right_most)
         self.left_ang = math.atan2(left_most.y, left_most.x)
         self.left_dir = normalize(left_most)
 
+        if self.right_ang < self.left_ang:
+            self._span = math.tau + self.right_ang - self.left_ang
+        else:
+            self._span = self.right_ang - self.left_ang
+        self._center_ang = fix_ang(self.right_ang - self._span / 2)
+        self._center_dir = Vec3(math.cos(self._center_ang), math.sin(self._center_ang), 0)
+        self._cos_half_span = math.cos(self._span / 2)
+
+    @classmethod
+    def towards(cls, origin: Vec3, right_target: Vec3, left_target: Vec3) -> "AimCone":
+        """
+        The cone from origin to two points, e.g. the ball to a goal's posts. Behaviours ask for the same cone several
+        times per tick, and the origin often barely moves between ticks, so cones are kept and reused. The cone is the
+        one from the nearest grid point, see ORIGIN_STEP. Cones only depend on x and y
+        """
+        step = cls.ORIGIN_STEP
+        gx, gy = round(origin.x / step), round(origin.y / step)
+        key = (gx, gy, right_target.x, right_target.y, left_target.x, left_target.y)
+        cache = cls._cache
+        cone = cache.get(key)
+        if cone is None:
+            if len(cache) >= cls.CACHE_SIZE:
+                cache.popitem(last=False)
+            grid_origin = Vec3(gx * step, gy * step, 0)
+            cone = cache[key] = cls(right_target - grid_origin, left_target - grid_origin)
+        else:
+            cache.move_to_end(key)
+        return cone
+
     def contains_direction(self, direction, span_offset: float=0):
-        ang_delta = angle_between(direction, self.get_center_dir())
-        return abs(ang_delta) < self.span_size() / 2.0 + span_offset
+        # Same as angle_between(direction, center_dir) < span / 2 + span_offset, without the acos
+        limit = self._span / 2.0 + span_offset
+        if limit >= math.pi or limit <= 0:
+            return limit > 0
+        cos_limit = self._cos_half_span if span_offset == 0 else math.cos(limit)
+        center = self._center_dir
+        return direction.x * center.x + direction.y * center.y > cos_limit * norm(direction)
+
+    def contains_directions(self, directions: np.ndarray, span_offset: float=0) -> np.ndarray:
+        """ contains_direction() for an array of directions, shape (n, 2) or (n, 3). Returns an array of bools """
+        limit = self._span / 2.0 + span_offset
+        if limit >= math.pi or limit <= 0:
+            return np.full(len(directions), limit > 0)
+        along = directions[:, 0] * self._center_dir.x + directions[:, 1] * self._center_dir.y
+        return along > math.cos(limit) * np.linalg.norm(directions, axis=1)
 
     def span_size(self):
-        if self.right_ang < self.left_ang:
-            return math.tau + self.right_ang - self.left_ang
-        else:
-            return self.right_ang - self.left_ang
+        return self._span
 
     def get_center_ang(self):
-        return fix_ang(self.right_ang - self.span_size() / 2)
+        return self._center_ang
 
     def get_center_dir(self):
-        ang = self.get_center_ang()
-        return Vec3(math.cos(ang), math.sin(ang), 0)
+        return self._center_dir
 
     def get_closest_dir_in_cone(self, direction, span_offset: float=0):
         if self.contains_direction(direction, span_offset):
@@ -39,6 +93,15 @@ class AimCone:
             ang_to_left = abs(angle_between(direction, self.left_dir))
             return self.right_dir if ang_to_right < ang_to_left else self.left_dir
 
+    def clamp_directions(self, directions: np.ndarray, span_offset: float=0) -> np.ndarray:
+        """ get_closest_dir_in_cone() for an array of directions, shape (n, 3). Returns unit directions """
+        unit = directions / np.linalg.norm(directions, axis=1)[:, np.newaxis]
+        right = np.array([self.right_dir.x, self.right_dir.y, self.right_dir.z])
+        left = np.array([self.left_dir.x, self.left_dir.y, self.left_dir.z])
+        # The closest edge is the one with the smallest angle, i.e. the largest dot product
+        edge = np.where((unit @ right > unit @ left)[:, np.newaxis], right, left)
+        return np.where(self.contains_directions(unit, span_offset)[:, np.newaxis], unit, edge)
+
     def get_goto_point(self, bot, src, point):
         point = xy(point)
         desired_dir = self.get_center_dir()
@@ -85,4 +148,16 @@ class AimCone:
             arm_dir = Vec3(math.cos(ang), math.sin(ang), 0)
             end = center + arm_dir * arm_len
             alpha = 255 if i == 0 or i == arm_count - 1 else 110
-            renderer.draw_line_3d(center, end, renderer.create_color(alpha, r, g, b))
\ No newline at end of file
+            renderer.draw_line_3d(center, end, renderer.create_color(alpha, r, g, b))
+
+
+def cone_angles(origins: np.ndarray, right_target: Vec3, left_target: Vec3):
+    """
+    The cones from many origins, shape (n, 2) or (n, 3), to the same two points. Returns the center angles and the
+    half spans, like AimCone(right_target - origin, left_target - origin) does for a single origin
+    """
+    right_ang = np.arctan2(right_target.y - origins[:, 1], right_target.x - origins[:, 0])
+    left_ang = np.arctan2(left_target.y - origins[:, 1], left_target.x - origins[:, 0])
+    span = (right_ang - left_ang) % math.tau
+    center_ang = (right_ang - span / 2 + math.pi) % math.tau - math.pi
+    return center_ang, span / 2
@@ -2,21 +2,25 @@ import math
 
 from rlbot.agents.base_agent import SimpleControllerState
 
-from controllers.other import turn_radius, is_heading_towards
+from controllers.other import turn_radius, turn_curvature, is_heading_towards
 from maneuvers.dodge import DodgeManeuver
-from maneuvers.halfflip import HalfFlipManeuver
 from maneuvers.recovery import RecoveryManeuver
 from util import rendering
-from util.info import is_near_wall, Field
+from util.avoidance import LocalAvoidance
+from util.dubins import DubinsPath, shortest_path, heading_of
+from util.dodge_table import dodge_outcome
+from util.dynamics import BRAKE_ACCEL, time_to_speed, distance_to_speed, distance_in_time
+from util.info import is_near_wall
 from util.rlmath import lerp, sign, clip
 from util.vec import Vec3, angle_between, xy, dot, norm, proj_onto_size, normalize
 
 
 class HandbrakeLimiter:
+    HANDBRAKE_FRAMES = 10
+    WAIT_FRAMES = 16
+
     def __init__(self):
         self.tick = 0
-        self.HANDBRAKE_FRAMES = 10
-        self.WAIT_FRAMES = 16
 
     def can_handbrake(self):
         self.tick = (self.tick % (self.HANDBRAKE_FRAMES + self.WAIT_FRAMES))
@@ -24,6 +28,17 @@ class HandbrakeLimiter:
 
 
 class DriveController:
+    # Path following, see go_along_path()
+    PATH_TOLERANCE = 70  # Re-plan when the car is further than this from the path
+    PATH_RETARGET_DIST = 60  # Re-plan when the target moves further than this
+    PATH_RETARGET_ANG = 0.1  # Re-plan when the arrival direction turns more than this
+    PATH_RADIUS_MARGIN = 1.1  # Plan a bit wider than the car can turn, so it can always catch up with the path
+    PATH_MIN_LOOKAHEAD = 150
+    PATH_SPEEDS = (2200, 1800, 1400, 1000, 700)  # Speeds to plan turns for
+
+    # Dodging, see dodge_pays_off()
+    DODGE_LAND_MARGIN = 500  # A dodge must land this far before the point, so there is time to line up again
+
     def __init__(self):
         self.controls = SimpleControllerState()
         self.dodge = None
@@ -32,6 +47,22 @@ class DriveController:
         self.dodge_cooldown = 0.27
         self.recovery = None
         self.handbrake_limiter = HandbrakeLimiter()
+        self.path: DubinsPath = None
+        self.path_target = None
+        self.path_arrival_heading = 0.0
+        self.paths_planned = 0
+        self.avoidance = LocalAvoidance()
+
+    def dodge_pays_off(self, speed: float, dist: float, boost: bool) -> bool:
+        """
+        Whether a forward dodge gets the car further than driving for the same time would, and lands soon enough
+        before a point dist away. See util/dodge_table.py. The timings are read from DodgeManeuver every time, since
+        they are tunable
+        """
+        delay = DodgeManeuver.t_first_jump + DodgeManeuver.t_first_wait + DodgeManeuver.t_aim  # Jump to dodge
+        outcome = dodge_outcome(speed, 0.0, delay, DodgeManeuver.t_first_jump)
+        return outcome.disp_forward + self.DODGE_LAND_MARGIN < dist \
+            and outcome.disp_forward > distance_in_time(speed, outcome.time, boost)
 
     def start_dodge(self, bot):
         if self.dodge is None:
@@ -61,8 +92,8 @@ class DriveController:
         if not is_near_wall(point, wall_offset_allowed) and angle_between(car.up, Vec3(0, 0, 1)) > math.pi * 0.31:
             point = lerp(xy(car.pos), xy(point), 0.5)
 
-        # If the car is in a goal, avoid goal posts
-        self.avoid_goal_post(bot, point)
+        # Drive around goal posts, goal walls and other cars
+        point = self.avoid_obstacles(bot, point)
 
         car_to_point = point - car.pos
 
@@ -80,11 +111,13 @@ class DriveController:
 
         # Start dodge
         if can_dodge and abs(angle) <= 0.02 and vel_towards_point > REQUIRED_VELF_FOR_DODGE\
-                and dist > vel_towards_point + 500 + 900 and bot.info.time > self.last_dodge_end_time + self.dodge_cooldown:
+                and bot.info.time > self.last_dodge_end_time + self.dodge_cooldown\
+                and self.dodge_pays_off(vel_towards_point, dist, car.boost > boost_min):
             self.dodge = DodgeManeuver(bot, point)
         # Start half-flip
         elif can_dodge and abs(angle) >= 3 and vel_towards_point < 50\
                 and dist > -vel_towards_point + 500 + 900 and bot.info.time > self.last_dodge_end_time + self.dodge_cooldown:
+            from maneuvers.halfflip import HalfFlipManeuver  # Rarely used, so only imported when needed
             self.dodge = HalfFlipManeuver(bot, boost=car.boost > boost_min + 10)
 
         # Is point right behind? Maybe reverse instead
@@ -115,13 +148,6 @@ class DriveController:
                 self.controls.steer = -0.5 * sign(angle)
 
         else:
-            # Should drop speed or just keep up the speed?
-            if can_keep_speed and target_vel < vel_towards_point:
-                target_vel = vel_towards_point
-            else:
-                # Small lerp adjustment
-                target_vel = lerp(vel_towards_point, target_vel, 1.1)
-
             # Turn and maybe slide
             self.controls.steer = clip(angle + (2.5*angle) ** 3, -1.0, 1.0)
             if slide and abs(angle) > REQUIRED_ANG_FOR_SLIDE and self.handbrake_limiter.can_handbrake():
@@ -130,55 +156,131 @@ class DriveController:
             else:
                 self.controls.handbrake = False
 
-            # Overshoot target vel for quick adjustment
-            target_vel = lerp(vel_towards_point, target_vel, 1.2)
+            self.set_speed_controls(car, angle, dist, vel_towards_point, target_vel, boost_min, can_keep_speed)
 
-            # Find appropriate throttle/boost
-            if vel_towards_point < target_vel:
-                self.controls.throttle = 1
-                if boost_min < car.boost and vel_towards_point + 80 < target_vel and target_vel > 1400 \
-                        and not self.controls.handbrake and is_heading_towards(angle, dist):
-                    self.controls.boost = True
-                else:
-                    self.controls.boost = False
+        # Saved if something outside calls start_dodge() in the meantime
+        self.last_point = point
 
+        return self.controls
+
+    def set_speed_controls(self, car, angle, dist, vel_towards_point, target_vel, boost_min, can_keep_speed):
+        """ Sets throttle and boost to reach the target velocity. Steer and handbrake must be set already """
+        # Should drop speed or just keep up the speed?
+        if can_keep_speed and target_vel < vel_towards_point:
+            target_vel = vel_towards_point
+        else:
+            # Small lerp adjustment
+            target_vel = lerp(vel_towards_point, target_vel, 1.1)
+
+        # Overshoot target vel for quick adjustment
+        target_vel = lerp(vel_towards_point, target_vel, 1.2)
+
+        # Find appropriate throttle/boost
+        if vel_towards_point < target_vel:
+            self.controls.throttle = 1
+            if boost_min < car.boost and vel_towards_point + 80 < target_vel and target_vel > 1400 \
+                    and not self.controls.handbrake and is_heading_towards(angle, dist):
+                self.controls.boost = True
             else:
-                vel_delta = target_vel - vel_towards_point
-                self.controls.throttle = clip(0.2 + vel_delta / 500, 0, -1)
                 self.controls.boost = False
-                if self.controls.handbrake:
-                    self.controls.throttle = min(0.4, self.controls.throttle)
 
-        # Saved if something outside calls start_dodge() in the meantime
-        self.last_point = point
+        else:
+            vel_delta = target_vel - vel_towards_point
+            self.controls.throttle = clip(0.2 + vel_delta / 500, 0, -1)
+            self.controls.boost = False
+            if self.controls.handbrake:
+                self.controls.throttle = min(0.4, self.controls.throttle)
+
+    def plan_path(self, bot, target: Vec3, arrival_dir: Vec3, target_vel: float=1430) -> DubinsPath:
+        """
+        Returns the quickest path to the target that arrives in the given direction. Tighter turns need lower speeds,
+        so paths are planned with the turn radius of each of PATH_SPEEDS up to the target velocity, and the one with
+        the earliest estimated arrival is used. The path's speed is the fastest the car can take its turns.
+        The path is cached and only re-planned when the target or arrival direction change, or when the car has
+        drifted off it.
+        """
+        car = bot.info.my_car
+        path = self.path
+        if path is not None:
+            replan = norm(xy(target - self.path_target)) > self.PATH_RETARGET_DIST \
+                or abs(math.remainder(heading_of(arrival_dir) - self.path_arrival_heading, math.tau)) > self.PATH_RETARGET_ANG \
+                or path.closest(car.pos)[1] > self.PATH_TOLERANCE
+        else:
+            replan = True
+
+        if replan:
+            vel_f = max(0.0, proj_onto_size(car.vel, car.forward))
+            boost = car.boost > 0
+            best_time = math.inf
+            for speed in self.PATH_SPEEDS:
+                if speed > max(target_vel, self.PATH_SPEEDS[-1]):
+                    continue
+                # Time to change speed, plus driving the rest of the path at that speed. Speeds the car can't reach
+                # without boost take forever, and the slowest speed can always be reached
+                change_time = time_to_speed(vel_f, speed, boost)
+                change_dist = distance_to_speed(vel_f, speed, boost)
+                radius = turn_radius(speed) * self.PATH_RADIUS_MARGIN
+                candidate = shortest_path(car.pos, heading_of(car.forward), target, heading_of(arrival_dir), radius)
+                time = change_time + max(0.0, candidate.length - change_dist) / speed
+                if time < best_time:
+                    best_time = time
+                    self.path = candidate
+                    self.path.speed = speed
+            self.path_target = Vec3(target)
+            self.path_arrival_heading = heading_of(arrival_dir)
+            self.paths_planned += 1
+        return self.path
+
+    def go_along_path(self, bot, target: Vec3, arrival_dir: Vec3, target_vel=1430, boost_min=101, can_keep_speed=True, can_dodge=True) -> SimpleControllerState:
+        """
+        Drives to the target, arriving in the given direction, by following the path from plan_path(). Steering
+        aims at a point a bit further ahead on the path (pure pursuit), so arcs are driven at their planned curvature.
+        Dodges, recoveries and walls are left to go_towards_point().
+        """
+        car = bot.info.my_car
+        if self.dodge is not None or not car.on_ground or angle_between(car.up, Vec3(0, 0, 1)) > math.pi * 0.31:
+            return self.go_towards_point(bot, target, target_vel, boost_min=boost_min, can_keep_speed=can_keep_speed, can_dodge=can_dodge)
+
+        path = self.plan_path(bot, target, arrival_dir, target_vel)
+        vel_f = proj_onto_size(car.vel, car.forward)
+        s, _ = path.closest(car.pos)
+        lookahead = max(self.PATH_MIN_LOOKAHEAD, 0.25 * abs(vel_f))
+        point = path.point_at(s + lookahead)
+
+        point_local = dot(point - car.pos, car.rot)
+        angle = math.atan2(point_local.y, point_local.x)
+        dist = norm(point_local)
 
+        # Curvature of the arc through the point that is tangent to the car's heading, relative to the tightest turn
+        curvature = 2 * math.sin(angle) / max(dist, 1)
+        max_curvature = turn_curvature(clip(abs(vel_f), 0, 2200))
+        self.controls.steer = clip(curvature / max_curvature, -1, 1)
+        self.controls.handbrake = False
+
+        # Slow down for the turns, braking early enough before reaching them
+        dist_to_turn = path.dist_to_turn(s)
+        if dist_to_turn is not None:
+            target_vel = min(target_vel, math.sqrt(path.speed ** 2 + BRAKE_ACCEL * dist_to_turn))
+            can_keep_speed = False
+
+        vel_towards_point = proj_onto_size(car.vel, point - car.pos)
+        self.set_speed_controls(car, angle, path.length - s, vel_towards_point, target_vel, boost_min, can_keep_speed)
+
+        if bot.do_rendering:
+            path.draw(bot, bot.renderer.create_color(255, 150, 150, 150))
+            bot.renderer.draw_line_3d(car.pos, point, bot.renderer.white())
+
+        self.last_point = point
         return self.controls
 
-    def avoid_goal_post(self, bot, point):
+    def avoid_obstacles(self, bot, point: Vec3) -> Vec3:
+        """ Returns a point to drive towards instead of the given one if something is in the way, see util/avoidance.py """
         car = bot.info.my_car
-        car_to_point = point - car.pos
-
-        # Car is not in goal, not adjustment needed
-        if abs(car.pos.y) < Field.LENGTH / 2:
-            return
-
-        # Car can go straight, not adjustment needed
-        if car_to_point.x == 0:
-            return
-
-        # Do we need to cross a goal post to get to the point?
-        goalx = Field.GOAL_WIDTH / 2 - 100
-        goaly = Field.LENGTH / 2 - 100
-        t = max((goalx - car.pos.x) / car_to_point.x,
-                (-goalx - car.pos.x) / car_to_point.x)
-        # This is the y coordinate when car would hit a goal wall. Is that inside the goal?
-        crossing_goalx_at_y = abs(car.pos.y + t * car_to_point.y)
-        if crossing_goalx_at_y > goaly:
-            # Adjustment is needed
-            point.x = clip(point.x, -goalx, goalx)
-            point.y = clip(point.y, -goaly, goaly)
-            if bot.do_rendering:
-                bot.renderer.draw_line_3d(car.pos, point, bot.renderer.green())
+        self.avoidance.update_cars(bot.info.car_table, car.index)
+        adjusted, obstacle = self.avoidance.adjust(car.pos, car.vel, point)
+        if obstacle >= 0 and bot.do_rendering:
+            bot.renderer.draw_line_3d(car.pos, adjusted, bot.renderer.green())
+        return adjusted
 
     def go_home(self, bot):
         car = bot.info.my_car
@@ -186,6 +288,9 @@ class DriveController:
         target = home
 
         closest_enemy, enemy_dist = bot.info.closest_enemy(bot.info.ball.pos)
+        if closest_enemy is None:
+            # No opponents, e.g. in training. Pretend one waits in their goal
+            enemy_dist = norm(bot.info.enemy_goal - bot.info.ball.pos)
 
         car_to_home = home - car.pos
         dist = norm(car_to_home)
@@ -3,6 +3,8 @@ import time
 
 from rlbot.agents.base_agent import SimpleControllerState
 
+from util.dynamics import turn_curvature  # Table lookup, see util/dynamics.py
+
 
 def celebrate(bot):
     controls = SimpleControllerState()
@@ -21,18 +23,3 @@ def turn_radius(vf):
     if vf == 0:
         return 0
     return 1.0 / turn_curvature(vf)
-
-
-def turn_curvature(vf):
-    if 0.0 <= vf < 500.0:
-        return 0.006900 - 5.84e-6 * vf
-    elif 500.0 <= vf < 1000.0:
-        return 0.005610 - 3.26e-6 * vf
-    elif 1000.0 <= vf < 1500.0:
-        return 0.004300 - 1.95e-6 * vf
-    elif 1500.0 <= vf < 1750.0:
-        return 0.003025 - 1.10e-6 * vf
-    elif 1750.0 <= vf < 2500.0:
-        return 0.001800 - 0.40e-6 * vf
-    else:
-        return 0.0
\ No newline at end of file
@@ -3,7 +3,6 @@ import math
 from rlbot.agents.base_agent import SimpleControllerState
 
 from controllers.aim_cone import AimCone
-from maneuvers.small_jump import SmallJumpManeuver
 from util.curves import curve_from_arrival_dir
 from util.info import Ball, Field
 from util.predict import ball_predict, next_ball_landing
@@ -12,8 +11,11 @@ from util.vec import dot, normalize, proj_onto_size, xy, norm, angle_between
 
 
 class ShotController:
+    MAX_PATH_DETOUR = 1.3  # Curve shots follow a planned path if it is at most this much longer than the distance
+
     def __init__(self):
-        self.controls = SimpleControllerState()
+        self.no_controls = SimpleControllerState()  # Used while there is no shot. Never modified, so it is reused
+        self.controls = self.no_controls
         self.dodge = None
         self.last_point = None
         self.last_dodge_end_time = 0
@@ -48,7 +50,7 @@ class ShotController:
 
         # FIXME if the ball is not on the ground we treat it as 'soon on ground' in all other cases
 
-        self.controls = SimpleControllerState()
+        self.controls = self.no_controls
         self.aim_is_ok = False
         self.waits_for_fall = False
         self.ball_is_flying = False
@@ -82,6 +84,7 @@ class ShotController:
 
                 if vel_f > 400:
                     if diff < 150 and ball_in_front:
+                        from maneuvers.small_jump import SmallJumpManeuver  # Rarely used, imported when needed
                         bot.maneuver = SmallJumpManeuver(bot, lambda b: b.info.ball.pos)
 
             if 110 < ball_soon.pos.z:  # and ball_soon.vel.z <= 0:
@@ -120,17 +123,28 @@ class ShotController:
                 self.can_shoot = True
 
                 offset_point = xy(ball_soon.pos) - 50 * aim_cone.get_center_dir()
-                closest_dir = aim_cone.get_closest_dir_in_cone(car_to_ball_soon)
-                self.curve_point = curve_from_arrival_dir(car.pos, offset_point, closest_dir)
-
-                self.curve_point.x = clip(self.curve_point.x, -Field.WIDTH / 2, Field.WIDTH / 2)
-                self.curve_point.y = clip(self.curve_point.y, -Field.LENGTH / 2, Field.LENGTH / 2)
+                center_dir = aim_cone.get_center_dir()
 
                 if dodge_hit and norm(car_to_ball_soon) < 240 + Ball.RADIUS and angle_between(car.forward, car_to_ball_soon) < 0.5\
                         and aim_cone.contains_direction(car_to_ball_soon) and vel_towards_ball_soon > 300:
                     bot.drive.start_dodge(bot)
 
-                speed = self.determine_speed(norm(car_to_ball_soon), time)
+                # Follow a path that arrives along the center of the cone. Its length is the distance the car actually
+                # has to drive
+                dist = norm(car_to_ball_soon)
+                path = bot.drive.plan_path(bot, offset_point, center_dir, self.determine_speed(dist, time))
+                if path.length < self.MAX_PATH_DETOUR * dist:
+                    self.curve_point = path.point_at(path.segments[0].length)  # Where the first turn ends
+                    speed = self.determine_speed(path.remaining(car.pos), time)
+                    self.controls = bot.drive.go_along_path(bot, offset_point, center_dir, target_vel=speed, boost_min=0, can_keep_speed=False)
+                    return self.controls
+
+                # Arriving along the cone takes a loop. Curve towards it as well as we can instead
+                self.curve_point = curve_from_arrival_dir(car.pos, offset_point, center_dir)
+                self.curve_point.x = clip(self.curve_point.x, -Field.WIDTH / 2, Field.WIDTH / 2)
+                self.curve_point.y = clip(self.curve_point.y, -Field.LENGTH / 2, Field.LENGTH / 2)
+
+                speed = self.determine_speed(dist, time)
                 self.controls = bot.drive.go_towards_point(bot, self.curve_point, target_vel=speed, slide=True, boost_min=0, can_keep_speed=False)
                 return self.controls
 
@@ -0,0 +1,96 @@
+import math
+from typing import List
+
+import numpy as np
+
+from controllers.aim_cone import cone_angles
+from controllers.other import turn_radius
+from util.dynamics import distance_in_time_array
+from util.info import Ball
+from util.vec import Vec3, dot
+from util.world_model import BallTrajectory
+
+# Balls higher than this need a jump or an aerial and are not considered
+MAX_HEIGHT = 300
+# Balls lower than this can be hit by just driving into them
+GROUND_HEIGHT = 110
+# Approach directions this far outside the aim cone can still be turned into a shot with a curve
+CURVE_TOLERANCE = math.pi / 5
+# The car touches the ball when its center is about this far from the ball's center
+CONTACT_DIST = Ball.RADIUS + 50
+# Fraction of the distance the car could cover that it is trusted to cover. Turns and bumps slow it down
+REACH_MARGIN = 0.85
+# Shots later than this are worth nothing for their timing
+MAX_SHOT_TIME = 4.0
+
+# How much each part of the score counts
+AIM_WEIGHT = 1.0
+HEIGHT_WEIGHT = 0.5
+SPEED_WEIGHT = 0.5
+TIME_WEIGHT = 0.8
+
+
+class ShotCandidate:
+    """ A trajectory slice that the car can reach in time and hit towards the goal """
+    __slots__ = ("index", "time", "pos", "vel", "score", "aim_error")
+
+    def __init__(self, index: int, time: float, pos: Vec3, vel: Vec3, score: float, aim_error: float):
+        self.index = index  # Slice index in the trajectory
+        self.time = time  # Seconds from now
+        self.pos = pos
+        self.vel = vel
+        self.score = score
+        self.aim_error = aim_error  # Angle between the approach and the aim cone. 0 or less is inside the cone
+
+
+def _wrap(ang: np.ndarray) -> np.ndarray:
+    return (ang + math.pi) % math.tau - math.pi
+
+
+def find_shots(car, trajectory: BallTrajectory, now: float, right_post: Vec3, left_post: Vec3,
+               count: int=3) -> List[ShotCandidate]:
+    """
+    Evaluates every slice of the ball trajectory at once and returns up to count shot candidates, best first.
+    A slice is a candidate if the ball is low enough, if the car can get there in time (driving straight at full
+    throttle after turning towards it, with boost if it has any, see util/dynamics.py), and if the car's approach
+    direction is in the aim cone from the ball to the posts, or close enough to curve into it.
+    The score prefers shots that are well aimed, low, hit hard and soon.
+    """
+    if trajectory.count == 0:
+        return []
+
+    # Slices in the future with the ball low enough
+    time = trajectory.time - now
+    indices = np.flatnonzero((time > 0) & (trajectory.pos[:, 2] < MAX_HEIGHT))
+    time = time[indices]
+    pos = trajectory.pos[indices]
+    dx = pos[:, 0] - car.pos.x
+    dy = pos[:, 1] - car.pos.y
+
+    # Can the car get there in time? Turning towards the ball costs roughly an arc of the current turn radius
+    speed = max(0.0, dot(car.vel, car.forward))
+    approach = np.arctan2(dy, dx)
+    turn = np.abs(_wrap(approach - math.atan2(car.forward.y, car.forward.x)))
+    needed = np.maximum(np.hypot(dx, dy) - CONTACT_DIST, 0) + turn_radius(speed) * turn
+    reachable = needed <= REACH_MARGIN * distance_in_time_array(speed, time, car.boost > 0)
+
+    # The aim cone of every slice
+    center_ang, half_span = cone_angles(pos, right_post, left_post)
+    aim_error = np.abs(_wrap(approach - center_ang)) - half_span
+
+    is_candidate = reachable & (aim_error < CURVE_TOLERANCE)
+    if not is_candidate.any():
+        return []
+    indices, time, aim_error, height, needed = indices[is_candidate], time[is_candidate], aim_error[is_candidate], \
+        pos[is_candidate, 2], needed[is_candidate]
+
+    # Score the candidates
+    aim_score = 1 - np.clip(aim_error / CURVE_TOLERANCE, 0, 1)
+    height_score = 1 - np.clip((height - GROUND_HEIGHT) / (MAX_HEIGHT - GROUND_HEIGHT), 0, 1)
+    speed_score = np.clip(needed / time / 2300, 0, 1)  # The average speed needed to get there in time
+    time_score = 1 - np.clip(time / MAX_SHOT_TIME, 0, 1)
+    score = AIM_WEIGHT * aim_score + HEIGHT_WEIGHT * height_score + SPEED_WEIGHT * speed_score + TIME_WEIGHT * time_score
+
+    best = np.argsort(-score)[:count]
+    return [ShotCandidate(int(indices[i]), float(time[i]), Vec3(*trajectory.pos[indices[i]]),
+                          Vec3(*trajectory.vel[indices[i]]), float(score[i]), float(aim_error[i])) for i in best]
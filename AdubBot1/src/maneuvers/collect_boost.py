@@ -6,7 +6,7 @@ from rlbot.agents.base_agent import SimpleControllerState
 
 from maneuvers.maneuver import Maneuver
 from util.info import BoostPad
-from util.vec import norm, proj_onto_size
+from util.vec import Vec3, norm, proj_onto_size
 
 
 class CollectClosestBoostManeuver(Maneuver):
@@ -23,16 +23,11 @@ class CollectClosestBoostManeuver(Maneuver):
         self.pick_pad(bot, pads)
 
     def pick_pad(self, bot, pads: List[BoostPad]):
-        # Find closest boost pad
-        my_pos = bot.info.my_car.pos
-        shortest_dist = 99999999
-        for pad in pads:
-            if pad.is_active:
-                dist = norm(my_pos - pad.pos)
-                if dist < shortest_dist:
-                    self.closest_pad = pad
-                    shortest_dist = dist
-
+        # Find closest active boost pad among the given pads
+        pad_index = bot.info.boost_pad_index
+        index, dist = pad_index.nearest_active(bot.info.my_car.pos, pad_index.mask_of(pads))
+        if index >= 0:
+            self.closest_pad = bot.info.boost_pads[index]
 
     def exec(self, bot) -> SimpleControllerState:
         car = bot.info.my_car
@@ -53,15 +48,32 @@ class CollectClosestBoostManeuver(Maneuver):
         return bot.drive.go_towards_point(bot, self.closest_pad.pos, target_vel=2200, slide=True, boost_min=0, can_dodge=self.closest_pad.is_big)
 
 
+class CollectBoostOnRouteManeuver(Maneuver):
+    """
+    Drives towards a destination along the fastest route that picks up enough boost to get there with min_boost, see
+    util/boost_route.py. Ends when the car has the boost, or when no route is left
+    """
+
+    def __init__(self, bot, destination: Vec3, min_boost: int=50, pads: List[BoostPad]=None):
+        super().__init__()
+        self.destination = destination
+        self.min_boost = min_boost
+        self.mask = None if pads is None else bot.info.boost_pad_index.mask_of(pads)
+
+    def exec(self, bot) -> SimpleControllerState:
+        car = bot.info.my_car
+        route = bot.info.boost_routes.plan(car, self.destination, self.min_boost, self.mask)
+        if route is None or not route.pads or car.boost >= self.min_boost:
+            self.done = True
+            return bot.drive.go_towards_point(bot, self.destination, target_vel=2200, slide=True, boost_min=0)
+
+        pad = bot.info.boost_pads[route.pads[0]]
+        if bot.do_rendering:
+            points = [car.pos] + [bot.info.boost_pads[i].pos for i in route.pads] + [self.destination]
+            bot.renderer.draw_polyline_3d(points, bot.renderer.yellow())
+        return bot.drive.go_towards_point(bot, pad.pos, target_vel=2200, slide=True, boost_min=0, can_dodge=pad.is_big)
+
+
 def filter_pads(bot, pads: List[BoostPad], big_only=True, my_side=True, center=True, enemy_side=True):
-    return [
-        pad for pad in pads if
-        (not big_only or (big_only and pad.is_big))
-        and (
-            (my_side and 1000 < pad.pos.y * bot.info.team_sign)
-            or
-            (center and -1000 < pad.pos.y * bot.info.team_sign < 1000)
-            or
-            (enemy_side and pad.pos.y * bot.info.team_sign < -1000)
-        )
-    ]
\ No newline at end of file
+    region = bot.info.boost_pad_index.region_mask(bot.info.team_sign, big_only, my_side, center, enemy_side)
+    return [pad for pad in pads if region[pad.index]]
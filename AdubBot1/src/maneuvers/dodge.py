@@ -3,18 +3,30 @@ from rlbot.agents.base_agent import SimpleControllerState
 from maneuvers.maneuver import Maneuver
 from maneuvers.recovery import RecoveryManeuver
 from util.rlmath import sign
-from util.vec import proj_onto_size, angle_between, dot, normalize
+from util.sequence import Timeline, Phase, TimelinePlayer
+from util.vec import Vec3, proj_onto_size, angle_between, dot, normalize
+
+# Controls of the phases of a dodge, see DodgeManeuver.timeline. Phases that aim or boost add to them every tick
+_DRIVE = SimpleControllerState(throttle=1)
+_JUMP = SimpleControllerState(throttle=1, jump=True)
 
 
 class DodgeManeuver(Maneuver):
+    # Default timings. Timings that are not given to the constructor are taken from here
+    t_first_jump = 0.10
+    t_first_wait = 0.00
+    t_aim = 0.08
+    t_second_jump = 0.28
+    t_second_wait = 0.35
+
     def __init__(self, bot,
                  target=None,
                  boost=False,
-                 t_first_jump=0.10,
-                 t_first_wait=0.00,
-                 t_aim=0.08,
-                 t_second_jump=0.28,
-                 t_second_wait=0.35):
+                 t_first_jump=None,
+                 t_first_wait=None,
+                 t_aim=None,
+                 t_second_jump=None,
+                 t_second_wait=None):
         super().__init__()
 
         self.target = target
@@ -22,21 +34,29 @@ class DodgeManeuver(Maneuver):
         self._start_time = bot.info.time
         self._almost_finished = False
 
-        self._t_first_unjump = t_first_jump
-        self._t_aim = self._t_first_unjump + t_first_wait
-        self._t_second_jump = self._t_aim + t_aim
-        self._t_second_unjump = self._t_second_jump + t_second_jump
-        self._t_finishing = self._t_second_unjump + t_second_wait  # After this, fix orientation until lands on ground
+        t_first_jump = self.t_first_jump if t_first_jump is None else t_first_jump
+        t_first_wait = self.t_first_wait if t_first_wait is None else t_first_wait
+        t_aim = self.t_aim if t_aim is None else t_aim
+        t_second_jump = self.t_second_jump if t_second_jump is None else t_second_jump
+        t_second_wait = self.t_second_wait if t_second_wait is None else t_second_wait
 
         self._t_steady_again = 0.25  # Time on ground before steady and ready again
         self._max_speed = 2000  # Don't boost if above this speed
         self._boost_ang_req = 0.25
 
-    def exec(self, bot) -> SimpleControllerState:
-        ct = bot.info.time - self._start_time
-        controls = SimpleControllerState()
-        controls.throttle = 1
-
+        # States of dodge
+        self.timeline = Timeline([
+            Phase(t_first_jump, _JUMP, self._boost),  # First jump
+            Phase(t_first_wait, _DRIVE, self._boost),  # Stop pressing jump
+            Phase(t_aim, _DRIVE, self._aim),
+            Phase(t_second_jump, _JUMP, self._aim),
+            Phase(t_second_wait, _DRIVE, self._boost),  # Wait for flip to be done
+            Phase(0, _DRIVE, self._boost),  # After this, fix orientation until lands on ground
+        ])
+        self._player = TimelinePlayer(self.timeline, self._start_time)
+
+    def _boost(self, bot, controls: SimpleControllerState) -> Vec3:
+        """ To boost or not to boost, that is the question. Returns the vector from the car to the target """
         car = bot.info.my_car
 
         # Target is allowed to be a function that takes bot as a parameter. Check what it is
@@ -45,50 +65,37 @@ class DodgeManeuver(Maneuver):
         else:
             target = self.target
 
-        # To boost or not to boost, that is the question
         car_to_target = target - car.pos
         vel_p = proj_onto_size(car.vel, car_to_target)
         angle = angle_between(car_to_target, car.forward)
         controls.boost = self.boost and angle < self._boost_ang_req and vel_p < self._max_speed
+        return car_to_target
+
+    def _aim(self, bot, controls: SimpleControllerState):
+        car_to_target = self._boost(bot, controls)
+
+        # Direction, yaw, pitch, roll
+        if self.target is None:
+            controls.roll = 0
+            controls.pitch = -1
+            controls.yaw = 0
+        else:
+            target_local = dot(car_to_target, bot.info.my_car.rot)
+            target_local.z = 0
+
+            direction = normalize(target_local)
+
+            controls.roll = 0
+            controls.pitch = -direction.x
+            controls.yaw = sign(bot.info.my_car.rot.get(2, 2)) * direction.y
+
+    def exec(self, bot) -> SimpleControllerState:
+        controls = self._player.tick(bot.info.time, bot)
 
-        # States of dodge (note reversed order)
         # Land on ground
-        if ct >= self._t_finishing:
+        if self._player.done:
             self._almost_finished = True
-            if car.on_ground:
-                self.done = True
-            else:
+            if not bot.info.my_car.on_ground:
                 bot.maneuver = RecoveryManeuver(bot)
-                self.done = True
-            return controls
-        elif ct >= self._t_second_unjump:
-            # Stop pressing jump and rotate and wait for flip is done
-            pass
-        elif ct >= self._t_aim:
-            if ct >= self._t_second_jump:
-                controls.jump = 1
-
-            # Direction, yaw, pitch, roll
-            if self.target is None:
-                controls.roll = 0
-                controls.pitch = -1
-                controls.yaw = 0
-            else:
-                target_local = dot(car_to_target, car.rot)
-                target_local.z = 0
-
-                direction = normalize(target_local)
-
-                controls.roll = 0
-                controls.pitch = -direction.x
-                controls.yaw = sign(car.rot.get(2, 2)) * direction.y
-
-        # Stop pressing jump
-        elif ct >= self._t_first_unjump:
-            pass
-
-        # First jump
-        else:
-            controls.jump = 1
-
-        return controls
\ No newline at end of file
+            self.done = True
+        return controls
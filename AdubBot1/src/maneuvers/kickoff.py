@@ -1,93 +1,36 @@
 from rlbot.agents.base_agent import SimpleControllerState
 
+from maneuvers.kickoff_playbook import kickoff_role, find_play, PlaybookKickoffManeuver, SECOND_MAN, BOOST_LEFT, \
+    BOOST_RIGHT
 from maneuvers.maneuver import Maneuver
 from util.curves import curve_from_arrival_dir
 from util.rlmath import sign
 from util.vec import Vec3, norm, proj_onto_size
 
 
-def choose_kickoff_maneuver(bot) -> Maneuver:
-    # Do we have teammates? If no -> always go for kickoff
-    if len(bot.info.teammates) == 0:
-        return KickoffManeuver()
+# The boost pads collected by bots that don't take the kickoff. y is towards the team's own goal
+BOOST_X = 3072
+BOOST_Y = 4096
+
 
-    # Kickoff spawn locations (corners may vary from map to map)
+def choose_kickoff_maneuver(bot) -> Maneuver:
+    # The role comes from the spawns of the bot and its teammates, see kickoff_playbook.py
+    spawn, role = kickoff_role(bot)
     ts = bot.info.team_sign
-    right_corner_loc = Vec3(-1970, ts * 2450, 0)  # actually left for orange
-    left_corner_loc = Vec3(1970, ts * 2450, 0)  # actually right for orange
-    back_right_loc = Vec3(-256, ts * 3840, 0)  # actually left for orange
-    back_left_loc = Vec3(256, ts * 3840, 0)  # actually right for orange
-    back_center_loc = Vec3(0, ts * 4608, 0)
-
-    boost_x = 3072
-    boost_y = ts * 4096
-
-    # Are we in the corner -> go for kickoff (If two bot's are in the corners, we assume lowest index goes for kickoff)
-    if is_my_kickoff_spawn(bot, right_corner_loc):
-        tm_index = index_of_teammate_at_kickoff_spawn(bot, left_corner_loc)
-        if 0 <= tm_index < bot.index:
-            return SecondManSlowCornerKickoffManeuver(bot)
-        else:
-            return KickoffManeuver()
-    if is_my_kickoff_spawn(bot, left_corner_loc):
-        tm_index = index_of_teammate_at_kickoff_spawn(bot, right_corner_loc)
-        if 0 <= tm_index < bot.index:
-            return SecondManSlowCornerKickoffManeuver(bot)
-        else:
-            return KickoffManeuver()
-
-    # Is a teammate in the corner -> collect boost
-    if 0 <= index_of_teammate_at_kickoff_spawn(bot, right_corner_loc) \
-            or 0 <= index_of_teammate_at_kickoff_spawn(bot, left_corner_loc):
-        if bot.info.my_car.pos.x > 10:
-            # go for left boost
-            return CollectSpecificBoostManeuver(Vec3(boost_x, boost_y, 0))
-        if bot.info.my_car.pos.x < -10:
-            # go for right boost
-            return CollectSpecificBoostManeuver(Vec3(-boost_x, boost_y, 0))
-        if 0 <= index_of_teammate_at_kickoff_spawn(bot, back_right_loc):
-            # go for left boost
-            return CollectSpecificBoostManeuver(Vec3(boost_x, boost_y, 0))
-        else:
-            # go for right boost
-            return CollectSpecificBoostManeuver(Vec3(-boost_x, boost_y, 0))
-
-    # No teammate in the corner
-    # Are we back right or left -> go for kickoff
-    if is_my_kickoff_spawn(bot, back_right_loc) \
-            or is_my_kickoff_spawn(bot, back_left_loc):
-        return KickoffManeuver()
-
-    # No teammate in the corner
-    # Is a teammate back right or left -> collect boost
-    if 0 <= index_of_teammate_at_kickoff_spawn(bot, back_right_loc):
-        # go for left boost
-        return CollectSpecificBoostManeuver(Vec3(boost_x, boost_y, 0))
-    elif 0 <= index_of_teammate_at_kickoff_spawn(bot, back_left_loc):
-        # go for right boost
-        return CollectSpecificBoostManeuver(Vec3(-boost_x, boost_y, 0))
-
-    # We have no teammates
+    if role == SECOND_MAN:
+        return SecondManSlowCornerKickoffManeuver(bot)
+    if role == BOOST_LEFT:
+        return CollectSpecificBoostManeuver(Vec3(BOOST_X, ts * BOOST_Y, 0))
+    if role == BOOST_RIGHT:
+        return CollectSpecificBoostManeuver(Vec3(-BOOST_X, ts * BOOST_Y, 0))
+
+    # Go for the kickoff, with a recorded play if there is one for these spawns
+    play = find_play(bot, spawn)
+    if play is not None:
+        return PlaybookKickoffManeuver(bot, play, KickoffManeuver())
     return KickoffManeuver()
 
 
-def is_my_kickoff_spawn(bot, loc):
-    dist = norm(bot.info.my_car.pos - loc)
-    return dist < 150
-
-
-def index_of_teammate_at_kickoff_spawn(bot, loc):
-    """
-    Returns index of teammate at loc, or -1 if there is no teammate
-    """
-    # RLU Cars does not contain index, so we have to find that ourselves :(
-    for car in bot.info.teammates:
-        dist = norm(car.pos - loc)
-        if dist < 150:
-            return car.index
-    return -1
-
-
 class KickoffManeuver(Maneuver):
     def exec(self, bot) -> SimpleControllerState:
         DODGE_DIST = 250
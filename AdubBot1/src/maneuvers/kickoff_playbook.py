@@ -0,0 +1,203 @@
+# The kickoff playbook. Kickoffs always start from the same few spawns, so what to do is worked out ahead of time:
+#   - The role of a bot (take the kickoff, follow as second man, or collect boost) only depends on its spawn, the
+#     spawns of its teammates and which of them has a lower index. The roles of all such spawn patterns are computed
+#     once, when this module is imported.
+#   - For the bot taking the kickoff, a play is a control timeline recorded by simulating KickoffManeuver on the
+#     headless simulator, one per team and pair of spawns of the bot and the first opponent. It also holds the paths
+#     both cars are expected to follow and when the ball is expected to be touched. Plays are recorded by
+#     training/kickoff_playbook.py into kickoff_playbook.npz, next to this file, and loaded at startup.
+# During a kickoff the controls are then read from the timeline by the time since the cars could first move, see
+# util/sequence.py. The game clock already runs during the countdown, so the play starts on the first tick the round
+# is active. If the game stops following the recording, e.g. because the opponent does something else, the bot
+# switches to KickoffManeuver.
+
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from rlbot.agents.base_agent import SimpleControllerState
+
+from maneuvers.maneuver import Maneuver
+from util.sequence import CONTROLS, Timeline, TimelinePlayer
+from util.vec import Vec3
+
+# Spawns, with x as seen from the blue side and y towards the team's own goal. Corners may vary from map to map
+RIGHT_CORNER, LEFT_CORNER, BACK_RIGHT, BACK_LEFT, BACK_CENTER = range(5)
+SPAWNS = [(-1970, 2450), (1970, 2450), (-256, 3840), (256, 3840), (0, 4608)]
+SPAWN_RADIUS = 150
+
+# Roles
+GO, SECOND_MAN, BOOST_LEFT, BOOST_RIGHT = range(4)
+
+PLAYBOOK_FILE = Path(__file__).absolute().parent / "kickoff_playbook.npz"
+TICK_RATE = 120  # Plays are recorded at one row per tick
+PLAY_TOLERANCE = 150  # A car further than this from its recorded path means the play is off
+
+ENABLED = True  # Set to False to always use KickoffManeuver, e.g. when recording the plays
+
+
+def spawn_index(pos: Vec3, team_sign: int) -> int:
+    """ The spawn at pos for a car of the team with the given sign, or -1 """
+    for i, (x, y) in enumerate(SPAWNS):
+        if (pos.x - x) ** 2 + (pos.y - team_sign * y) ** 2 < SPAWN_RADIUS ** 2:
+            return i
+    return -1
+
+
+def _choose_role(spawn: int, teammates: int, lower: int) -> int:
+    """
+    The role of a bot at spawn, when its teammates are at the spawns in the bit mask teammates, and the ones in the
+    bit mask lower have lower indices. The bot with the lowest index takes the kickoff when two are in the corners
+    """
+    def at(s: int) -> bool:
+        return bool(teammates & (1 << s))
+
+    if teammates == 0:
+        return GO
+
+    # In a corner, take the kickoff unless the other corner has priority
+    if spawn in (RIGHT_CORNER, LEFT_CORNER):
+        other = LEFT_CORNER if spawn == RIGHT_CORNER else RIGHT_CORNER
+        return SECOND_MAN if lower & (1 << other) else GO
+
+    # A teammate takes it from a corner, so collect boost on our side, or on the side nobody else is on
+    if at(RIGHT_CORNER) or at(LEFT_CORNER):
+        if spawn == BACK_LEFT:
+            return BOOST_LEFT
+        if spawn == BACK_RIGHT:
+            return BOOST_RIGHT
+        return BOOST_LEFT if at(BACK_RIGHT) else BOOST_RIGHT
+
+    # Nobody is in a corner, so the back left and back right spawns take the kickoff
+    if spawn in (BACK_RIGHT, BACK_LEFT):
+        return GO
+    if at(BACK_RIGHT):
+        return BOOST_LEFT
+    if at(BACK_LEFT):
+        return BOOST_RIGHT
+    return GO
+
+
+def _role_table() -> np.ndarray:
+    """ Roles indexed by [spawn, teammate spawn mask, lower index mask] """
+    count = len(SPAWNS)
+    table = np.full((count, 1 << count, 1 << count), GO, dtype=np.int8)
+    for spawn in range(count):
+        for teammates in range(1 << count):
+            for lower in range(1 << count):
+                if lower & ~teammates == 0 and not teammates & (1 << spawn):
+                    table[spawn, teammates, lower] = _choose_role(spawn, teammates, lower)
+    return table
+
+
+ROLES = _role_table()
+
+
+def kickoff_role(bot) -> Tuple[int, int]:
+    """ Returns the bot's spawn (or -1) and its role """
+    ts = bot.info.team_sign
+    spawn = spawn_index(bot.info.my_car.pos, ts)
+    if len(bot.info.teammates) == 0 or spawn < 0:
+        return spawn, GO
+    teammates = lower = 0
+    for mate in bot.info.teammates:
+        mate_spawn = spawn_index(mate.pos, ts)
+        if mate_spawn >= 0 and mate_spawn != spawn:
+            teammates |= 1 << mate_spawn
+            if mate.index < bot.index:
+                lower |= 1 << mate_spawn
+    return spawn, int(ROLES[spawn, teammates, lower])
+
+
+class KickoffPlay:
+    """
+    A recorded kickoff from one pair of spawns. Row i of the arrays is tick i after the kickoff started. The rows of
+    controls are in the order of CONTROLS
+    """
+    __slots__ = ("controls", "my_path", "opp_path", "contact_time", "we_touch", "_timeline")
+
+    def __init__(self, controls: np.ndarray, my_path: np.ndarray, opp_path: np.ndarray, contact_time: float,
+                 we_touch: bool):
+        self.controls = controls
+        self.my_path = my_path
+        self.opp_path = opp_path
+        self.contact_time = contact_time  # Seconds after the start of the kickoff
+        self.we_touch = we_touch  # Whether the bot touched the ball first in the recording
+        self._timeline = None
+
+    def timeline(self) -> Timeline:
+        """ The controls as a Timeline. It is compiled the first time the play is used """
+        if self._timeline is None:
+            self._timeline = Timeline.from_rows(self.controls, 1 / TICK_RATE)
+        return self._timeline
+
+    def __len__(self):
+        return len(self.controls)
+
+
+def load_playbook(path: Path=PLAYBOOK_FILE) -> Dict[Tuple[int, int, int], KickoffPlay]:
+    """ Plays keyed by (team, spawn of the bot, spawn of the first opponent). Empty if there is no playbook file """
+    if not path.exists():
+        return {}
+    plays = {}
+    with np.load(path) as data:
+        for (team, mine, theirs), length, contact_time, we_touch, controls, my_path, opp_path in zip(
+                data["keys"], data["lengths"], data["contact_times"], data["we_touch"], data["controls"],
+                data["my_paths"], data["opp_paths"]):
+            plays[(int(team), int(mine), int(theirs))] = KickoffPlay(
+                controls[:length], my_path[:length], opp_path[:length], float(contact_time), bool(we_touch))
+    return plays
+
+
+PLAYBOOK = load_playbook()
+
+
+def find_play(bot, spawn: int) -> Optional[KickoffPlay]:
+    if not ENABLED or spawn < 0 or len(bot.info.opponents) == 0:
+        return None
+    opp_spawn = spawn_index(bot.info.opponents[0].pos, -bot.info.team_sign)
+    return PLAYBOOK.get((bot.team, spawn, opp_spawn))
+
+
+class PlaybookKickoffManeuver(Maneuver):
+    """ Plays a recorded kickoff, and switches to the fallback maneuver when the game stops following the recording """
+
+    def __init__(self, bot, play: KickoffPlay, fallback: Maneuver):
+        super().__init__()
+        self.play = play
+        self.fallback = fallback
+        self.following = True
+        self.start_time = None  # Set when the countdown is over
+        self.player: Optional[TimelinePlayer] = None
+        self.waiting = SimpleControllerState()
+
+    def is_on_track(self, bot, tick: int) -> bool:
+        if tick >= len(self.play):
+            return False
+        car = bot.info.my_car
+        opp = bot.info.opponents[0]
+        my_x, my_y = self.play.my_path[tick]
+        opp_x, opp_y = self.play.opp_path[tick]
+        return (car.pos.x - my_x) ** 2 + (car.pos.y - my_y) ** 2 < PLAY_TOLERANCE ** 2 \
+            and (opp.pos.x - opp_x) ** 2 + (opp.pos.y - opp_y) ** 2 < PLAY_TOLERANCE ** 2
+
+    def exec(self, bot) -> SimpleControllerState:
+        if self.start_time is None:
+            if not bot.info.is_round_active:
+                # Still counting down. Nothing to do but wait
+                return self.waiting
+            self.start_time = bot.info.time
+            self.player = TimelinePlayer(self.play.timeline(), bot.info.time)
+
+        tick = int(round((bot.info.time - self.start_time) * TICK_RATE))
+        if self.following and not self.is_on_track(bot, tick):
+            self.following = False
+        if not self.following:
+            controls = self.fallback.exec(bot)
+            self.done = self.fallback.done
+            return controls
+
+        controls = self.player.tick(bot.info.time)
+        self.done = not bot.info.is_kickoff
+        return controls
@@ -0,0 +1,122 @@
+# Local obstacle avoidance for cars driving on the ground.
+#
+# Obstacles are circles in the xy plane. The static ones are the goal posts and the side walls of both goals, each wall
+# approximated by a row of circles, and the dynamic ones are the other cars, moving along their velocity. Every tick
+# the time to collision with all obstacles is solved at once, assuming the car drives straight towards its target at
+# its current speed. If the car would hit something before it reaches its target, the target is moved so the car
+# passes the first obstacle on the side it is already heading for. The arrays have room for every car the game
+# allows, so a tick costs the same however many cars there are.
+
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+from rlbot.utils.structures.game_data_struct import MAX_PLAYERS
+
+from util.car_table import CarTable
+from util.info import Field
+from util.vec import Vec3
+
+POST_X = 1786 / 2
+GOAL_DEPTH = 880
+WALL_SPACING = 150  # Distance between the circles of a goal wall
+
+CAR_RADIUS = 60  # Roughly half the length of a car's hitbox
+WALL_RADIUS = 40  # Radius of the circles making up the posts and walls, before adding CAR_RADIUS
+MARGIN = 50  # Extra room when passing an obstacle
+
+HORIZON = 1.0  # Collisions further away in time are ignored
+MIN_SPEED = 500  # The car is assumed to drive at least this fast. A slow car can still run into a wall soon
+MAX_CAR_HEIGHT = 300  # Cars higher than this are flying over us
+IGNORE_NEAR_TARGET = 400  # Cars this close to the target are contesting it, driving into them is the point
+
+
+def _static_obstacles() -> np.ndarray:
+    """ The centers of the post and wall circles. The first circle of every wall is its post """
+    centers = []
+    wall_ys = np.arange(Field.LENGTH / 2, Field.LENGTH / 2 + GOAL_DEPTH + 1, WALL_SPACING)
+    for goal_sign in (1, -1):
+        for post_sign in (1, -1):
+            for y in wall_ys:
+                centers.append((post_sign * POST_X, goal_sign * y))
+    return np.array(centers)
+
+
+STATIC_CENTERS = _static_obstacles()
+
+
+class LocalAvoidance:
+    """ The obstacles around a car, and the adjusted targets that get around them """
+
+    def __init__(self, capacity: int=MAX_PLAYERS):
+        static_count = len(STATIC_CENTERS)
+        self.static_count = static_count
+        self.center = np.zeros((static_count + capacity, 2))
+        self.vel = np.zeros((static_count + capacity, 2))
+        self.radius = np.zeros(static_count + capacity)
+        self.active = np.zeros(static_count + capacity, dtype=bool)
+
+        self.center[:static_count] = STATIC_CENTERS
+        self.radius[:static_count] = WALL_RADIUS + CAR_RADIUS
+        self.radius[static_count:] = 2 * CAR_RADIUS
+        self.active[:static_count] = True
+        self._car_rows = np.arange(capacity)
+
+    def update_cars(self, cars: Optional[CarTable], my_index: int):
+        """ Copies the other cars into the dynamic obstacles. Without a car table only the static ones are used """
+        dyn = slice(self.static_count, None)
+        if cars is None:
+            self.active[dyn] = False
+            return
+        self.center[dyn] = cars.pos[:, :2]
+        self.vel[dyn] = cars.vel[:, :2]
+        self.active[dyn] = (self._car_rows < cars.count) & (self._car_rows != my_index) & ~cars.is_demolished \
+            & (cars.pos[:, 2] < MAX_CAR_HEIGHT)
+
+    def time_to_collision(self, pos: Vec3, vel: Tuple[float, float]) -> np.ndarray:
+        """
+        For every obstacle, the time until a car at pos moving with the given xy velocity first touches it, or inf.
+        Obstacles the car is already touching are ignored, so it can always get away from them
+        """
+        px = self.center[:, 0] - pos.x
+        py = self.center[:, 1] - pos.y
+        wx = vel[0] - self.vel[:, 0]
+        wy = vel[1] - self.vel[:, 1]
+        # Solve |p - w t| = r for the smallest t
+        a = np.maximum(wx * wx + wy * wy, 1e-6)
+        b = px * wx + py * wy
+        c = px * px + py * py - self.radius ** 2
+        disc = b * b - a * c
+        t = (b - np.sqrt(np.maximum(disc, 0))) / a
+        hits = self.active & (disc > 0) & (c > 0) & (t > 0)
+        return np.where(hits, t, math.inf)
+
+    def adjust(self, pos: Vec3, vel: Vec3, target: Vec3) -> Tuple[Vec3, int]:
+        """
+        Returns a target that avoids the first obstacle on the way from pos to target, and the index of that obstacle.
+        When nothing is in the way, the target itself and -1 are returned
+        """
+        dx, dy = target.x - pos.x, target.y - pos.y
+        dist = math.hypot(dx, dy)
+        if dist < 1:
+            return target, -1
+        dir_x, dir_y = dx / dist, dy / dist
+        speed = max(vel.x * dir_x + vel.y * dir_y, MIN_SPEED)
+
+        ttc = self.time_to_collision(pos, (dir_x * speed, dir_y * speed))
+        # Only obstacles hit before reaching the target count, and cars around the target are fair game
+        near_target = np.hypot(self.center[:, 0] - target.x, self.center[:, 1] - target.y) < IGNORE_NEAR_TARGET
+        near_target[:self.static_count] = False
+        ttc[near_target | (ttc * speed > dist) | (ttc > HORIZON)] = math.inf
+
+        first = int(np.argmin(ttc))
+        if ttc[first] == math.inf:
+            return target, -1
+
+        # Pass the obstacle on the side it is already on. Left of the line means passing it on the right
+        ox, oy = self.center[first, 0] - pos.x, self.center[first, 1] - pos.y
+        side = -1 if ox * -dir_y + oy * dir_x > 0 else 1
+        offset = self.radius[first] + MARGIN
+        return Vec3(self.center[first, 0] - side * dir_y * offset, self.center[first, 1] + side * dir_x * offset,
+                    target.z), first
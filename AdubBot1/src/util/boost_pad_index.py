@@ -0,0 +1,146 @@
+# This module keeps the boost pads as NumPy arrays so that scoring and "nearest pad" queries are evaluated for all
+# 34 pads in one go. The static parts (positions, sizes and which part of the field a pad is in) are computed once
+# when the field info is read.
+
+import ctypes
+import itertools
+import math
+from typing import List
+
+import numpy as np
+
+from rlbot.utils.structures.game_data_struct import GameTickPacket, BoostPadState
+
+from util.vec import Vec3
+
+# Pads with |y| below this are considered to be in the center of the field
+CENTER_HALF_LENGTH = 1000
+
+BOOST_PAD_STATE_DTYPE = np.dtype({
+    "names": ["is_active", "timer"],
+    "formats": ["?", "<f4"],
+    "offsets": [BoostPadState.is_active.offset, BoostPadState.timer.offset],
+    "itemsize": ctypes.sizeof(BoostPadState),
+})
+
+
+def boost_pad_state_array(game_boosts) -> np.ndarray:
+    """
+    Returns a zero-copy structured array view of a ctypes BoostPadState array, e.g. packet.game_boosts.
+    """
+    raw = (ctypes.c_ubyte * ctypes.sizeof(game_boosts)).from_buffer(game_boosts)
+    return np.frombuffer(raw, dtype=BOOST_PAD_STATE_DTYPE)
+
+
+class BoostPadIndex:
+    """
+    A static index over the boost pads. Pad i is row i in all arrays.
+    """
+
+    def __init__(self, positions: List[Vec3], is_big: List[bool]):
+        self.count = len(positions)
+        self.pos = np.array([(p.x, p.y, p.z) for p in positions], dtype=np.float64).reshape(self.count, 3)
+        self.is_big = np.array(is_big, dtype=bool)
+        self.size_factor = np.where(self.is_big, 1.0, 0.8)
+
+        self.is_active = np.ones(self.count, dtype=bool)
+        self.timer = np.zeros(self.count)
+
+        # Pad to pad distances, e.g. for travel estimates between pads
+        self.pad_dists = np.linalg.norm(self.pos[:, np.newaxis, :] - self.pos[np.newaxis, :, :], axis=2)
+
+        # Precomputed masks for every combination of size and field region, for both teams.
+        # Keys are (team_sign, big_only, my_side, center, enemy_side)
+        self._region_masks = {}
+        for team_sign in (-1, 1):
+            y = self.pos[:, 1] * team_sign
+            in_my_side = CENTER_HALF_LENGTH < y
+            in_center = (-CENTER_HALF_LENGTH < y) & (y < CENTER_HALF_LENGTH)
+            in_enemy_side = y < -CENTER_HALF_LENGTH
+            for big_only, my_side, center, enemy_side in itertools.product((False, True), repeat=4):
+                mask = (my_side & in_my_side) | (center & in_center) | (enemy_side & in_enemy_side)
+                if big_only:
+                    mask &= self.is_big
+                mask.flags.writeable = False
+                self._region_masks[(team_sign, big_only, my_side, center, enemy_side)] = mask
+
+        self._left_side_mask = self.pos[:, 0] > 0
+        self._right_side_mask = self.pos[:, 0] < 0
+
+    def read_packet(self, packet: GameTickPacket):
+        """ Reads the active state and timer of all pads at once """
+        states = boost_pad_state_array(packet.game_boosts)[:self.count]
+        self.read_states(states["is_active"], states["timer"])
+
+    def read_states(self, is_active: np.ndarray, timer: np.ndarray):
+        self.is_active[:] = is_active[:self.count]
+        self.timer[:] = timer[:self.count]
+
+    # Masks
+
+    def region_mask(self, team_sign: int, big_only=False, my_side=True, center=True, enemy_side=True) -> np.ndarray:
+        """ Returns the read-only mask of pads in the given regions. Regions are relative to the given team """
+        return self._region_masks[(team_sign, big_only, my_side, center, enemy_side)]
+
+    def side_mask(self, x_sign: int) -> np.ndarray:
+        """ Returns the mask of pads on the side of the field with the given x sign """
+        return self._left_side_mask if x_sign > 0 else self._right_side_mask
+
+    def mask_of(self, pads) -> np.ndarray:
+        """ Returns a mask of the given BoostPad objects """
+        mask = np.zeros(self.count, dtype=bool)
+        mask[np.array([pad.index for pad in pads], dtype=np.intp)] = True
+        return mask
+
+    # Queries
+
+    def convenience_scores(self, car_pos: Vec3, car_forward: Vec3) -> np.ndarray:
+        """
+        Returns how convenient it is for the car to pick up each pad. Close pads in front of the car score high.
+        Inactive pads and pads behind the car score 0.
+        """
+        car_to_pad = self.pos - (car_pos.x, car_pos.y, car_pos.z)
+        dist = np.linalg.norm(car_to_pad, axis=1)
+        forward_len = max(np.sqrt(car_forward.x ** 2 + car_forward.y ** 2 + car_forward.z ** 2), 1e-9)
+        cos_ang = car_to_pad @ (car_forward.x, car_forward.y, car_forward.z) / (np.maximum(dist, 1e-9) * forward_len)
+        angle = np.arccos(np.clip(cos_ang, -1.0, 1.0))
+
+        dist_score = 1 - np.clip((dist / 2500) ** 2, 0, 1)
+        angle_score = 1 - np.clip(angle / 3, 0, 1)
+
+        # Pads behind the car is bad
+        usable = self.is_active & (angle <= 1.3)
+        return np.where(usable, dist_score * angle_score * self.size_factor, 0.0)
+
+    def nearest_active(self, pos: Vec3, mask: np.ndarray=None) -> (int, float):
+        """
+        Returns the index of the closest active pad in the mask and the distance to it, or (-1, -1) if there is none.
+        """
+        return self._nearest(self.dists_from(pos), mask)
+
+    def nearest_active_in_cone(self, pos: Vec3, direction: Vec3, max_angle: float, mask: np.ndarray=None) -> (int, float):
+        """
+        Returns the index of the closest active pad that is within max_angle of the direction when seen from pos,
+        and the distance to it. Returns (-1, -1) if there is no such pad.
+        """
+        pos_to_pad = self.pos - (pos.x, pos.y, pos.z)
+        dists = np.linalg.norm(pos_to_pad, axis=1)
+        dir_len = max(np.sqrt(direction.x ** 2 + direction.y ** 2 + direction.z ** 2), 1e-9)
+        cos_ang = pos_to_pad @ (direction.x, direction.y, direction.z) / (np.maximum(dists, 1e-9) * dir_len)
+        in_cone = cos_ang >= np.cos(max_angle)
+        return self._nearest(dists, in_cone if mask is None else in_cone & mask)
+
+    def dists_from(self, pos: Vec3) -> np.ndarray:
+        return np.linalg.norm(self.pos - (pos.x, pos.y, pos.z), axis=1)
+
+    def dist_to(self, pad: int, pos: Vec3) -> float:
+        x, y, z = self.pos[pad]
+        return math.sqrt((x - pos.x) ** 2 + (y - pos.y) ** 2 + (z - pos.z) ** 2)
+
+    def _nearest(self, dists: np.ndarray, mask: np.ndarray=None) -> (int, float):
+        candidates = self.is_active if mask is None else self.is_active & mask
+        dists = np.where(candidates, dists, np.inf)
+        index = int(np.argmin(dists))
+        if dists[index] == np.inf:
+            return -1, -1
+        return index, float(dists[index])
@@ -1,7 +1,10 @@
 # his module tracks the state of boost pads in Rocket League, managing their locations, availability, and timers for strategic gameplay.
 
+from bisect import bisect_left, insort
 from dataclasses import dataclass
-from typing import List
+from typing import List, Tuple
+
+import numpy as np
 
 from rlbot.utils.structures.game_data_struct import GameTickPacket, FieldInfoPacket
 
@@ -44,4 +47,104 @@ class BoostPadTracker:
 
     def get_full_boosts(self) -> List[BoostPad]:
         # Return the list of full boost pads, already filtered during initialization
-        return self._full_boosts_only
\ No newline at end of file
+        return self._full_boosts_only
+
+# Seconds it takes for a pad to become active again after being picked up
+BIG_PAD_RESPAWN_TIME = 10.0
+SMALL_PAD_RESPAWN_TIME = 4.0
+
+# Cars pick up pads when driving within roughly this distance of the pad's center
+PAD_PICKUP_RADIUS = 150
+
+
+class BoostRespawnTimeline:
+    """
+    Predicts when boost pads become active again. When a pad is taken, its respawn time is derived from the
+    pad's cooldown, and the pad is inserted into a timeline sorted by respawn time. This allows questions like
+    "which pads are active at time t?" and "will this pad be up when I arrive?" to be answered without waiting
+    for future packets.
+    """
+
+    def __init__(self, is_big: np.ndarray):
+        self.count = len(is_big)
+        self.cooldown = np.where(is_big, BIG_PAD_RESPAWN_TIME, SMALL_PAD_RESPAWN_TIME)
+        self.respawn_time = np.zeros(self.count)  # Game time when the pad is active again. In the past if active
+        self.was_active = np.ones(self.count, dtype=bool)
+        self.timeline: List[Tuple[float, int]] = []  # Sorted (respawn_time, pad index) of inactive pads
+        self.time = 0.0
+
+    def update(self, time: float, is_active: np.ndarray, timer: np.ndarray):
+        """
+        Updates the timeline from the current active states and timers (seconds the pads have been inactive).
+        Only pads that changed state are touched.
+        """
+        self.time = time
+        changed = np.flatnonzero(is_active != self.was_active)
+        for i in changed.tolist():
+            if is_active[i]:
+                # Respawned, possibly earlier or later than predicted
+                self._remove_from_timeline(i)
+                self.respawn_time[i] = time
+            else:
+                # Taken. The timer tells us how long ago
+                self.respawn_time[i] = time - timer[i] + self.cooldown[i]
+                insort(self.timeline, (float(self.respawn_time[i]), i))
+        self.was_active[changed] = is_active[changed]
+
+    def _remove_from_timeline(self, pad: int):
+        entry = (float(self.respawn_time[pad]), pad)
+        pos = bisect_left(self.timeline, entry)
+        if pos < len(self.timeline) and self.timeline[pos] == entry:
+            del self.timeline[pos]
+
+    def active_at(self, time: float) -> np.ndarray:
+        """ Returns a mask of the pads expected to be active at the given game time """
+        return self.respawn_time <= time
+
+    def time_until_active(self, pad: int) -> float:
+        return max(0.0, self.respawn_time[pad] - self.time)
+
+    def respawns_between(self, start: float, end: float) -> List[Tuple[float, int]]:
+        """ Returns (respawn_time, pad index) of the pads respawning in the time interval [start, end) """
+        lo = bisect_left(self.timeline, (start, -1))
+        hi = bisect_left(self.timeline, (end, -1))
+        return self.timeline[lo:hi]
+
+    def available_on_arrival(self, pads: np.ndarray, arrival_times: np.ndarray) -> np.ndarray:
+        """
+        Given pad indices and the game times we expect to arrive at each of them, returns a mask of the pads that
+        will be active when we get there.
+        """
+        return self.respawn_time[pads] <= arrival_times
+
+    def pads_along_route(self, pad_pos: np.ndarray, route: List[Vec3], speed: float,
+                         pickup_radius: float=PAD_PICKUP_RADIUS) -> List[Tuple[int, float]]:
+        """
+        Follows a route of points from the current game time at the given speed and returns (pad index, arrival time)
+        of the pads that are close to the route and will be active when we pass them, in the order we pass them.
+        """
+        if len(route) < 2:
+            return []
+
+        points = np.array([(p.x, p.y, p.z) for p in route], dtype=np.float64)
+        starts = points[:-1]
+        seg = points[1:] - starts
+        seg_len = np.linalg.norm(seg, axis=1)
+        dist_before_seg = np.concatenate(([0.0], np.cumsum(seg_len)[:-1]))
+
+        # Closest point on each segment for each pad. Shape (pads, segments)
+        rel = pad_pos[:, np.newaxis, :] - starts[np.newaxis, :, :]
+        t = np.clip(np.einsum("psk,sk->ps", rel, seg) / np.maximum(seg_len ** 2, 1e-9), 0, 1)
+        closest = starts[np.newaxis, :, :] + t[:, :, np.newaxis] * seg[np.newaxis, :, :]
+        dist_to_route = np.linalg.norm(pad_pos[:, np.newaxis, :] - closest, axis=2)
+
+        # Use the first segment that passes the pad
+        near = dist_to_route < pickup_radius
+        on_route = np.flatnonzero(near.any(axis=1))
+        first_seg = near[on_route].argmax(axis=1)
+        travelled = dist_before_seg[first_seg] + t[on_route, first_seg] * seg_len[first_seg]
+        arrival = self.time + travelled / max(speed, 1.0)
+
+        available = self.available_on_arrival(on_route, arrival)
+        order = np.argsort(arrival[available])
+        return [(int(pad), float(time)) for pad, time in zip(on_route[available][order], arrival[available][order])]
@@ -0,0 +1,191 @@
+# Routes over the boost pads: the fastest way to drive to a destination that picks up enough boost on the way.
+#
+# The graph has a node for every pad, plus the car and the destination. Edge costs are travel times:
+#   - Pad to pad, the time to cover the distance when leaving a pad at PASS_SPEED and boosting. The car has boost
+#     once it has picked up a pad. This part is computed once, when the planner is made.
+#   - From the car, the time to turn towards the node and then drive there from its current speed, boosting if it
+#     has any boost.
+# A pad only gives boost if it is expected to be active when the car gets there, see BoostRespawnTimeline.
+#
+# Boost is counted in small pads. Labels are (boost collected, pad), and since every pad picked up adds boost, the
+# fastest arrival at every label is found by going through the amounts of boost in increasing order, relaxing all
+# pads at once with NumPy. Collecting boost beyond what is needed doesn't count. Each label remembers the pads on its
+# path, so a pad is never counted twice. A full plan costs a fraction of a millisecond.
+#
+# The planner keeps its last route. Every tick it drops the pads the car has reached, and if a pad further along is
+# no longer expected to be there in time, e.g. because an opponent took it, only the rest of the route from the pad
+# before it is planned again. Routes are planned from scratch when the destination or the amount of boost changes,
+# and every REPLAN_INTERVAL seconds to correct for the travel time estimates.
+
+import math
+from typing import List, Optional
+
+import numpy as np
+
+from util.boost_pad_index import BoostPadIndex
+from util.boost_pad_tracker import BoostRespawnTimeline
+from util.dynamics import time_for_distance_array
+from util.vec import Vec3
+
+SMALL_PAD_BOOST = 12
+BIG_PAD_BOOST = 100
+
+PASS_SPEED = 1400  # Speed when leaving a pad. Cars slow down a bit to drive over pads
+TURN_TIME = 0.35  # Seconds it takes to turn one radian at the start of a route
+PAD_REACHED_DIST = 250  # A pad this close to the car is considered picked up
+DESTINATION_TOLERANCE = 300  # The route is kept if the destination moves less than this
+REPLAN_INTERVAL = 1.0
+
+
+class BoostRoute:
+    """ A route from the car through some pads to a destination. Times are game times """
+    __slots__ = ("pads", "arrivals", "destination", "arrival", "min_boost", "planned_at")
+
+    def __init__(self, pads: List[int], arrivals: List[float], destination: Vec3, arrival: float, min_boost: int,
+                 planned_at: float):
+        self.pads = pads  # Pad indices, in the order they are picked up
+        self.arrivals = arrivals  # When the car is expected at each pad
+        self.destination = destination
+        self.arrival = arrival  # When the car is expected at the destination
+        self.min_boost = min_boost
+        self.planned_at = planned_at
+
+
+class BoostRoutePlanner:
+    """ Plans routes over the pads of a BoostPadIndex, and keeps the last route up to date """
+
+    def __init__(self, pad_index: BoostPadIndex, timeline: BoostRespawnTimeline):
+        self.pad_index = pad_index
+        self.timeline = timeline
+        self.count = pad_index.count
+        self.pad_boost = np.where(pad_index.is_big, BIG_PAD_BOOST, SMALL_PAD_BOOST)
+        self.pad_times = time_for_distance_array(PASS_SPEED, pad_index.pad_dists)
+        self.route: Optional[BoostRoute] = None
+        self._mask = None
+        self._goal_times = None
+
+    def plan(self, car, destination: Vec3, min_boost: int, mask: np.ndarray=None) -> Optional[BoostRoute]:
+        """
+        Returns the fastest route for the car to the destination that has it arrive with at least min_boost, using
+        only the pads in the mask. The last route is reused and repaired when possible. None if there is no route
+        """
+        now = self.timeline.time
+        route = self.route
+        if route is None or route.min_boost != min_boost or now - route.planned_at > REPLAN_INTERVAL \
+                or route.destination.dist(destination) > DESTINATION_TOLERANCE \
+                or not _same_mask(self._mask, mask):
+            self._mask = mask
+            self._goal_times = time_for_distance_array(PASS_SPEED, self.pad_index.dists_from(destination))
+            self.route = self._plan_from_car(car, destination, min_boost, now)
+            return self.route
+
+        # Drop the pads we got to
+        while route.pads and self.pad_index.dist_to(route.pads[0], car.pos) < PAD_REACHED_DIST:
+            route.pads.pop(0)
+            route.arrivals.pop(0)
+
+        # Repair the route from the first pad that won't be there in time
+        respawn = self.timeline.respawn_time
+        for i, (pad, arrival) in enumerate(zip(route.pads, route.arrivals)):
+            if respawn[pad] > arrival:
+                if i == 0:
+                    self.route = self._plan_from_car(car, destination, min_boost, route.planned_at)
+                else:
+                    self._repair(route, i, car.boost)
+                break
+        return self.route
+
+    def _plan_from_car(self, car, destination: Vec3, min_boost: int, planned_at: float) -> Optional[BoostRoute]:
+        now = self.timeline.time
+        pos = np.array([(car.pos.x, car.pos.y, car.pos.z)])
+        to_nodes = np.concatenate([self.pad_index.pos, [(destination.x, destination.y, destination.z)]]) - pos
+        dists = np.linalg.norm(to_nodes, axis=1)
+        forward = np.array([car.forward.x, car.forward.y, car.forward.z])
+        cos_ang = to_nodes @ forward / np.maximum(dists, 1e-9)
+        speed = max(car.vel.dot(car.forward), 0.0)
+        times = np.arccos(np.clip(cos_ang, -1, 1)) * TURN_TIME + time_for_distance_array(speed, dists, car.boost > 0)
+
+        need = min_boost - car.boost
+        route = self._solve(times[:-1], float(times[-1]), now, need, np.zeros(self.count, dtype=bool))
+        if route is None:
+            return None
+        pads, arrivals, arrival = route
+        return BoostRoute(pads, arrivals, destination, arrival, min_boost, planned_at)
+
+    def _repair(self, route: BoostRoute, broken: int, boost: int):
+        """ Plans the rest of the route again from the pad before the broken one, keeping the pads up to it """
+        kept = route.pads[:broken]
+        last = kept[-1]
+        used = np.zeros(self.count, dtype=bool)
+        used[kept] = True
+        need = route.min_boost - boost - int(self.pad_boost[kept].sum())
+        rest = self._solve(self.pad_times[last], float(self._goal_times[last]), route.arrivals[broken - 1], need, used)
+        if rest is None:
+            self.route = None
+            return
+        pads, arrivals, arrival = rest
+        route.pads = kept + pads
+        route.arrivals = route.arrivals[:broken] + arrivals
+        route.arrival = arrival
+
+    def _solve(self, start_times: np.ndarray, start_goal_time: float, start: float, need: int, used: np.ndarray):
+        """
+        The fastest way from a start node to the destination that collects at least need boost, as (pads, arrival
+        times at the pads, arrival time at the destination), or None. start_times are the travel times from the start
+        node to every pad and start_goal_time the one to the destination. Pads in used can't be picked up again
+        """
+        if need <= 0:
+            return [], [], start + start_goal_time
+
+        n = self.count
+        levels = int(math.ceil(need / SMALL_PAD_BOOST))
+        gain = np.where(self.pad_index.is_big, levels, 1)
+        allowed = ~used if self._mask is None else self._mask & ~used
+        ready_in = self.timeline.respawn_time - start  # How long until each pad is active, from the start
+        pads = np.arange(n)
+
+        times = np.full((levels + 1, n), math.inf)
+        parent = np.full((levels + 1, n), -1)
+        on_path = np.zeros((levels + 1, n, n), dtype=bool)
+
+        # The first pad
+        reachable = allowed & (ready_in <= start_times)
+        level = np.minimum(levels, gain)
+        times[level[reachable], pads[reachable]] = start_times[reachable]
+        on_path[level[reachable], pads[reachable], pads[reachable]] = True
+
+        # Every next pad, going through the amounts of boost collected in increasing order
+        for lvl in range(1, levels):
+            arrival = times[lvl][:, np.newaxis] + self.pad_times
+            arrival[on_path[lvl] | ~allowed | (ready_in > arrival)] = math.inf
+            best_from = np.argmin(arrival, axis=0)
+            best = arrival[best_from, pads]
+            level = np.minimum(levels, lvl + gain)
+            better = best < times[level, pads]
+            to_level, to_pad, from_pad = level[better], pads[better], best_from[better]
+            times[to_level, to_pad] = best[better]
+            parent[to_level, to_pad] = lvl * n + from_pad
+            on_path[to_level, to_pad] = on_path[lvl, from_pad]
+            on_path[to_level, to_pad, to_pad] = True
+
+        total = times[levels] + self._goal_times
+        last = int(np.argmin(total))
+        if total[last] == math.inf:
+            return None
+
+        # Walk back along the parents
+        route_pads, route_times = [], []
+        lvl, pad = levels, last
+        while pad >= 0:
+            route_pads.append(pad)
+            route_times.append(start + float(times[lvl, pad]))
+            lvl, pad = divmod(int(parent[lvl, pad]), n) if parent[lvl, pad] >= 0 else (0, -1)
+        route_pads.reverse()
+        route_times.reverse()
+        return route_pads, route_times, start + float(total[last])
+
+
+def _same_mask(a: Optional[np.ndarray], b: Optional[np.ndarray]) -> bool:
+    if a is None or b is None:
+        return a is b
+    return a is b or np.array_equal(a, b)
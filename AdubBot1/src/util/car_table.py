@@ -0,0 +1,190 @@
+# This module stores the state of all cars as NumPy columns (a structure-of-arrays) so questions about many cars at
+# once, like "who is closest to the ball?", become single array operations instead of Python loops.
+
+import ctypes
+
+import numpy as np
+
+from rlbot.utils.structures.game_data_struct import GameTickPacket, PlayerInfo, Physics, MAX_PLAYERS
+
+from util.vec import Vec3
+
+
+def _player_info_dtype() -> np.dtype:
+    """
+    A NumPy dtype matching the memory layout of rlbot's PlayerInfo struct, restricted to the fields we read.
+    This lets us view packet.game_cars as a structured array without copying it field by field.
+    """
+    phy = PlayerInfo.physics.offset
+    fields = {
+        "location": (("<f4", (3,)), phy + Physics.location.offset),
+        "rotation": (("<f4", (3,)), phy + Physics.rotation.offset),
+        "velocity": (("<f4", (3,)), phy + Physics.velocity.offset),
+        "angular_velocity": (("<f4", (3,)), phy + Physics.angular_velocity.offset),
+        "is_demolished": ("?", PlayerInfo.is_demolished.offset),
+        "has_wheel_contact": ("?", PlayerInfo.has_wheel_contact.offset),
+        "is_super_sonic": ("?", PlayerInfo.is_super_sonic.offset),
+        "jumped": ("?", PlayerInfo.jumped.offset),
+        "double_jumped": ("?", PlayerInfo.double_jumped.offset),
+        "team": ("u1", PlayerInfo.team.offset),
+        "boost": ("<i4", PlayerInfo.boost.offset),
+    }
+    return np.dtype({
+        "names": list(fields.keys()),
+        "formats": [f[0] for f in fields.values()],
+        "offsets": [f[1] for f in fields.values()],
+        "itemsize": ctypes.sizeof(PlayerInfo),
+    })
+
+
+PLAYER_INFO_DTYPE = _player_info_dtype()
+
+
+def player_info_array(game_cars) -> np.ndarray:
+    """
+    Returns a zero-copy structured array view of a ctypes PlayerInfo array, e.g. packet.game_cars.
+    """
+    raw = (ctypes.c_ubyte * ctypes.sizeof(game_cars)).from_buffer(game_cars)
+    return np.frombuffer(raw, dtype=PLAYER_INFO_DTYPE)
+
+
+def as_array(vec: Vec3) -> np.ndarray:
+    return np.array((vec.x, vec.y, vec.z))
+
+
+class CarTable:
+    """
+    Columns describing every car in the game. Row i is the car with index i in the packet.
+    Only the first `count` rows are valid, and all queries only consider those rows.
+
+    The packet's car structs are copied into one preallocated structured array each tick, and the columns are
+    views into it, so filling the table is a single copy regardless of the number of cars. The basis vectors are
+    derived from the rotations the first time they are needed in a tick.
+    """
+
+    def __init__(self, capacity: int = MAX_PLAYERS):
+        self.capacity = capacity
+        self.count = 0
+        self.time = 0.0
+
+        self._raw = np.zeros(capacity, dtype=PLAYER_INFO_DTYPE)
+        self._raw["has_wheel_contact"] = True
+
+        self.pos = self._raw["location"]
+        self.vel = self._raw["velocity"]
+        self.ang_vel = self._raw["angular_velocity"]
+        self.rotation = self._raw["rotation"]  # pitch, yaw, roll
+
+        self.boost = self._raw["boost"]
+        self.team = self._raw["team"]
+        self.is_demolished = self._raw["is_demolished"]
+        self.on_ground = self._raw["has_wheel_contact"]
+        self.supersonic = self._raw["is_super_sonic"]
+        self.jumped = self._raw["jumped"]
+        self.double_jumped = self._raw["double_jumped"]
+
+        self._basis = np.zeros((3, capacity, 3))
+        self._basis_is_valid = False
+
+    def read_packet(self, packet: GameTickPacket):
+        """ Fills all columns from the packet. This happens once per tick """
+        n = min(packet.num_cars, self.capacity)
+        self.count = n
+        self.time = packet.game_info.seconds_elapsed
+        self._raw[:n] = player_info_array(packet.game_cars)[:n]
+        self._basis_is_valid = False
+
+    def copy_from(self, other: 'CarTable'):
+        """ Fills all columns from another table, e.g. one shared by several bots that must not be changed """
+        n = min(other.count, self.capacity)
+        self.count = n
+        self.time = other.time
+        self._raw[:n] = other._raw[:n]
+        self._basis_is_valid = False
+
+    @property
+    def forward(self) -> np.ndarray:
+        return self._get_basis()[0]
+
+    @property
+    def left(self) -> np.ndarray:
+        return self._get_basis()[1]
+
+    @property
+    def up(self) -> np.ndarray:
+        return self._get_basis()[2]
+
+    def _get_basis(self) -> np.ndarray:
+        if self._basis_is_valid:
+            return self._basis
+
+        # Same as util.vec.euler_to_rotation, but for all cars at once
+        n = self.count
+        rot = self.rotation[:n].astype(np.float64)
+        cp, cy, cr = np.cos(rot).T
+        sp, sy, sr = np.sin(rot).T
+        forward, left, up = self._basis[:, :n]
+
+        forward[:, 0] = cp * cy
+        forward[:, 1] = cp * sy
+        forward[:, 2] = sp
+
+        left[:, 0] = cy * sp * sr - cr * sy
+        left[:, 1] = sy * sp * sr + cr * cy
+        left[:, 2] = -cp * sr
+
+        up[:, 0] = -cr * cy * sp - sr * sy
+        up[:, 1] = -cr * sy * sp + sr * cy
+        up[:, 2] = cp * cr
+
+        self._basis_is_valid = True
+        return self._basis
+    # Masks
+
+    def team_mask(self, team: int) -> np.ndarray:
+        return self.team[:self.count] == team
+
+    def teammate_mask(self, index: int, team: int) -> np.ndarray:
+        """ Cars on the given team, excluding the car with the given index """
+        mask = self.team_mask(team)
+        if 0 <= index < self.count:
+            mask[index] = False
+        return mask
+
+    def opponent_mask(self, team: int) -> np.ndarray:
+        return self.team[:self.count] != team
+
+    # Queries
+
+    def distances(self, pos: Vec3) -> np.ndarray:
+        """ Distances from pos to every car """
+        return np.linalg.norm(self.pos[:self.count] - as_array(pos), axis=1)
+
+    def nearest(self, pos: Vec3, mask: np.ndarray=None) -> (int, float):
+        """
+        Returns the index of the car closest to pos and the distance to it. Only cars in the mask are considered.
+        If no car is considered, the index is -1 and the distance is -1.
+        """
+        dists = self.distances(pos)
+        if mask is not None:
+            dists = np.where(mask, dists, np.inf)
+        if len(dists) == 0:
+            return -1, -1
+        index = int(np.argmin(dists))
+        if dists[index] == np.inf:
+            return -1, -1
+        return index, float(dists[index])
+
+    def within_radius(self, pos: Vec3, radius: float, mask: np.ndarray=None) -> np.ndarray:
+        """ Returns the indices of the cars within the given radius of pos, ordered by index """
+        inside = self.distances(pos) < radius
+        if mask is not None:
+            inside &= mask
+        return np.flatnonzero(inside)
+
+    def distance_matrix(self, mask_a: np.ndarray=None, mask_b: np.ndarray=None) -> np.ndarray:
+        """ Returns a matrix where entry (i, j) is the distance between car i of mask_a and car j of mask_b """
+        pos = self.pos[:self.count]
+        a = pos if mask_a is None else pos[mask_a]
+        b = pos if mask_b is None else pos[mask_b]
+        return np.linalg.norm(a[:, np.newaxis, :] - b[np.newaxis, :, :], axis=2)
@@ -0,0 +1,126 @@
+# A model of the ball on a car's roof, for dribbling.
+#
+# The ball is described relative to the car, in the car's frame (x forward, y left, z up), see DribbleState. The model
+# assumes that the car drives on flat ground and stays level, and that the roof is frictionless, so in the car's frame
+# a ball resting on the roof accelerates opposite to the car. A ball above the roof falls with gravity until it comes
+# down on the roof or next to it. The ball falls off once its center passes an edge of the roof.
+#
+# From this, the time until the ball falls off is solved in closed form for a given acceleration of the car, and the
+# acceleration that brings the ball to rest at a spot on the roof is a critically damped correction. Everything is
+# plain float math on a reused state, so it is cheap enough to run every tick.
+
+import math
+from typing import Tuple
+
+from util.rlmath import clip
+
+GRAVITY = 650
+BALL_RADIUS = 92.75
+
+# The roof of an Octane's hitbox, relative to the car's position
+ROOF_BACK = 13.9 - 59.0
+ROOF_FRONT = 13.9 + 59.0
+ROOF_HALF_WIDTH = 42.0
+ROOF_TOP = 20.8 + 18.0
+REST_HEIGHT = ROOF_TOP + BALL_RADIUS  # Height of the ball's center when it rests on the roof
+REST_TOLERANCE = 15  # A ball this close to resting and barely moving up or down is resting
+
+HORIZON = 1.0  # Falling off later than this counts as staying on
+BALANCE_TIME = 0.3  # Time constant of the balancing corrections
+MIN_CATCH_TIME = 0.1  # A ball coming down sooner than this is balanced as if it was resting already
+MAX_FORWARD_ACCEL = 1600  # Roughly what throttle and boost give at dribbling speeds
+MAX_BRAKE_ACCEL = 3500
+MAX_SIDE_ACCEL = 2000  # Roughly what turning gives at dribbling speeds
+
+
+class DribbleState:
+    """ The ball relative to a car, in the car's frame, from the car's position. Read in place every tick """
+    __slots__ = ("x", "y", "z", "vx", "vy", "vz")
+
+    def __init__(self):
+        self.x = self.y = self.z = 0.0
+        self.vx = self.vy = self.vz = 0.0
+
+    def read(self, car, ball) -> 'DribbleState':
+        r = car.rot.data
+        px, py, pz = ball.pos.x - car.pos.x, ball.pos.y - car.pos.y, ball.pos.z - car.pos.z
+        vx, vy, vz = ball.vel.x - car.vel.x, ball.vel.y - car.vel.y, ball.vel.z - car.vel.z
+        self.x = r[0] * px + r[3] * py + r[6] * pz
+        self.y = r[1] * px + r[4] * py + r[7] * pz
+        self.z = r[2] * px + r[5] * py + r[8] * pz
+        self.vx = r[0] * vx + r[3] * vy + r[6] * vz
+        self.vy = r[1] * vx + r[4] * vy + r[7] * vz
+        self.vz = r[2] * vx + r[5] * vy + r[8] * vz
+        return self
+
+    def is_above_roof(self) -> bool:
+        """ Whether the ball is higher than the roof, i.e. on it or in the air above it, rather than at a bumper """
+        return self.z > ROOF_TOP + BALL_RADIUS / 2
+
+    def is_over_roof(self) -> bool:
+        """ Whether the ball's center is over the roof """
+        return ROOF_BACK <= self.x <= ROOF_FRONT and -ROOF_HALF_WIDTH <= self.y <= ROOF_HALF_WIDTH
+
+    def landing_time(self) -> float:
+        """ Time until the ball comes down to the height of the roof. 0 if it is resting on it or below it """
+        height = self.z - REST_HEIGHT
+        if height < REST_TOLERANCE and abs(self.vz) < GRAVITY * MIN_CATCH_TIME:
+            return 0.0
+        # height + vz t - g t^2 / 2 = 0
+        return max(0.0, (self.vz + math.sqrt(max(0.0, self.vz * self.vz + 2 * GRAVITY * height))) / GRAVITY)
+
+
+def _time_to_leave(p: float, v: float, a: float, low: float, high: float, horizon: float) -> float:
+    """ When p + v t + a t^2 / 2 first leaves [low, high], or inf if it stays inside until the horizon """
+    first = math.inf
+    for bound in (low, high):
+        c = p - bound
+        if abs(a) < 1e-6:
+            roots = (-c / v,) if v != 0 else ()
+        else:
+            disc = v * v - 2 * a * c
+            if disc < 0:
+                continue
+            sq = math.sqrt(disc)
+            roots = ((-v - sq) / a, (-v + sq) / a)
+        for t in roots:
+            if 0 < t <= horizon and t < first:
+                first = t
+    return first
+
+
+def time_to_fall(state: DribbleState, accel_x: float=0.0, accel_y: float=0.0, horizon: float=HORIZON) -> float:
+    """
+    Time until the ball falls off the roof while the car accelerates by (accel_x, accel_y) in its own frame, or inf
+    if it stays on for the horizon. A ball in the air falls off when it comes down next to the roof
+    """
+    t = state.landing_time()
+    if t > horizon:
+        return math.inf
+    x = state.x + state.vx * t - 0.5 * accel_x * t * t
+    y = state.y + state.vy * t - 0.5 * accel_y * t * t
+    if not (ROOF_BACK <= x <= ROOF_FRONT and -ROOF_HALF_WIDTH <= y <= ROOF_HALF_WIDTH):
+        return t
+    vx = state.vx - accel_x * t
+    vy = state.vy - accel_y * t
+    rest = horizon - t
+    return t + min(_time_to_leave(x, vx, -accel_x, ROOF_BACK, ROOF_FRONT, rest),
+                   _time_to_leave(y, vy, -accel_y, -ROOF_HALF_WIDTH, ROOF_HALF_WIDTH, rest))
+
+
+def balance_accel(state: DribbleState, target_x: float=0.0, target_y: float=0.0) -> Tuple[float, float]:
+    """
+    The acceleration of the car, in its own frame, that brings the ball to rest at (target_x, target_y) on the roof.
+    A ball coming down is caught so that it lands on the target. Clamped to roughly what the car can do
+    """
+    t = state.landing_time()
+    if t > MIN_CATCH_TIME:
+        # Where it lands is x + vx t - a t^2 / 2
+        accel_x = 2 * (state.x + state.vx * t - target_x) / (t * t)
+        accel_y = 2 * (state.y + state.vy * t - target_y) / (t * t)
+    else:
+        # The ball accelerates opposite to the car
+        w = 1 / BALANCE_TIME
+        accel_x = w * w * (state.x - target_x) + 2 * w * state.vx
+        accel_y = w * w * (state.y - target_y) + 2 * w * state.vy
+    return clip(accel_x, -MAX_BRAKE_ACCEL, MAX_FORWARD_ACCEL), clip(accel_y, -MAX_SIDE_ACCEL, MAX_SIDE_ACCEL)
@@ -0,0 +1,209 @@
+# Shortest paths for a car with a minimum turn radius (Dubins paths), in the xy plane.
+#
+# A Dubins path from a position and heading to a target position and arrival heading is made of three pieces, each a
+# left arc (L), a right arc (R) or a straight line (S): one of LSL, RSR, LSR, RSL, RLR and LRL. The solution below
+# is the closed form of Shkel & Lumelsky, "Classification of the Dubins set" (2001). Headings are angles in the xy
+# plane, atan2(dir.y, dir.x), so a left arc is the one where the heading increases.
+
+import math
+from typing import List, Optional, Tuple
+
+from util.rlmath import clip
+from util.vec import Vec3
+
+TAU = 2 * math.pi
+
+
+def mod_tau(ang: float) -> float:
+    return ang % TAU
+
+
+def heading_of(direction: Vec3) -> float:
+    return math.atan2(direction.y, direction.x)
+
+
+class PathSegment:
+    """ An arc of the given radius turning left or right, or a straight line, starting at pos with the given heading """
+    __slots__ = ("kind", "pos", "heading", "length", "radius", "center", "start")
+
+    def __init__(self, kind: str, pos: Vec3, heading: float, length: float, radius: float, start: float):
+        self.kind = kind
+        self.pos = pos
+        self.heading = heading
+        self.length = length
+        self.radius = radius
+        self.start = start  # Distance along the path where the segment starts
+        self.center = None
+        if kind != "S":
+            turn = 1 if kind == "L" else -1
+            self.center = Vec3(pos.x - turn * radius * math.sin(heading), pos.y + turn * radius * math.cos(heading), pos.z)
+
+    def turn(self) -> int:
+        return {"L": 1, "R": -1, "S": 0}[self.kind]
+
+    def heading_at(self, s: float) -> float:
+        return self.heading + self.turn() * s / self.radius if self.kind != "S" else self.heading
+
+    def point_at(self, s: float) -> Vec3:
+        if self.kind == "S":
+            return Vec3(self.pos.x + s * math.cos(self.heading), self.pos.y + s * math.sin(self.heading), self.pos.z)
+        turn = self.turn()
+        heading = self.heading_at(s)
+        return Vec3(self.center.x + turn * self.radius * math.sin(heading),
+                    self.center.y - turn * self.radius * math.cos(heading), self.pos.z)
+
+    def closest(self, pos: Vec3) -> Tuple[float, float]:
+        """ Returns the distance along the segment of the point closest to pos, and the distance to that point """
+        if self.kind == "S":
+            dx, dy = pos.x - self.pos.x, pos.y - self.pos.y
+            s = clip(dx * math.cos(self.heading) + dy * math.sin(self.heading), 0, self.length)
+        else:
+            # Angle of pos around the center, measured from the start of the arc in the direction of travel
+            turn = self.turn()
+            ang = math.atan2(pos.y - self.center.y, pos.x - self.center.x)
+            start_ang = math.atan2(self.pos.y - self.center.y, self.pos.x - self.center.x)
+            swept = mod_tau(turn * (ang - start_ang))
+            arc = self.length / self.radius
+            if swept > arc:
+                # Past the end of the arc. Pick the closest end
+                swept = arc if swept - arc < TAU - swept else 0.0
+            s = swept * self.radius
+        point = self.point_at(s)
+        return s, math.hypot(pos.x - point.x, pos.y - point.y)
+
+
+class DubinsPath:
+    def __init__(self, word: str, segments: List[PathSegment], radius: float):
+        self.word = word
+        self.segments = segments
+        self.radius = radius
+        self.length = sum(seg.length for seg in segments)
+        self.speed = None  # The speed the path was planned for, if any
+
+    def dist_to_turn(self, s: float) -> Optional[float]:
+        """ Distance from s to the next arc, 0 when s is on an arc, or None when the rest of the path is straight """
+        for seg in self.segments:
+            if seg.kind != "S" and s < seg.start + seg.length:
+                return max(0.0, seg.start - s)
+        return None
+
+    def segment_at(self, s: float) -> PathSegment:
+        for seg in self.segments:
+            if s < seg.start + seg.length:
+                return seg
+        return self.segments[-1]
+
+    def point_at(self, s: float) -> Vec3:
+        """ The point at distance s along the path. Beyond the end the path continues straight in the arrival heading """
+        if s >= self.length:
+            last = self.segments[-1]
+            end = last.point_at(last.length)
+            heading = last.heading_at(last.length)
+            extra = s - self.length
+            return Vec3(end.x + extra * math.cos(heading), end.y + extra * math.sin(heading), end.z)
+        seg = self.segment_at(max(0.0, s))
+        return seg.point_at(max(0.0, s) - seg.start)
+
+    def closest(self, pos: Vec3) -> Tuple[float, float]:
+        """ Returns the distance along the path of the point closest to pos, and the distance from pos to the path """
+        best_s, best_dist = 0.0, math.inf
+        for seg in self.segments:
+            s, dist = seg.closest(pos)
+            if dist < best_dist:
+                best_s, best_dist = seg.start + s, dist
+        return best_s, best_dist
+
+    def remaining(self, pos: Vec3) -> float:
+        """ Path length left from the point closest to pos """
+        return self.length - self.closest(pos)[0]
+
+    def draw(self, bot, color, step: float=100):
+        points = [self.point_at(s) for s in _frange(0, self.length, step)]
+        points.append(self.point_at(self.length))
+        bot.renderer.draw_polyline_3d(points, color)
+
+
+def _frange(start: float, stop: float, step: float):
+    while start < stop:
+        yield start
+        start += step
+
+
+def _solve(word: str, a: float, b: float, d: float) -> Optional[Tuple[float, float, float]]:
+    """
+    The lengths of the three pieces of the path with the given word, in radians for arcs and turn radii for lines,
+    or None if the word is impossible. a and b are the start and arrival headings relative to the line between the
+    two positions and d is the distance between them in turn radii.
+    """
+    sa, sb, ca, cb = math.sin(a), math.sin(b), math.cos(a), math.cos(b)
+    cab = math.cos(a - b)
+    if word == "LSL":
+        p_sq = 2 + d * d - 2 * cab + 2 * d * (sa - sb)
+        if p_sq < 0:
+            return None
+        tmp = math.atan2(cb - ca, d + sa - sb)
+        return mod_tau(tmp - a), math.sqrt(p_sq), mod_tau(b - tmp)
+    if word == "RSR":
+        p_sq = 2 + d * d - 2 * cab + 2 * d * (sb - sa)
+        if p_sq < 0:
+            return None
+        tmp = math.atan2(ca - cb, d - sa + sb)
+        return mod_tau(a - tmp), math.sqrt(p_sq), mod_tau(tmp - b)
+    if word == "LSR":
+        p_sq = -2 + d * d + 2 * cab + 2 * d * (sa + sb)
+        if p_sq < 0:
+            return None
+        p = math.sqrt(p_sq)
+        tmp = math.atan2(-ca - cb, d + sa + sb) - math.atan2(-2, p)
+        return mod_tau(tmp - a), p, mod_tau(tmp - b)
+    if word == "RSL":
+        p_sq = -2 + d * d + 2 * cab - 2 * d * (sa + sb)
+        if p_sq < 0:
+            return None
+        p = math.sqrt(p_sq)
+        tmp = math.atan2(ca + cb, d - sa - sb) - math.atan2(2, p)
+        return mod_tau(a - tmp), p, mod_tau(b - tmp)
+    if word == "RLR":
+        tmp = (6 - d * d + 2 * cab + 2 * d * (sa - sb)) / 8
+        if abs(tmp) > 1:
+            return None
+        p = mod_tau(TAU - math.acos(tmp))
+        t = mod_tau(a - math.atan2(ca - cb, d - sa + sb) + p / 2)
+        return t, p, mod_tau(a - b - t + p)
+    if word == "LRL":
+        tmp = (6 - d * d + 2 * cab + 2 * d * (sb - sa)) / 8
+        if abs(tmp) > 1:
+            return None
+        p = mod_tau(TAU - math.acos(tmp))
+        t = mod_tau(-a - math.atan2(ca - cb, d + sa - sb) + p / 2)
+        return t, p, mod_tau(b - a - t + p)
+    raise ValueError(word)
+
+
+WORDS = ["LSL", "RSR", "LSR", "RSL", "RLR", "LRL"]
+
+
+def shortest_path(src: Vec3, src_heading: float, target: Vec3, target_heading: float, radius: float) -> DubinsPath:
+    """ The shortest path from src to target that starts and ends with the given headings and turns no tighter than radius """
+    dx, dy = target.x - src.x, target.y - src.y
+    d = math.hypot(dx, dy) / radius
+    theta = math.atan2(dy, dx) if d > 0 else 0.0
+    a = mod_tau(src_heading - theta)
+    b = mod_tau(target_heading - theta)
+
+    best_word, best_params, best_len = None, None, math.inf
+    for word in WORDS:
+        params = _solve(word, a, b, d)
+        if params is not None and sum(params) < best_len:
+            best_word, best_params, best_len = word, params, sum(params)
+
+    # Build the segments by walking along the path
+    segments = []
+    pos, heading, start = Vec3(src.x, src.y, src.z), src_heading, 0.0
+    for kind, param in zip(best_word, best_params):
+        seg = PathSegment(kind, pos, heading, param * radius, radius, start)
+        segments.append(seg)
+        pos = seg.point_at(seg.length)
+        heading = seg.heading_at(seg.length)
+        start += seg.length
+    return DubinsPath(best_word, segments, radius)
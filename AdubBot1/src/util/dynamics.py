@@ -0,0 +1,240 @@
+# How a car on the ground speeds up, slows down and turns, as precomputed curves.
+#
+# The curves are tabulated once (see util/table_cache.py) and then looked up by linear interpolation, so a query costs
+# the same whatever the speed. Every curve can be queried with a float or with a NumPy array of any shape.
+#   - Over speed: turn curvature, and the time and distance it takes to reach a speed from rest
+#   - Over time: the speed and the distance covered when accelerating from rest
+# Together they answer questions like "how long until I reach 1800 uu/s" and "how far can I drive in 1.5 seconds"
+# from any starting speed, with or without boost. Driving backwards isn't modelled; negative speeds count as 0.
+
+import math
+
+import numpy as np
+
+from util.table_cache import load_table
+
+MAX_CAR_SPEED = 2300
+THROTTLE_SPEED = 1410  # Max speed reachable by throttle alone
+BOOST_ACCEL = 991.666
+BRAKE_ACCEL = 3500
+COAST_ACCEL = 525
+
+# Measured turn curvature (1 / turn radius) at full steer. It is linear between these speeds
+CURVATURE_SPEEDS = [0, 500, 1000, 1500, 1750, 2500]
+CURVATURE_VALUES = [0.006900, 0.003980, 0.002350, 0.001375, 0.001100, 0.000800]
+
+SPEED_STEP = 5.0
+TIME_STEP = 1 / 120
+MAX_TIME = 6.0  # Long enough to reach top speed with or without boost
+SUBSTEPS = 10  # Integration steps per TIME_STEP when building the tables
+
+def throttle_accel(speed: float) -> float:
+    """ Acceleration from full throttle at the given forward speed """
+    if speed < 1400:
+        return 1600 - 1440 * speed / 1400
+    if speed < THROTTLE_SPEED:
+        return 160 * (THROTTLE_SPEED - speed) / 10
+    return 0.0
+
+
+class Curve:
+    """
+    A function tabulated at x = 0, step, 2 * step, ... and linearly interpolated in between. Below 0 it is clamped.
+    Past the end it is clamped too, or continued along its last segment if extend is set.
+    """
+    __slots__ = ("step", "values", "extend", "_list", "_inv_step", "_last", "_slope", "_xs")
+
+    def __init__(self, values: np.ndarray, step: float, extend: bool=False):
+        self.step = step
+        self.values = np.asarray(values, dtype=np.float64)
+        self.extend = extend
+        self._list = self.values.tolist()  # Indexing a list is much faster than indexing an array
+        self._inv_step = 1 / step
+        self._last = len(self._list) - 1
+        self._slope = (self._list[-1] - self._list[-2]) / step
+        self._xs = np.arange(len(self._list)) * step
+
+    def __call__(self, x: float) -> float:
+        i = x * self._inv_step
+        if 0 < i < self._last:
+            k = int(i)
+            values = self._list
+            a = values[k]
+            return a + (values[k + 1] - a) * (i - k)
+        if i <= 0:
+            return self._list[0]
+        if self.extend:
+            return self._list[-1] + (x - self._last * self.step) * self._slope
+        return self._list[-1]
+
+    def scalar(self):
+        """ Returns the same lookup as calling the curve, as a plain function. It is about twice as fast """
+        values, inv_step, last = self._list, self._inv_step, self._last
+        first, end, end_x, slope = values[0], values[-1], last * self.step, self._slope if self.extend else 0.0
+
+        def lookup(x: float) -> float:
+            i = x * inv_step
+            if 0 < i < last:
+                k = int(i)
+                a = values[k]
+                return a + (values[k + 1] - a) * (i - k)
+            return first if i <= 0 else end + (x - end_x) * slope
+
+        return lookup
+
+    def array(self, x: np.ndarray) -> np.ndarray:
+        result = np.interp(x, self._xs, self.values)
+        if self.extend:
+            end = self._xs[-1]
+            result = np.where(x > end, self._list[-1] + (x - end) * self._slope, result)
+        return result
+
+    def inverse_array(self, y: np.ndarray) -> np.ndarray:
+        """ The x at which the curve reaches every y. Only valid for curves that keep increasing """
+        result = np.interp(y, self.values, self._xs)
+        if self.extend:
+            end = self._list[-1]
+            result = np.where(y > end, self._xs[-1] + (y - end) / self._slope, result)
+        return result
+
+
+def _accelerate_from_rest(boost: bool):
+    """ Integrates full throttle (and boost) from rest. Returns the time, speed and distance at every substep """
+    h = TIME_STEP / SUBSTEPS
+    count = int(round(MAX_TIME / h)) + 1
+    speeds = np.zeros(count)
+    dists = np.zeros(count)
+    v = s = 0.0
+    for i in range(1, count):
+        accel = throttle_accel(v) + (BOOST_ACCEL if boost else 0.0)
+        v = min(v + accel * h, MAX_CAR_SPEED)
+        s += v * h
+        speeds[i] = v
+        dists[i] = s
+    return np.arange(count) * h, speeds, dists
+
+
+def _build_tables() -> np.ndarray:
+    """
+    Rows 0-3: over time, the speed and distance from rest with throttle, and then with boost.
+    Rows 4-7: over speed, the time and distance to reach it from rest with throttle, and then with boost. Speeds that
+    can't be reached hold the values of the last one that can.
+    Row 8: over speed, the turn curvature.
+    """
+    time_count = int(round(MAX_TIME / TIME_STEP)) + 1
+    speed_grid = np.arange(0, MAX_CAR_SPEED + SPEED_STEP / 2, SPEED_STEP)
+    width = max(time_count, len(speed_grid))
+    tables = np.zeros((9, width))
+
+    for row, boost in [(0, False), (2, True)]:
+        times, speeds, dists = _accelerate_from_rest(boost)
+        tables[row, :time_count] = speeds[::SUBSTEPS]
+        tables[row + 1, :time_count] = dists[::SUBSTEPS]
+
+        # Invert speed over time. It stops increasing once top speed is reached
+        rising = np.concatenate([[True], np.diff(speeds) > 0])
+        reachable = np.minimum(speed_grid, speeds[rising][-1])
+        tables[row + 4, :len(speed_grid)] = np.interp(reachable, speeds[rising], times[rising])
+        tables[row + 5, :len(speed_grid)] = np.interp(reachable, speeds[rising], dists[rising])
+
+    tables[8, :len(speed_grid)] = np.interp(speed_grid, CURVATURE_SPEEDS, CURVATURE_VALUES)
+    return tables
+
+
+def _load():
+    tables = load_table("car_dynamics", 1, _build_tables,
+                        {"speed_step": SPEED_STEP, "time_step": TIME_STEP, "max_time": MAX_TIME,
+                         "substeps": SUBSTEPS, "curvature": CURVATURE_VALUES})
+    time_count = int(round(MAX_TIME / TIME_STEP)) + 1
+    speed_count = int(round(MAX_CAR_SPEED / SPEED_STEP)) + 1
+
+    def over_time(row: int, extend: bool) -> Curve:
+        return Curve(tables[row, :time_count], TIME_STEP, extend)
+
+    def over_speed(row: int) -> Curve:
+        return Curve(tables[row, :speed_count], SPEED_STEP)
+
+    # Keyed by whether boost is used
+    speed_at = {False: over_time(0, False), True: over_time(2, False)}
+    dist_at = {False: over_time(1, True), True: over_time(3, True)}
+    time_to = {False: over_speed(4), True: over_speed(6)}
+    dist_to = {False: over_speed(5), True: over_speed(7)}
+    return speed_at, dist_at, time_to, dist_to, over_speed(8)
+
+
+SPEED_AT, DIST_AT, TIME_TO, DIST_TO, CURVATURE = _load()
+
+# Plain functions for scalar queries, see Curve.scalar()
+_speed_at = {boost: curve.scalar() for boost, curve in SPEED_AT.items()}
+_dist_at = {boost: curve.scalar() for boost, curve in DIST_AT.items()}
+_time_to = {boost: curve.scalar() for boost, curve in TIME_TO.items()}
+_dist_to = {boost: curve.scalar() for boost, curve in DIST_TO.items()}
+
+# The highest speeds the tables say can be reached. Throttle alone only approaches THROTTLE_SPEED
+TOP_SPEED = {boost: _speed_at[boost](MAX_TIME) for boost in (False, True)}
+
+turn_curvature = CURVATURE.scalar()
+
+
+def turn_radius(speed: float) -> float:
+    return 1.0 / turn_curvature(speed)
+
+
+def brake_time(v0: float, v1: float=0.0) -> float:
+    return max(0.0, v0 - v1) / BRAKE_ACCEL
+
+
+def brake_distance(v0: float, v1: float=0.0) -> float:
+    return max(0.0, v0 * v0 - v1 * v1) / (2 * BRAKE_ACCEL)
+
+
+def time_to_speed(v0: float, v1: float, boost: bool=True) -> float:
+    """ Time to go from speed v0 to v1 by accelerating at full throttle, or by braking if v1 is lower. Can be inf """
+    if v1 <= v0:
+        return brake_time(v0, v1)
+    if v1 > TOP_SPEED[boost]:
+        return math.inf
+    time_to = _time_to[boost]
+    return time_to(v1) - time_to(v0)
+
+
+def distance_to_speed(v0: float, v1: float, boost: bool=True) -> float:
+    """ Distance driven while going from speed v0 to v1, like time_to_speed(). Can be inf """
+    if v1 <= v0:
+        return brake_distance(v0, v1)
+    if v1 > TOP_SPEED[boost]:
+        return math.inf
+    dist_to = _dist_to[boost]
+    return dist_to(v1) - dist_to(v0)
+
+
+def speed_after(v0: float, time: float, boost: bool=True) -> float:
+    """ Speed after accelerating for the given time, starting at speed v0 """
+    if v0 >= TOP_SPEED[boost]:
+        return min(v0, MAX_CAR_SPEED)
+    return _speed_at[boost](_time_to[boost](v0) + time)
+
+
+def distance_in_time(v0: float, time: float, boost: bool=True) -> float:
+    """ Distance covered in the given time by accelerating at full throttle, starting at speed v0 """
+    if v0 >= TOP_SPEED[boost]:
+        return v0 * time  # Already as fast as accelerating would get
+    dist_at = _dist_at[boost]
+    t0 = _time_to[boost](v0)
+    return dist_at(t0 + time) - dist_at(t0)
+
+
+def distance_in_time_array(v0: float, times: np.ndarray, boost: bool=True) -> np.ndarray:
+    """ distance_in_time() for many times at once """
+    if v0 >= TOP_SPEED[boost]:
+        return v0 * times
+    t0 = _time_to[boost](max(v0, 0.0))
+    return DIST_AT[boost].array(t0 + times) - _dist_at[boost](t0)
+
+
+def time_for_distance_array(v0: float, dists: np.ndarray, boost: bool=True) -> np.ndarray:
+    """ Time it takes to cover each distance by accelerating at full throttle from speed v0. Inverse of the above """
+    if v0 >= TOP_SPEED[boost]:
+        return dists / v0
+    t0 = _time_to[boost](max(v0, 0.0))
+    return DIST_AT[boost].inverse_array(_dist_at[boost](t0) + dists) - t0
@@ -1,8 +1,20 @@
+import math
+
+import numpy as np
+
 from rlbot.agents.base_agent import SimpleControllerState
 from rlbot.messages.flat import GameTickPacket, FieldInfo
 
+from util.dynamics import turn_curvature, throttle_accel, MAX_CAR_SPEED, BOOST_ACCEL, BRAKE_ACCEL, COAST_ACCEL
+from util.boost_pad_index import BoostPadIndex
+from util.boost_pad_tracker import BoostRespawnTimeline
+from util.boost_route import BoostRoutePlanner
+from util.car_table import CarTable
+from util.latency import LatencyEstimator
 from util.rlmath import clip
-from util.vec import Vec3, Mat33, euler_to_rotation, angle_between, norm
+from util.spikes import SpikeWatcher
+from util.vec import Vec3, Mat33, euler_to_rotation_into
+from util.world_model import WorldFrame
 
 
 GRAVITY = Vec3(0, 0, -650)
@@ -19,38 +31,92 @@ class Field:
 
 
 class Ball:
+    __slots__ = ("pos", "vel", "ang_vel", "time")
+
     RADIUS = 92
 
     def __init__(self, pos=Vec3(), vel=Vec3(), ang_vel=Vec3(), time=0.0):
-        self.pos = pos
-        self.vel = vel
-        self.ang_vel = ang_vel
+        # Vectors are copied since read_packet updates them in place
+        self.pos = Vec3(pos)
+        self.vel = Vec3(vel)
+        self.ang_vel = Vec3(ang_vel)
         self.time = time
         # self.last_touch # TODO
         # self.last_bounce # TODO
 
+    def step(self, dt: float):
+        """
+        Moves the ball forward by dt seconds in place. The ball flies ballistically and bounces off the floor, which is
+        accurate enough for the few milliseconds of input latency
+        """
+        vz = self.vel.z
+        z = self.pos.z
+        if z > Ball.RADIUS + 1 or vz > 1:
+            # In the air
+            z += (vz + 0.5 * GRAVITY.z * dt) * dt
+            vz += GRAVITY.z * dt
+            if z < Ball.RADIUS:
+                z = Ball.RADIUS
+                vz *= -0.6
+        self.pos.set(self.pos.x + self.vel.x * dt, self.pos.y + self.vel.y * dt, z)
+        self.vel.z = vz
+        self.time += dt
+
+
+def _table_column(name: str, cast):
+    """ A property reading and writing this car's row of a CarTable column """
+    def getter(car):
+        return cast(getattr(car.table, name)[car.row])
+
+    def setter(car, value):
+        getattr(car.table, name)[car.row] = value
+
+    return property(getter, setter)
+
 
 class Car:
-    def __init__(self, index=-1, name="Unknown", team=0, pos=Vec3(), vel=Vec3(), ang_vel=Vec3(), rot=Mat33(), time=0.0):
+    """
+    A single car. Flags and boost are views into a row of a CarTable, which holds every car as NumPy columns.
+    Position, velocity and rotation are also kept as Vec3/Mat33 here (updated in place every tick), since most
+    of the per-car math works on those.
+    """
+
+    __slots__ = ("id", "index", "name", "team", "pos", "vel", "rot", "ang_vel", "time", "table", "row",
+                 "last_expected_time_till_reach_ball", "last_input")
+
+    def __init__(self, index=-1, name="Unknown", team=0, pos=Vec3(), vel=Vec3(), ang_vel=Vec3(), rot=Mat33(), time=0.0,
+                 table: CarTable=None):
         self.id = index
+        self.index = index
         self.name = name
         self.team = team
-        self.pos = pos
-        self.vel = vel
-        self.rot = rot
-        self.ang_vel = ang_vel
+        # Vectors and rotation are copied since read_packet updates them in place
+        self.pos = Vec3(pos)
+        self.vel = Vec3(vel)
+        self.rot = Mat33(rot)
+        self.ang_vel = Vec3(ang_vel)
         self.time = time
 
-        self.is_demolished = False
-        self.jumped = False
-        self.double_jumped = False
-        self.on_ground = True
-        self.supersonic = False
+        # A car that is not part of a game gets a table of its own
+        if table is None:
+            table = CarTable(1)
+            table.count = 1
+            self.row = 0
+        else:
+            self.row = index
+        self.table = table
 
         self.last_expected_time_till_reach_ball = 3
 
         self.last_input = SimpleControllerState()
 
+    is_demolished = _table_column("is_demolished", bool)
+    jumped = _table_column("jumped", bool)
+    double_jumped = _table_column("double_jumped", bool)
+    on_ground = _table_column("on_ground", bool)
+    supersonic = _table_column("supersonic", bool)
+    boost = _table_column("boost", int)
+
     @property
     def forward(self) -> Vec3:
         return self.rot.col(0)
@@ -63,18 +129,111 @@ class Car:
     def up(self) -> Vec3:
         return self.rot.col(2)
 
+    def read_game_car(self, game_car, time: float):
+        """ Updates the car's vectors in place from a PlayerInfo struct. The flags are read by the CarTable """
+        car_phy = game_car.physics
+        self.pos.copy_from(car_phy.location)
+        self.vel.copy_from(car_phy.velocity)
+        self.ang_vel.copy_from(car_phy.angular_velocity)
+        rot = car_phy.rotation
+        euler_to_rotation_into(self.rot, rot.pitch, rot.yaw, rot.roll)
+        self.time = time
+
+    def extrapolate(self, dt: float, controls: SimpleControllerState=None):
+        """
+        Moves the car forward by dt seconds in place. Without controls the car keeps its velocity, or falls if it is
+        in the air. With controls, throttle, boost and steering are applied using the car's acceleration and turning
+        curves when it is on the floor, and boost when it is in the air. The rotation only changes when turning on the
+        floor
+        """
+        vx, vy, vz = self.vel.x, self.vel.y, self.vel.z
+        rot = self.rot
+        if not self.on_ground:
+            vz += GRAVITY.z * dt
+            if controls is not None and controls.boost and self.boost > 0:
+                vx += rot.get(0, 0) * BOOST_ACCEL * dt
+                vy += rot.get(1, 0) * BOOST_ACCEL * dt
+                vz += rot.get(2, 0) * BOOST_ACCEL * dt
+        elif controls is not None and rot.get(2, 2) > 0.9:
+            # On the floor. Forward is close to horizontal
+            fx, fy = rot.get(0, 0), rot.get(1, 0)
+            speed = vx * fx + vy * fy
+            throttle = controls.throttle
+            if throttle * speed < 0:
+                accel = math.copysign(BRAKE_ACCEL, throttle)
+            elif abs(throttle) > 0.01:
+                accel = throttle * throttle_accel(abs(speed))
+            else:
+                accel = -math.copysign(min(COAST_ACCEL, abs(speed) / dt), speed)
+            if controls.boost and self.boost > 0:
+                accel += BOOST_ACCEL
+            new_speed = clip(speed + accel * dt, -MAX_CAR_SPEED, MAX_CAR_SPEED)
+            vx += fx * (new_speed - speed)
+            vy += fy * (new_speed - speed)
+
+            turn = controls.steer * turn_curvature(abs(new_speed)) * new_speed * dt
+            if turn != 0:
+                # Rotate velocity and orientation around the z axis
+                c, s = math.cos(turn), math.sin(turn)
+                vx, vy = c * vx - s * vy, s * vx + c * vy
+                data = rot.data
+                for col in range(3):
+                    x, y = data[col], data[3 + col]
+                    data[col] = c * x - s * y
+                    data[3 + col] = s * x + c * y
+
+        self.vel.set(vx, vy, vz)
+        self.pos.set(self.pos.x + vx * dt, self.pos.y + vy * dt, self.pos.z + vz * dt)
+        self.time += dt
+
+        # Move the car's row of the table along, so queries over all cars see the same state. The table's rotation
+        # is left as it was
+        self.table.pos[self.row] = (self.pos.x, self.pos.y, self.pos.z)
+        self.table.vel[self.row] = (vx, vy, vz)
+
 
 class BoostPad:
-    def __init__(self, index, pos, is_big, is_active, timer):
+    """
+    A single boost pad. Its active state and timer are views into a row of a BoostPadIndex.
+    """
+
+    __slots__ = ("index", "pos", "is_big", "row", "pad_index")
+
+    def __init__(self, index, pos, is_big, is_active, timer, pad_index: BoostPadIndex=None):
         self.index = index
         self.pos = pos
+        self.is_big = is_big
+
+        # A pad that is not part of a game gets an index of its own
+        if pad_index is None:
+            pad_index = BoostPadIndex([pos], [is_big])
+            self.row = 0
+        else:
+            self.row = index
+        self.pad_index = pad_index
+
         self.is_active = is_active
         self.timer = timer
-        self.is_big = is_big
+
+    @property
+    def is_active(self) -> bool:
+        return bool(self.pad_index.is_active[self.row])
+
+    @is_active.setter
+    def is_active(self, value: bool):
+        self.pad_index.is_active[self.row] = value
+
+    @property
+    def timer(self) -> float:
+        return float(self.pad_index.timer[self.row])
+
+    @timer.setter
+    def timer(self, value: float):
+        self.pad_index.timer[self.row] = value
 
 
 class GameInfo:
-    def __init__(self, index, team):
+    def __init__(self, index, team, latency: LatencyEstimator=None):
 
         self.team = team
         self.index = index
@@ -83,21 +242,33 @@ class GameInfo:
         self.dt = 0.016666
         self.time = 0
         self.is_kickoff = False
+        self.is_round_active = False  # False during the kickoff countdown, while the cars can't move yet
         self.last_kickoff_end_time = 0
         self.time_since_last_kickoff = 0
 
+        # Ball and cars are extrapolated by the estimated input latency, see util/latency.py
+        self.latency_estimator = latency if latency is not None else LatencyEstimator()
+        self.latency = self.latency_estimator.latency
+
         self.ball = Ball()
 
+        self.boost_pad_index = None
+        self.boost_timeline = None
+        self.boost_routes = None
         self.boost_pads = []
         self.small_boost_pads = []
         self.big_boost_pads = []
         self.convenient_boost_pad = None
         self.convenient_boost_pad_score = 0
 
+        self.car_table = CarTable()
+        self.spikes = SpikeWatcher()  # Which car has the ball on it, see Carry
         self.my_car = Car()
         self.cars = []
         self.teammates = []
         self.opponents = []
+        self.teammate_mask = self.car_table.teammate_mask(self.index, self.team)
+        self.opponent_mask = self.car_table.opponent_mask(self.team)
 
         self.own_goal = Vec3(0, self.team_sign * Field.LENGTH / 2, 0)
         self.own_goal_field = self.own_goal * 0.86
@@ -111,13 +282,17 @@ class GameInfo:
         if field_info is None or field_info.num_boosts == 0:
             return
 
+        raw_pads = [field_info.boost_pads[i] for i in range(field_info.num_boosts)]
+        positions = [Vec3(pad.location) for pad in raw_pads]
+        self.boost_pad_index = BoostPadIndex(positions, [pad.is_full_boost for pad in raw_pads])
+        self.boost_timeline = BoostRespawnTimeline(self.boost_pad_index.is_big)
+        self.boost_routes = BoostRoutePlanner(self.boost_pad_index, self.boost_timeline)
+
         self.boost_pads = []
         self.small_boost_pads = []
         self.big_boost_pads = []
-        for i in range(field_info.num_boosts):
-            pad = field_info.boost_pads[i]
-            pos = Vec3(pad.location)
-            pad = BoostPad(i, pos, pad.is_full_boost, True, 0.0)
+        for i, raw_pad in enumerate(raw_pads):
+            pad = BoostPad(i, positions[i], raw_pad.is_full_boost, True, 0.0, self.boost_pad_index)
             self.boost_pads.append(pad)
             if pad.is_big:
                 self.big_boost_pads.append(pad)
@@ -129,109 +304,92 @@ class GameInfo:
 
         self.field_info_loaded = True
 
-    def read_packet(self, packet: GameTickPacket):
+    def read_packet(self, packet: GameTickPacket, frame: WorldFrame=None):
+        """
+        Updates the game state from the packet. If a WorldFrame built from the same packet is given, its car table
+        and boost pad states are used instead of parsing those parts of the packet again.
+        """
 
         # Game state
         self.dt = packet.game_info.seconds_elapsed - self.time
         self.time = packet.game_info.seconds_elapsed
         self.is_kickoff = packet.game_info.is_kickoff_pause
+        self.is_round_active = packet.game_info.is_round_active
         if self.is_kickoff:
             self.last_kickoff_end_time = self.time
         self.time_since_last_kickoff = self.time - self.last_kickoff_end_time
 
-        # Read ball
+        # Read ball. Vectors are updated in place
         ball_phy = packet.game_ball.physics
-        self.ball.pos = Vec3(ball_phy.location)
-        self.ball.vel = Vec3(ball_phy.velocity)
-        self.ball.ang_vel = Vec3(ball_phy.angular_velocity)
-        self.ball.t = self.time
-        # self.ball.step(dt)
-
-        # Read cars
-        for i in range(0, packet.num_cars):
+        self.ball.pos.copy_from(ball_phy.location)
+        self.ball.vel.copy_from(ball_phy.velocity)
+        self.ball.ang_vel.copy_from(ball_phy.angular_velocity)
+        self.ball.time = self.time
+
+        # Read cars. All flags and the columns used by cross-car queries are filled at once. The table of a frame is
+        # shared with other bots, so it is copied, since the cars are extrapolated below
+        if frame is None:
+            self.car_table.read_packet(packet)
+        else:
+            self.car_table.copy_from(frame.car_table)
+        if len(self.cars) != self.car_table.count:
+            self.teammate_mask = self.car_table.teammate_mask(self.index, self.team)
+            self.opponent_mask = self.car_table.opponent_mask(self.team)
+
+        for i in range(0, self.car_table.count):
 
             game_car = packet.game_cars[i]
 
-            car_phy = game_car.physics
-
-            car = self.cars[i] if i < len(self.cars) else Car()
-
-            car.pos = Vec3(car_phy.location)
-            car.vel = Vec3(car_phy.velocity)
-            car.ang_vel = Vec3(car_phy.angular_velocity)
-            car.rot = euler_to_rotation(Vec3(car_phy.rotation.pitch, car_phy.rotation.yaw, car_phy.rotation.roll))
-
-            car.is_demolished = game_car.is_demolished
-            car.on_ground = game_car.has_wheel_contact
-            car.supersonic = game_car.is_super_sonic
-            car.jumped = game_car.jumped
-            car.double_jumped = game_car.double_jumped
-            car.boost = game_car.boost
-            car.time = self.time
+            if i < len(self.cars):
+                self.cars[i].read_game_car(game_car, self.time)
+                continue
 
-            # car.extrapolate(dt)
+            # First time we see this car
+            car = Car(i, game_car.name, game_car.team, table=self.car_table)
+            car.read_game_car(game_car, self.time)
+            self.cars.append(car)
 
-            if len(self.cars) <= i:
-
-                # First time we see this car
-                car.index = i
-                car.team = game_car.team
-                car.name = game_car.name
-                self.cars.append(car)
-
-                if game_car.team == self.team:
-                    if i == self.index:
-                        self.my_car = car
-                    else:
-                        self.teammates.append(car)
+            if game_car.team == self.team:
+                if i == self.index:
+                    self.my_car = car
                 else:
-                    self.opponents.append(car)
-
-        # Read boost pads
-        for i in range(0, len(self.boost_pads)):
-            boost_pad = packet.game_boosts[i]
-            self.boost_pads[i].is_active = boost_pad.is_active
-            self.boost_pads[i].timer = boost_pad.timer
-
+                    self.teammates.append(car)
+            else:
+                self.opponents.append(car)
+
+        self.spikes.read_packet(packet, self.car_table)
+
+        # Act on the state of the moment the controls are applied, not that of the packet. Only our own controls are
+        # known, so the other cars keep their velocity
+        self.latency = self.latency_estimator.update(self.dt)
+        if self.latency_estimator.enabled and self.is_round_active:
+            self.ball.step(self.latency)
+            for car in self.cars:
+                car.extrapolate(self.latency, car.last_input if car is self.my_car else None)
+
+        # Read boost pads and find the most convenient one. All pads are scored at once
+        if frame is None:
+            self.boost_pad_index.read_packet(packet)
+        else:
+            self.boost_pad_index.read_states(frame.pad_is_active, frame.pad_timer)
+        self.boost_timeline.update(self.time, self.boost_pad_index.is_active, self.boost_pad_index.timer)
+        scores = self.boost_pad_index.convenience_scores(self.my_car.pos, self.my_car.forward)
+        best = int(np.argmax(scores))
         self.convenient_boost_pad_score = 0
-        for pad in self.boost_pads:
-            pad_state = packet.game_boosts[pad.index]
-            pad.is_active = pad_state.is_active
-            pad.timer = pad_state.timer
-
-            score = self.get_boost_pad_convenience_score(pad)
-            if score > self.convenient_boost_pad_score:
-                self.convenient_boost_pad = pad
+        if scores[best] > 0:
+            self.convenient_boost_pad = self.boost_pads[best]
+            self.convenient_boost_pad_score = float(scores[best])
 
         # self.time += dt
 
     def get_boost_pad_convenience_score(self, pad):
-        if not pad.is_active:
-            return 0
-
-        car_to_pad = pad.pos - self.my_car.pos
-        angle = angle_between(self.my_car.forward, car_to_pad)
-
-        # Pads behind the car is bad
-        if abs(angle) > 1.3:
-            return 0
-
-        dist = norm(car_to_pad)
-
-        dist_score = 1 - clip((abs(dist) / 2500)**2, 0, 1)
-        angle_score = 1 - clip((abs(angle) / 3), 0, 1)
-
-        return dist_score * angle_score * (0.8, 1)[pad.is_big]
+        return float(self.boost_pad_index.convenience_scores(self.my_car.pos, self.my_car.forward)[pad.index])
 
     def closest_enemy(self, pos: Vec3):
-        enemy = None
-        dist = -1
-        for e in self.opponents:
-            d = norm(e.pos - pos)
-            if enemy is None or d < dist:
-                enemy = e
-                dist = d
-        return enemy, dist
+        index, dist = self.car_table.nearest(pos, self.opponent_mask)
+        if index < 0:
+            return None, -1
+        return self.cars[index], dist
 
 
 def is_near_wall(point: Vec3, offset: float=110) -> bool:
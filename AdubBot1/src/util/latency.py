@@ -0,0 +1,35 @@
+from util.rlmath import clip
+
+DEFAULT_FRAME_TIME = 1 / 120
+MAX_FRAME_TIME = 0.1  # Longer gaps between packets are pauses or resets, not latency
+
+
+class LatencyEstimator:
+    """
+    Estimates the time between the state in a packet and the moment the controls chosen from it are applied.
+    The framework applies controls on the physics tick after the packet was sent, so the latency is a number of
+    packet intervals. The interval is tracked as an exponential moving average of the time between packets, which
+    also covers packets that are skipped when the bot is slow.
+    """
+
+    def __init__(self, frames: float=1.0, extra: float=0.0, smoothing: float=0.05, max_latency: float=0.05):
+        self.frames = frames  # Packet intervals of latency. 0 disables extrapolation
+        self.extra = extra  # Seconds added on top, e.g. for a slow connection to the game
+        self.smoothing = smoothing
+        self.max_latency = max_latency
+        self.frame_time = DEFAULT_FRAME_TIME
+        self.latency = self._compute()
+
+    def _compute(self) -> float:
+        return clip(self.frames * self.frame_time + self.extra, 0, self.max_latency)
+
+    def update(self, dt: float) -> float:
+        """ Takes the time since the previous packet and returns the current latency estimate """
+        if 0 < dt < MAX_FRAME_TIME:
+            self.frame_time += self.smoothing * (dt - self.frame_time)
+            self.latency = self._compute()
+        return self.latency
+
+    @property
+    def enabled(self) -> bool:
+        return self.frames > 0 or self.extra > 0
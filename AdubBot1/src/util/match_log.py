@@ -0,0 +1,209 @@
+# This module writes and reads columnar match logs. Every stream (ball, cars, pads, controls, decisions) is a file of
+# fixed-size NumPy structured records, so a log can be memory-mapped and sliced by time without parsing the whole file.
+#
+# A log is a directory with one <stream>.bin file per stream and a meta.json describing the record dtypes.
+# The writer buffers a bounded number of rows per stream and appends them to the files in chunks.
+#
+# Ball, cars and pads are logged as they were in the packet. The bot decides on a state extrapolated by its input
+# latency (see util/latency.py), and that latency is logged with each decision, so the state the bot acted on can be
+# rebuilt from the log.
+
+import json
+from pathlib import Path
+from typing import Dict, Iterator
+
+import numpy as np
+from rlbot.utils.structures.game_data_struct import GameTickPacket
+
+from util.world_model import WorldFrame
+
+VERSION = 2
+
+MAX_PADS = 64
+
+STREAM_DTYPES = {
+    "ball": np.dtype([
+        ("time", "<f8"), ("frame", "<i4"),
+        ("pos", "<f4", (3,)), ("vel", "<f4", (3,)), ("ang_vel", "<f4", (3,)),
+    ]),
+    "cars": np.dtype([
+        ("time", "<f8"), ("frame", "<i4"), ("index", "u1"), ("team", "u1"),
+        ("pos", "<f4", (3,)), ("vel", "<f4", (3,)), ("rot", "<f4", (3,)), ("ang_vel", "<f4", (3,)),
+        ("boost", "<i2"), ("on_ground", "?"), ("is_demolished", "?"), ("supersonic", "?"),
+        ("jumped", "?"), ("double_jumped", "?"),
+    ]),
+    "pads": np.dtype([
+        ("time", "<f8"), ("frame", "<i4"), ("is_active", "?", (MAX_PADS,)),
+    ]),
+    "controls": np.dtype([
+        ("time", "<f8"), ("frame", "<i4"),
+        ("throttle", "<f4"), ("steer", "<f4"), ("pitch", "<f4"), ("yaw", "<f4"), ("roll", "<f4"),
+        ("jump", "?"), ("boost", "?"), ("handbrake", "?"),
+    ]),
+    "decisions": np.dtype([
+        ("time", "<f8"), ("frame", "<i4"), ("latency", "<f4"), ("choice", "S32"), ("maneuver", "S32"),
+    ]),
+}
+
+DEFAULT_CHUNK_ROWS = 1024
+
+
+class _StreamBuffer:
+    """ A bounded buffer of rows for one stream. Rows are appended to the file whenever the buffer is full """
+
+    def __init__(self, path: Path, dtype: np.dtype, chunk_rows: int):
+        self.file = open(path, "ab")
+        self.rows = np.zeros(chunk_rows, dtype=dtype)
+        self.count = 0
+
+    def reserve(self, n: int) -> np.ndarray:
+        """ Returns n zeroed rows to fill in. They are written on a later flush """
+        if self.count + n > len(self.rows):
+            self.flush()
+        if n > len(self.rows):
+            self.rows = np.zeros(n, dtype=self.rows.dtype)
+        rows = self.rows[self.count:self.count + n]
+        rows[:] = np.zeros(1, dtype=self.rows.dtype)
+        self.count += n
+        return rows
+
+    def flush(self):
+        if self.count > 0:
+            self.file.write(self.rows[:self.count].tobytes())
+            self.file.flush()
+            self.count = 0
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+class MatchLogWriter:
+    """
+    Appends game state, controls and decisions to a match log directory. Use write_tick once per tick, and call
+    close() when done, e.g. in the agent's retire().
+    """
+
+    def __init__(self, directory, chunk_rows: int=DEFAULT_CHUNK_ROWS):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "version": VERSION,
+            "chunk_rows": chunk_rows,
+            "streams": {name: dtype.descr for name, dtype in STREAM_DTYPES.items()},
+        }
+        with open(self.directory / "meta.json", "w") as file:
+            json.dump(meta, file)
+
+        self.streams: Dict[str, _StreamBuffer] = {
+            name: _StreamBuffer(self.directory / f"{name}.bin", dtype, chunk_rows)
+            for name, dtype in STREAM_DTYPES.items()
+        }
+
+    def reserve(self, stream: str, n: int=1) -> np.ndarray:
+        """ Returns n rows of the given stream to fill in """
+        return self.streams[stream].reserve(n)
+
+    def write_tick(self, packet: GameTickPacket, frame: WorldFrame, info, controls, choice=None, maneuver=None):
+        """
+        Writes the ball, cars and pads of the packet, the controls returned, and the current choice and maneuver along
+        with the latency the GameInfo extrapolated by. The frame must be built from the packet, its car table and pad
+        states are used as is
+        """
+        time = frame.time
+        frame_num = frame.frame_num
+
+        ball_phy = packet.game_ball.physics
+        ball = self.reserve("ball")[0]
+        ball["time"] = time
+        ball["frame"] = frame_num
+        ball["pos"] = (ball_phy.location.x, ball_phy.location.y, ball_phy.location.z)
+        ball["vel"] = (ball_phy.velocity.x, ball_phy.velocity.y, ball_phy.velocity.z)
+        ball["ang_vel"] = (ball_phy.angular_velocity.x, ball_phy.angular_velocity.y, ball_phy.angular_velocity.z)
+
+        table = frame.car_table
+        n = table.count
+        if n > 0:
+            cars = self.reserve("cars", n)
+            cars["time"] = time
+            cars["frame"] = frame_num
+            cars["index"] = np.arange(n)
+            cars["team"] = table.team[:n]
+            cars["pos"] = table.pos[:n]
+            cars["vel"] = table.vel[:n]
+            cars["rot"] = table.rotation[:n]
+            cars["ang_vel"] = table.ang_vel[:n]
+            cars["boost"] = table.boost[:n]
+            cars["on_ground"] = table.on_ground[:n]
+            cars["is_demolished"] = table.is_demolished[:n]
+            cars["supersonic"] = table.supersonic[:n]
+            cars["jumped"] = table.jumped[:n]
+            cars["double_jumped"] = table.double_jumped[:n]
+
+        if len(frame.pad_is_active) > 0:
+            pads = self.reserve("pads")[0]
+            pads["time"] = time
+            pads["frame"] = frame_num
+            active = frame.pad_is_active[:MAX_PADS]
+            pads["is_active"][:len(active)] = active
+
+        if controls is not None:
+            row = self.reserve("controls")[0]
+            row["time"] = time
+            row["frame"] = frame_num
+            for name in ("throttle", "steer", "pitch", "yaw", "roll", "jump", "boost", "handbrake"):
+                row[name] = getattr(controls, name)
+
+        row = self.reserve("decisions")[0]
+        row["time"] = time
+        row["frame"] = frame_num
+        row["latency"] = info.latency if info.latency_estimator.enabled and info.is_round_active else 0
+        row["choice"] = choice.__class__.__name__.encode() if choice is not None else b""
+        row["maneuver"] = maneuver.__class__.__name__.encode() if maneuver is not None else b""
+
+    def flush(self):
+        for stream in self.streams.values():
+            stream.flush()
+
+    def close(self):
+        for stream in self.streams.values():
+            stream.close()
+
+
+class MatchLogReader:
+    """
+    Memory-maps the streams of a match log. Nothing is read from disk until the returned arrays are accessed.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        with open(self.directory / "meta.json") as file:
+            meta = json.load(file)
+        if meta["version"] != VERSION:
+            raise ValueError(f"{directory} has match log version {meta['version']}, expected {VERSION}")
+        self.chunk_rows = meta["chunk_rows"]
+        self.dtypes = {name: np.dtype([tuple(field) for field in descr]) for name, descr in meta["streams"].items()}
+
+    def stream(self, name: str) -> np.ndarray:
+        """ Returns the whole stream as a read-only memory-mapped structured array """
+        path = self.directory / f"{name}.bin"
+        dtype = self.dtypes[name]
+        rows = path.stat().st_size // dtype.itemsize
+        if rows == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r", shape=(rows,))
+
+    def chunks(self, name: str, rows: int=None) -> Iterator[np.ndarray]:
+        """ Yields the stream in consecutive chunks of the given number of rows """
+        rows = rows or self.chunk_rows
+        data = self.stream(name)
+        for start in range(0, len(data), rows):
+            yield data[start:start + rows]
+
+    def between(self, name: str, start_time: float, end_time: float) -> np.ndarray:
+        """ Returns the rows of the stream with start_time <= time < end_time. Streams are sorted by time """
+        data = self.stream(name)
+        times = data["time"]
+        lo = np.searchsorted(times, start_time, side="left")
+        hi = np.searchsorted(times, end_time, side="left")
+        return data[lo:hi]
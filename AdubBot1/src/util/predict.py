@@ -9,6 +9,8 @@ class DummyObject:
     """ Holds a position and velocity. The base can be either a physics object from the rlbot framework or any object
      that has a pos and vel attribute. """
 
+    __slots__ = ("pos", "vel")
+
     def __init__(self, base=None):
         if base is not None:
             # Position
@@ -34,7 +36,10 @@ class DummyObject:
 
 class UncertainEvent:
     """ UncertainEvents are used by prediction methods to describe their result: If something happens and when
-     The class contains a few useful methods to compare UncertainEvents """
+     The class contains a few useful methods to compare UncertainEvents. Events are not modified after they are
+     created, so the common outcomes below are shared """
+
+    __slots__ = ("happens", "time", "data")
 
     def __init__(self, happens, time, data=None):
         self.happens = happens
@@ -54,10 +59,17 @@ class UncertainEvent:
         return self.happens and (not other.happens or other.time < self.time)
 
 
+NOW = UncertainEvent(True, 0)
+NEVER = UncertainEvent(False, 1e300)
+
+
 def fall(obj, time: float, g=GRAVITY):
     """ Moves the given object as if were falling. The position and velocity will be modified """
-    obj.pos = 0.5 * g * time * time + obj.vel * time + obj.pos
-    obj.vel = g * time + obj.vel
+    pos, vel = obj.pos, obj.vel
+    half_tt = 0.5 * time * time
+    obj.pos = Vec3(pos.x + vel.x * time + g.x * half_tt, pos.y + vel.y * time + g.y * half_tt,
+                   pos.z + vel.z * time + g.z * half_tt)
+    obj.vel = Vec3(vel.x + g.x * time, vel.y + g.y * time, vel.z + g.z * time)
     return obj
 
 
@@ -91,18 +103,18 @@ def arrival_at_height(obj, height: float, dir: str="ANY", g=GRAVITY.z) -> Uncert
 
     is_close = abs(height - obj.pos.z) < 3
     if is_close and dir == "ANY":
-        return UncertainEvent(True, 0)
+        return NOW
 
     D = 2 * g * height - 2 * g * obj.pos.z + obj.vel.z ** 2
 
     # Check if height is above current pos.z, because then it might never get there
     if obj.pos.z < height and dir != "DOWN":
         turn_time = -obj.vel.z / (2 * g)
-        turn_point_height = fall(DummyObject(obj), turn_time).pos.z
+        turn_point_height = obj.pos.z + obj.vel.z * turn_time + 0.5 * GRAVITY.z * turn_time * turn_time
 
         # Return false if height is never reached or was in the past
         if turn_point_height < height or turn_time < 0 or D < 0:
-            return UncertainEvent(False, 1e300)
+            return NEVER
 
         # The height is reached on the way up
         return UncertainEvent(True, (-obj.vel.z + math.sqrt(D)) / g)
@@ -112,7 +124,7 @@ def arrival_at_height(obj, height: float, dir: str="ANY", g=GRAVITY.z) -> Uncert
         return UncertainEvent(True, -(obj.vel.z + math.sqrt(D)) / g)
     else:
         # Never fulfils requirements
-        return UncertainEvent(False, 1e300)
+        return NEVER
 
 
 def time_till_reach_ball(car, ball):
@@ -1,5 +1,8 @@
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import List
+from typing import Callable, List, Optional
+
+import numpy as np
 
 from rlbot.agents.base_agent import SimpleControllerState
 from rlbot.utils.structures.game_data_struct import GameTickPacket
@@ -7,6 +10,7 @@ from rlbot.utils.structures.game_data_struct import GameTickPacket
 
 @dataclass
 class StepResult:
+    __slots__ = ("controls", "done")
     controls: SimpleControllerState
     done: bool
 
@@ -31,12 +35,14 @@ class ControlStep(Step):
         self.duration = duration
         self.controls = controls
         self.start_time: float = None
+        self.result = StepResult(controls=controls, done=False)  # Reused every tick
 
     def tick(self, packet: GameTickPacket) -> StepResult:
         if self.start_time is None:
             self.start_time = packet.game_info.seconds_elapsed
         elapsed_time = packet.game_info.seconds_elapsed - self.start_time
-        return StepResult(controls=self.controls, done=elapsed_time > self.duration)
+        self.result.done = elapsed_time > self.duration
+        return self.result
 
 
 class Sequence:
@@ -61,3 +67,94 @@ class Sequence:
         # If we reach here, we ran out of steps to attempt.
         self.done = True
         return None
+
+
+# The fields of SimpleControllerState a Timeline holds, in the order of its rows
+CONTROLS = ("throttle", "steer", "pitch", "yaw", "roll", "jump", "boost", "handbrake")
+_BUTTONS = ("jump", "boost", "handbrake")
+
+
+class Phase:
+    """
+    Controls that are held for some duration, a part of a Timeline. If a callback is given, it is called every tick
+    of the phase with the context given to the TimelinePlayer and the controls, and can change them, e.g. to aim
+    """
+    __slots__ = ("duration", "controls", "callback")
+
+    def __init__(self, duration: float, controls: SimpleControllerState, callback: Callable=None):
+        self.duration = duration
+        self.controls = controls
+        self.callback = callback
+
+
+class Timeline:
+    """
+    Phases compiled into flat lists: the time every phase starts, its controls as a tuple of CONTROLS and its
+    callback. The phase at a given time is found with one binary search over the start times. Neighbouring phases
+    with the same controls and no callbacks are merged, and phases of zero duration are only ever used when they are
+    last. After the timeline is over, its last phase is held
+    """
+    __slots__ = ("starts", "rows", "callbacks", "duration")
+
+    def __init__(self, phases: List[Phase]):
+        self.starts: List[float] = []
+        self.rows: List[tuple] = []
+        self.callbacks: List[Optional[Callable]] = []
+        time = 0.0
+        for phase in phases:
+            self._append(time, tuple(getattr(phase.controls, name) for name in CONTROLS), phase.callback)
+            time += phase.duration
+        self.duration = time
+
+    def _append(self, start: float, row: tuple, callback: Optional[Callable]):
+        if self.rows and callback is None and self.callbacks[-1] is None and self.rows[-1] == row:
+            return
+        self.starts.append(start)
+        self.rows.append(row)
+        self.callbacks.append(callback)
+
+    @staticmethod
+    def from_rows(rows: np.ndarray, step: float) -> 'Timeline':
+        """
+        A timeline of recorded controls, one row of CONTROLS for every step seconds. Row i is used from half a step
+        before i * step until half a step after, as if the time was rounded to the nearest row
+        """
+        timeline = Timeline([])
+        changes = np.flatnonzero(np.any(rows[1:] != rows[:-1], axis=1)) + 1
+        buttons = [CONTROLS.index(name) for name in _BUTTONS]
+        for i in [0] + changes.tolist():
+            row = tuple(bool(v) if k in buttons else float(v) for k, v in enumerate(rows[i]))
+            timeline._append(max(0.0, (i - 0.5) * step), row, None)
+        timeline.duration = (len(rows) - 0.5) * step
+        return timeline
+
+    def index_at(self, time: float) -> int:
+        """ The index of the phase at the given time since the start """
+        return max(bisect_right(self.starts, time) - 1, 0)
+
+
+class TimelinePlayer:
+    """
+    Plays a timeline from a start time. The controls are written into the same SimpleControllerState every tick, so
+    a tick allocates nothing
+    """
+    __slots__ = ("timeline", "start_time", "controls", "done")
+
+    def __init__(self, timeline: Timeline, start_time: float):
+        self.timeline = timeline
+        self.start_time = start_time
+        self.controls = SimpleControllerState()
+        self.done = False
+
+    def tick(self, time: float, context=None) -> SimpleControllerState:
+        """ Returns the controls at the given game time. Sets done when the timeline is over """
+        timeline = self.timeline
+        elapsed = time - self.start_time
+        i = timeline.index_at(elapsed)
+        self.done = elapsed >= timeline.duration
+        c = self.controls
+        c.throttle, c.steer, c.pitch, c.yaw, c.roll, c.jump, c.boost, c.handbrake = timeline.rows[i]
+        callback = timeline.callbacks[i]
+        if callback is not None:
+            callback(context, c)
+        return c
@@ -1,5 +1,6 @@
 from rlbot.utils.structures.game_data_struct import PlayerInfo, GameTickPacket
 
+from util.car_table import CarTable
 from util.vec import Vec3
 
 # When the ball is attached to a car's spikes, the distance will vary a bit depending on whether the ball is
@@ -11,26 +12,41 @@ from util.vec import Vec3
 MAX_DISTANCE_WHEN_SPIKED = 200
 
 class SpikeWatcher:
+    """
+    Keeps track of which car has the ball attached, and since when. In soccar there are no spikes, but the same
+    distance tells which car has the ball on its roof or bumper, e.g. while dribbling
+    """
+
     def __init__(self):
         self.carrying_car: PlayerInfo = None
+        self.carrying_index = -1
         self.spike_moment = 0
         self.carry_duration = 0
 
-    def read_packet(self, packet: GameTickPacket):
+    def read_packet(self, packet: GameTickPacket, car_table: CarTable=None):
+        """
+        Finds the car carrying the ball, if any. If a CarTable already filled from this packet is given, the
+        distances are computed from it in one go.
+        """
+        if car_table is None:
+            car_table = CarTable(packet.num_cars)
+            car_table.read_packet(packet)
+
         ball_location = Vec3(packet.game_ball.physics.location)
+        index, distance = car_table.nearest(ball_location)
         closest_candidate: PlayerInfo = None
-        closest_distance = 999999
-        for i in range(packet.num_cars):
-            car = packet.game_cars[i]
-            car_location = Vec3(car.physics.location)
-            distance = car_location.dist(ball_location)
-            if distance < MAX_DISTANCE_WHEN_SPIKED:
-                if distance < closest_distance:
-                    closest_candidate = car
-                    closest_distance = distance
-        if closest_candidate != self.carrying_car and closest_candidate is not None:
+        if 0 <= index and distance < MAX_DISTANCE_WHEN_SPIKED:
+            closest_candidate = packet.game_cars[index]
+        else:
+            index = -1
+
+        # The PlayerInfo structs are new objects every packet, so cars are compared by index
+        if index != self.carrying_index and closest_candidate is not None:
             self.spike_moment = packet.game_info.seconds_elapsed
 
         self.carrying_car = closest_candidate
+        self.carrying_index = index
         if self.carrying_car is not None:
             self.carry_duration = packet.game_info.seconds_elapsed - self.spike_moment
+        else:
+            self.carry_duration = 0
@@ -0,0 +1,87 @@
+# An on-disk cache for static lookup tables, so precomputing them doesn't slow down the bot's startup.
+#
+# A table is a NumPy array built by a function from a name, a version and optional parameters. It is stored as a .npy
+# file whose name contains all three, and memory-mapped read-only when it is loaded again, so only the parts that are
+# used are read from disk. Bump the version whenever the build function changes; stale files of the table are removed
+# when the new version is stored. If the cache directory can't be written to, tables are built in memory instead.
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+CACHE_DIR = Path(os.environ.get("ADUBBOT_TABLE_CACHE", Path(__file__).absolute().parent.parent / ".table_cache"))
+
+# Tables loaded by this process, shared by all bots in it
+_loaded: Dict[str, np.ndarray] = {}
+
+# (seconds, "loaded" or "built") per table, for startup timing
+load_times: Dict[str, Tuple[float, str]] = {}
+
+
+def table_file(name: str, version: int, params: dict=None) -> Path:
+    digest = hashlib.sha1(json.dumps(params or {}, sort_keys=True).encode()).hexdigest()[:12]
+    return CACHE_DIR / f"{name}-v{version}-{digest}.npy"
+
+
+def load_table(name: str, version: int, build: Callable[[], np.ndarray], params: dict=None) -> np.ndarray:
+    """
+    Returns the table, memory-mapped from the cache. It is built with build() and stored first, if the cache doesn't
+    have this version of it. The returned array is read-only.
+    """
+    path = table_file(name, version, params)
+    key = path.name
+    if key in _loaded:
+        return _loaded[key]
+
+    start = time.perf_counter()
+    table = None
+    if path.exists():
+        try:
+            table = np.load(path, mmap_mode="r")
+            status = "loaded"
+        except (OSError, ValueError):
+            table = None  # Corrupt or truncated. Build it again
+    if table is None:
+        table = np.ascontiguousarray(build())
+        status = "built"
+        if _store(name, path, table):
+            table = np.load(path, mmap_mode="r")
+        else:
+            table.setflags(write=False)
+
+    _loaded[key] = table
+    load_times[name] = (time.perf_counter() - start, status)
+    return table
+
+
+def _store(name: str, path: Path, table: np.ndarray) -> bool:
+    """ Writes the table atomically and removes older versions of it. Returns False if the cache isn't writable """
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as file:
+            np.save(file, table)
+        os.replace(tmp, path)
+    except OSError:
+        return False
+    current_version = path.name[:path.name.rindex("-") + 1]
+    for stale in CACHE_DIR.glob(f"{name}-v*.npy"):
+        if not stale.name.startswith(current_version):
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+    return True
+
+
+def clear_cache():
+    """ Removes every stored table """
+    _loaded.clear()
+    if CACHE_DIR.exists():
+        for file in CACHE_DIR.glob("*.npy"):
+            file.unlink()
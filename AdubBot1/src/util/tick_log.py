@@ -0,0 +1,101 @@
+# This module records everything the bot receives from the framework (game tick packets, field info and ball
+# predictions) into a compact binary log, and reads such logs back so matches can be replayed without the game.
+#
+# Format: a header followed by records. The header is the magic bytes, a format version, and the index and team of
+# the recording bot. Each record is a record type, a payload length, and a zlib compressed payload holding the raw
+# bytes of an rlbot ctypes struct.
+#
+# The ball prediction is 360 slices, several times the size of a compressed packet, so it is only recorded if asked
+# for, and then only when it differs from the last one recorded. Replays without it rebuild it from the packets with
+# headless/ball_prediction.py.
+
+import struct
+import zlib
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+from rlbot.utils.structures.ball_prediction_struct import BallPrediction
+from rlbot.utils.structures.game_data_struct import GameTickPacket, FieldInfoPacket
+
+MAGIC = b"ADUBTICK"
+VERSION = 2
+
+HEADER = struct.Struct("<8sHBB")
+RECORD_HEADER = struct.Struct("<BI")
+
+RECORD_FIELD_INFO = 1
+RECORD_TICK = 2  # Payload is a GameTickPacket
+RECORD_BALL_PREDICTION = 3  # Payload is a BallPrediction. It applies to the following ticks, until the next one
+
+COMPRESSION_LEVEL = 1  # Fast. The structs are mostly zeros, so even this shrinks them a lot
+
+
+class TickLogWriter:
+    """
+    Appends field info and ticks to a tick log. Call close() when done, e.g. in the agent's retire(). Ball predictions
+    are only written if record_ball_prediction is set
+    """
+
+    def __init__(self, path, index: int, team: int, record_ball_prediction: bool=False):
+        self.file: BinaryIO = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, index, team))
+        self.record_ball_prediction = record_ball_prediction
+        self.last_ball_prediction: Optional[bytes] = None
+        self.ticks_written = 0
+        self.ball_predictions_written = 0
+
+    def write_field_info(self, field_info: FieldInfoPacket):
+        self._write_record(RECORD_FIELD_INFO, bytes(field_info))
+
+    def write_tick(self, packet: GameTickPacket, ball_prediction: Optional[BallPrediction]):
+        if self.record_ball_prediction:
+            raw = bytes(ball_prediction if ball_prediction is not None else BallPrediction())
+            if raw != self.last_ball_prediction:
+                self._write_record(RECORD_BALL_PREDICTION, raw)
+                self.last_ball_prediction = raw
+                self.ball_predictions_written += 1
+        self._write_record(RECORD_TICK, bytes(packet))
+        self.ticks_written += 1
+
+    def _write_record(self, record_type: int, payload: bytes):
+        data = zlib.compress(payload, COMPRESSION_LEVEL)
+        self.file.write(RECORD_HEADER.pack(record_type, len(data)))
+        self.file.write(data)
+
+    def close(self):
+        self.file.close()
+
+
+class TickLogReader:
+    """
+    Reads a tick log. Iterating yields (packet, ball_prediction) for each tick. The ball prediction is None if the log
+    has none. The field info is available after the first tick has been read, since it is recorded once the bot has
+    received it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            magic, version, self.index, self.team = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a tick log")
+        if version != VERSION:
+            raise ValueError(f"{path} has tick log version {version}, expected {VERSION}")
+        self.field_info: Optional[FieldInfoPacket] = None
+
+    def __iter__(self) -> Iterator[Tuple[GameTickPacket, Optional[BallPrediction]]]:
+        ball_prediction = None
+        with open(self.path, "rb") as file:
+            file.seek(HEADER.size)
+            while True:
+                record_header = file.read(RECORD_HEADER.size)
+                if len(record_header) < RECORD_HEADER.size:
+                    return
+                record_type, length = RECORD_HEADER.unpack(record_header)
+                payload = zlib.decompress(file.read(length))
+
+                if record_type == RECORD_FIELD_INFO:
+                    self.field_info = FieldInfoPacket.from_buffer_copy(payload)
+                elif record_type == RECORD_BALL_PREDICTION:
+                    ball_prediction = BallPrediction.from_buffer_copy(payload)
+                elif record_type == RECORD_TICK:
+                    yield GameTickPacket.from_buffer_copy(payload), ball_prediction
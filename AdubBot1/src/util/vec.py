@@ -5,6 +5,8 @@ from typing import Union
 from util.rlmath import clip
 
 class Vec3:
+    __slots__ = ("x", "y", "z")
+
     def __init__(self, x: Union[float, 'Vec3'] = 0.0, y: float = 0.0, z: float = 0.0):
         if hasattr(x, 'x'):
             # We have been given a vector. Copy it
@@ -56,7 +58,23 @@ class Vec3:
         """Returns the dot product."""
         return self.x*other.x + self.y*other.y + self.z*other.z
 
+    def set(self, x: float, y: float, z: float) -> 'Vec3':
+        """Overwrites the components in place. Returns self so calls can be chained."""
+        self.x = x
+        self.y = y
+        self.z = z
+        return self
+
+    def copy_from(self, other) -> 'Vec3':
+        """Overwrites the components in place with those of another vector-like object, e.g. an rlbot Vector3."""
+        self.x = float(other.x)
+        self.y = float(other.y)
+        self.z = float(other.z)
+        return self
+
 class Mat33:
+    __slots__ = ("data",)
+
     def __init__(self, 
                  xx: Union[float, Vec3, 'Mat33'] = 0.0, 
                  xy: Union[float, Vec3] = 0.0, 
@@ -334,29 +352,36 @@ def rotation_to_axis(rot: Mat33) -> Vec3:
 
 
 def euler_to_rotation(pitch_yaw_roll: Vec3) -> Mat33:
-    cp = math.cos(pitch_yaw_roll[0])
-    sp = math.sin(pitch_yaw_roll[0])
-    cy = math.cos(pitch_yaw_roll[1])
-    sy = math.sin(pitch_yaw_roll[1])
-    cr = math.cos(pitch_yaw_roll[2])
-    sr = math.sin(pitch_yaw_roll[2])
+    return euler_to_rotation_into(Mat33(), pitch_yaw_roll[0], pitch_yaw_roll[1], pitch_yaw_roll[2])
+
+
+def euler_to_rotation_into(rotation: Mat33, pitch: float, yaw: float, roll: float) -> Mat33:
+    """
+    Same as euler_to_rotation, but writes the result into the given matrix instead of allocating a new one.
+    """
+    cp = math.cos(pitch)
+    sp = math.sin(pitch)
+    cy = math.cos(yaw)
+    sy = math.sin(yaw)
+    cr = math.cos(roll)
+    sr = math.sin(roll)
 
-    rotation = Mat33()
+    data = rotation.data
 
     # front direction
-    rotation.set(0, 0, cp * cy)
-    rotation.set(1, 0, cp * sy)
-    rotation.set(2, 0, sp)
+    data[0] = cp * cy
+    data[3] = cp * sy
+    data[6] = sp
 
     # left direction
-    rotation.set(0, 1, cy * sp * sr - cr * sy)
-    rotation.set(1, 1, sy * sp * sr + cr * cy)
-    rotation.set(2, 1, -cp * sr)
+    data[1] = cy * sp * sr - cr * sy
+    data[4] = sy * sp * sr + cr * cy
+    data[7] = -cp * sr
 
     # up direction
-    rotation.set(0, 2, -cr * cy * sp - sr * sy)
-    rotation.set(1, 2, -cr * sy * sp + sr * cy)
-    rotation.set(2, 2, cp * cr)
+    data[2] = -cr * cy * sp - sr * sy
+    data[5] = -cr * sy * sp + sr * cy
+    data[8] = cp * cr
 
     return rotation
 
@@ -0,0 +1,226 @@
+# This module holds the parts of the game state that are the same for every bot: the cars, the boost pads, and the
+# ball prediction plus the caches derived from it. When several bots run in the same process, the first bot to see a
+# packet builds a WorldFrame from it, and the other bots reuse that frame instead of parsing the packet again.
+# RLBot starts every Python bot in a process of its own, so in a normal match each bot has its own world model and
+# nothing is shared. Sharing only happens when bots are hosted in one process, like the headless AgentHost does.
+
+import ctypes
+import threading
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from rlbot.utils.structures.ball_prediction_struct import BallPrediction, Slice
+from rlbot.utils.structures.game_data_struct import GameTickPacket, Physics
+
+from util.ball_prediction_analysis import GOAL_THRESHOLD
+from util.boost_pad_index import boost_pad_state_array
+from util.car_table import CarTable
+from util.dynamics import distance_in_time_array
+
+# The ball is considered bouncing on the ground when it is this close to it
+GROUND_BOUNCE_HEIGHT = 120
+
+# How many frames a WorldModel keeps, see WorldModel
+FRAME_RING = 4
+
+SLICE_DTYPE = np.dtype({
+    "names": ["location", "velocity", "game_seconds"],
+    "formats": [("<f4", (3,)), ("<f4", (3,)), "<f4"],
+    "offsets": [Slice.physics.offset + Physics.location.offset,
+                Slice.physics.offset + Physics.velocity.offset,
+                Slice.game_seconds.offset],
+    "itemsize": ctypes.sizeof(Slice),
+})
+
+
+class BallTrajectory:
+    """
+    The ball prediction as arrays. Slice i is at time[i] (game seconds).
+    The arrays are views into buffers that are refilled in place by update().
+    """
+
+    def __init__(self, ball_prediction: Optional[BallPrediction]):
+        self._time = np.zeros(0)
+        self._pos = np.zeros((0, 3))
+        self._vel = np.zeros((0, 3))
+        self.update(ball_prediction)
+
+    def update(self, ball_prediction: Optional[BallPrediction]):
+        n = 0 if ball_prediction is None else ball_prediction.num_slices
+        if n > len(self._time):
+            self._time = np.zeros(n)
+            self._pos = np.zeros((n, 3))
+            self._vel = np.zeros((n, 3))
+        self.count = n
+        self.time = self._time[:n]
+        self.pos = self._pos[:n]
+        self.vel = self._vel[:n]
+        if n == 0:
+            return
+
+        raw = (ctypes.c_ubyte * ctypes.sizeof(ball_prediction.slices)).from_buffer(ball_prediction.slices)
+        slices = np.frombuffer(raw, dtype=SLICE_DTYPE)[:n]
+        self.time[:] = slices["game_seconds"]
+        self.pos[:] = slices["location"]
+        self.vel[:] = slices["velocity"]
+
+    def index_at(self, time: float) -> int:
+        """ Index of the last slice at or before the given game time, clipped to the valid range """
+        return int(np.clip(np.searchsorted(self.time, time, side="right") - 1, 0, max(self.count - 1, 0)))
+
+
+class BallEvents:
+    """
+    Notable moments found in a ball trajectory: when the ball bounces on the ground and whether it enters a goal.
+    """
+
+    def __init__(self, trajectory: BallTrajectory):
+        if trajectory.count < 2:
+            self.bounce_times = np.zeros(0)
+            self.goal_time = None
+            self.goal_side = 0
+            return
+
+        # Bounces: the vertical velocity flips from down to up close to the ground
+        vz = trajectory.vel[:, 2]
+        flips = (vz[:-1] < 0) & (vz[1:] >= 0) & (trajectory.pos[1:, 2] < GROUND_BOUNCE_HEIGHT)
+        self.bounce_times = trajectory.time[1:][flips]
+
+        # Goal: the first slice where the ball is past a goal line
+        in_goal = np.flatnonzero(np.abs(trajectory.pos[:, 1]) >= GOAL_THRESHOLD)
+        if len(in_goal) > 0:
+            self.goal_time = float(trajectory.time[in_goal[0]])
+            self.goal_side = int(np.sign(trajectory.pos[in_goal[0], 1]))
+        else:
+            self.goal_time = None
+            self.goal_side = 0
+
+    def next_bounce_after(self, time: float) -> Optional[float]:
+        i = np.searchsorted(self.bounce_times, time, side="right")
+        return float(self.bounce_times[i]) if i < len(self.bounce_times) else None
+
+
+class InterceptTable:
+    """
+    For every car, a rough estimate of the first trajectory slice the car can reach in time, using straight-line
+    travel at full throttle from the car's current speed, with boost if the car has any (see util/dynamics.py).
+    The slice index is -1 if the car can't reach any slice.
+    """
+
+    def __init__(self, cars: CarTable, trajectory: BallTrajectory, now: float):
+        n = cars.count
+        self.slice_index = np.full(n, -1)
+        self.time = np.full(n, np.inf)
+        if n == 0 or trajectory.count == 0:
+            return
+
+        # Distance from every car to every slice. Shape (cars, slices)
+        car_pos = cars.pos[:n].astype(np.float64)
+        dists = np.linalg.norm(trajectory.pos[np.newaxis, :, :2] - car_pos[:, np.newaxis, :2], axis=2)
+        speeds = np.linalg.norm(cars.vel[:n].astype(np.float64), axis=1)
+        times = np.maximum(trajectory.time - now, 0)
+        reach = np.empty_like(dists)
+        for i in range(n):
+            reach[i] = distance_in_time_array(speeds[i], times, cars.boost[i] > 0)
+        reachable = dists <= reach
+
+        has_any = reachable.any(axis=1)
+        first = reachable.argmax(axis=1)
+        self.slice_index = np.where(has_any, first, -1)
+        self.time = np.where(has_any, trajectory.time[first], np.inf)
+
+
+class WorldFrame:
+    """
+    Everything derived from a single packet that is the same for all bots. Must be treated as read-only once built,
+    since other bots may be using it at the same time. A WorldModel recycles its frames, see WorldModel.
+    """
+
+    def __init__(self, packet: GameTickPacket, ball_prediction: Optional[BallPrediction]):
+        self.car_table = CarTable()
+        self.pad_is_active = np.zeros(0, dtype=bool)
+        self.pad_timer = np.zeros(0)
+        self.trajectory = BallTrajectory(None)
+        self._events: Optional[BallEvents] = None
+        self._intercepts: Optional[InterceptTable] = None
+        self.update(packet, ball_prediction)
+
+    def update(self, packet: GameTickPacket, ball_prediction: Optional[BallPrediction]):
+        """ Rebuilds the frame from another packet, reusing the arrays of the car table, pads and trajectory """
+        self.frame_num = packet.game_info.frame_num
+        self.time = packet.game_info.seconds_elapsed
+
+        self.car_table.read_packet(packet)
+
+        pad_states = boost_pad_state_array(packet.game_boosts)[:packet.num_boost]
+        if len(self.pad_timer) != packet.num_boost:
+            self.pad_is_active = np.zeros(packet.num_boost, dtype=bool)
+            self.pad_timer = np.zeros(packet.num_boost)
+        self.pad_is_active[:] = pad_states["is_active"]
+        self.pad_timer[:] = pad_states["timer"]
+
+        self.ball_prediction = ball_prediction
+        self.trajectory.update(ball_prediction)
+        self._events = None
+        self._intercepts = None
+
+    @property
+    def events(self) -> BallEvents:
+        """ Found the first time they are asked for in a frame. Two bots asking at once may both find them """
+        if self._events is None:
+            self._events = BallEvents(self.trajectory)
+        return self._events
+
+    @property
+    def intercepts(self) -> InterceptTable:
+        """ Estimated the first time they are asked for in a frame, like events """
+        if self._intercepts is None:
+            self._intercepts = InterceptTable(self.car_table, self.trajectory, self.time)
+        return self._intercepts
+
+    def is_from(self, packet: GameTickPacket) -> bool:
+        # Frame numbers alone are not enough, some sources of packets (e.g. training) don't fill them in
+        return self.frame_num == packet.game_info.frame_num and self.time == packet.game_info.seconds_elapsed
+
+
+class WorldModel:
+    """
+    Builds WorldFrames. Frames are cached per packet, so a model shared by several bots only builds each frame once.
+    The bot that builds a frame holds a lock while doing so, and the other bots wait for it and then reuse the frame.
+
+    The frames of the last FRAME_RING packets are kept in a ring, and the oldest one is refilled for a new packet, so
+    no arrays are allocated per packet. A frame therefore stays valid until FRAME_RING newer packets have been seen
+    by any bot sharing the model. Bots in one process run within a packet or two of each other, so a bot that falls
+    behind still reads its own frame, not one refilled under it by a faster bot.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frames: List[WorldFrame] = []
+        self._oldest = 0  # Index of the frame to refill next, once the ring is full
+        self.frames_built = 0
+
+    def get_frame(self, packet: GameTickPacket, get_ball_prediction: Callable[[], BallPrediction]) -> WorldFrame:
+        with self._lock:
+            for frame in self._frames:
+                if frame.is_from(packet):
+                    return frame
+            if len(self._frames) < FRAME_RING:
+                frame = WorldFrame(packet, get_ball_prediction())
+                self._frames.append(frame)
+            else:
+                frame = self._frames[self._oldest]
+                frame.update(packet, get_ball_prediction())
+                self._oldest = (self._oldest + 1) % FRAME_RING
+            self.frames_built += 1
+            return frame
+
+
+# The world model shared by all bots in this process that opt in
+_shared_world_model = WorldModel()
+
+
+def shared_world_model() -> WorldModel:
+    """ Returns the world model of this process. It is only shared with bots hosted in the same process """
+    return _shared_world_model
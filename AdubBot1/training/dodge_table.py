@@ -0,0 +1,51 @@
+# Builds the dodge outcome table of util/dodge_table.py into the table cache and prints a slice of it: the outcome of
+# dodging in every direction of the grid from one speed, after one delay. Bots build the table themselves the first
+# time they need it, so running this is only needed to look at the table or to build it ahead of a match.
+#
+# Usage, from the AdubBot1 directory:
+#   python training/dodge_table.py
+#   python training/dodge_table.py --speed 1400 --delay 0.3 --rebuild
+
+import argparse
+import math
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).absolute().parent.parent))
+
+import headless  # Puts src/ on the path
+
+from util import dodge_table
+from util.table_cache import CACHE_DIR, load_times
+
+
+def rebuild():
+    """ Removes the cached table, so the next load builds it again """
+    for stale in CACHE_DIR.glob("dodge_outcomes-v*.npy"):
+        stale.unlink()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build and print the dodge outcome table")
+    parser.add_argument("--speed", type=float, default=1400, help="initial forward speed of the printed slice")
+    parser.add_argument("--delay", type=float, default=0.18, help="seconds from the first jump to the dodge")
+    parser.add_argument("--hold", type=float, default=dodge_table.FIRST_JUMP_HOLD,
+                        help="seconds the first jump is held, see DodgeManeuver.t_first_jump")
+    parser.add_argument("--rebuild", action="store_true", help="build the table even if it is cached")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        rebuild()
+    table = dodge_table.table(args.hold)
+    seconds, status = load_times["dodge_outcomes"]
+    print(f"Table of shape {table.shape}, {status} in {seconds * 1e3:.1f} ms")
+    print(f"{len(dodge_table.SPEEDS)} speeds up to {dodge_table.SPEEDS[-1]:.0f}, "
+          f"{dodge_table.DIRECTION_COUNT} directions, "
+          f"{len(dodge_table.DELAYS)} delays from {dodge_table.DELAYS[0]:.2f} to {dodge_table.DELAYS[-1]:.2f} s")
+
+    print(f"\nDodges from {args.speed:.0f} uu/s after {args.delay:.2f} s, holding jump {args.hold:.2f} s, in the car's frame (x forward, y left)")
+    print(f"{'direction':>10} {'vel x':>8} {'vel y':>8} {'disp x':>8} {'disp y':>8} {'time':>6}")
+    for direction in dodge_table.DIRECTIONS[:-1]:
+        outcome = dodge_table.dodge_outcome(args.speed, direction, args.delay, args.hold)
+        print(f"{math.degrees(direction):9.1f}° {outcome.vel_forward:8.0f} {outcome.vel_left:8.0f} "
+              f"{outcome.disp_forward:8.0f} {outcome.disp_left:8.0f} {outcome.time:6.2f}")
@@ -0,0 +1,130 @@
+# Records the kickoff playbook used by src/maneuvers/kickoff_playbook.py. For every pair of spawns of a blue and an
+# orange car, a 1v1 kickoff is played on the headless simulator with KickoffManeuver (the playbook itself is turned
+# off), and the controls of both bots and the paths of both cars are recorded until the ball is first touched. Each
+# kickoff gives a play for both teams. The plays are written to src/maneuvers/kickoff_playbook.npz.
+#
+# Run it again whenever KickoffManeuver, the controllers it uses or the simulator change.
+#
+# Usage, from the AdubBot1 directory:
+#   python training/kickoff_playbook.py
+#   python training/kickoff_playbook.py --check   # replays every play with the playbook on and compares
+
+import argparse
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).absolute().parent.parent))
+
+import headless  # Puts src/ on the path
+from headless.simulator import Simulator, SimBall, KICKOFF_SPAWNS, CAR_REST_HEIGHT, TICK_RATE, SimulationResult
+
+from maneuvers import kickoff_playbook
+from maneuvers.kickoff_playbook import PLAYBOOK_FILE, CONTROLS, SPAWNS, spawn_index, PlaybookKickoffManeuver
+from util.vec import Vec3
+
+MAX_SECONDS = 4.0
+COUNTDOWN = 3.0  # The game's kickoff countdown. Plays are recorded without it, and checked with it
+
+
+def spawn_pose(spawn: int, team: int):
+    """ The position and yaw of the simulator's spawn that is the playbook's spawn for the team """
+    team_sign = -1 if team == 0 else 1
+    for x, y, yaw in KICKOFF_SPAWNS:
+        if team == 1:
+            x, y, yaw = -x, -y, yaw - math.pi
+        if spawn_index(Vec3(x, y, 0), team_sign) == spawn:
+            return Vec3(x, y, CAR_REST_HEIGHT), yaw
+    raise ValueError(f"No simulator spawn matches spawn {spawn}")
+
+
+def play_kickoff(blue_spawn: int, orange_spawn: int, countdown: float=0.0):
+    """
+    Plays a kickoff, after a countdown of the given length. Returns the time of the first touch since the countdown
+    ended, the car that made it, the recorded ticks after the countdown and for both cars whether they followed a
+    play until the touch
+    """
+    sim = Simulator(1, 1)
+    sim.ball = SimBall()
+    for car, spawn in zip(sim.cars, (blue_spawn, orange_spawn)):
+        pos, yaw = spawn_pose(spawn, car.team)
+        car.reset(pos, yaw)
+    sim.is_kickoff = True
+    sim.countdown_ticks = round(countdown * TICK_RATE)
+    sim.future.invalidate()
+
+    result = SimulationResult()
+    paths, controls = [], []
+    while result.first_touch is None and sim.time < countdown + MAX_SECONDS:
+        counting_down = sim.countdown_ticks > 0
+        if not counting_down:
+            paths.append([(car.pos.x, car.pos.y) for car in sim.cars])
+        sim.step(result)
+        if not counting_down:
+            controls.append([[float(getattr(c, name)) for name in CONTROLS] for c in sim.controls])
+    followed = [isinstance(host.agent.maneuver, PlaybookKickoffManeuver) and host.agent.maneuver.following
+                for host in sim.hosts]
+    sim.retire()
+    touch_time, toucher = result.first_touch if result.first_touch is not None else (math.inf, -1)
+    touch_time -= countdown
+    return touch_time, toucher, np.array(paths, dtype=np.float32), np.array(controls, dtype=np.float32), followed
+
+
+def record():
+    kickoff_playbook.ENABLED = False
+    plays = []
+    spawns = range(len(SPAWNS))
+    for blue_spawn in spawns:
+        for orange_spawn in spawns:
+            touch_time, toucher, paths, controls, _ = play_kickoff(blue_spawn, orange_spawn)
+            print(f"blue {blue_spawn} vs orange {orange_spawn}: "
+                  f"touched by car {toucher} after {touch_time:.2f} s, {len(controls)} ticks")
+            for me, (team, mine, theirs) in enumerate([(0, blue_spawn, orange_spawn), (1, orange_spawn, blue_spawn)]):
+                plays.append(((team, mine, theirs), touch_time, toucher == me,
+                              controls[:, me], paths[:, me], paths[:, 1 - me]))
+
+    length = max(len(play[3]) for play in plays)
+
+    def padded(array: np.ndarray) -> np.ndarray:
+        return np.concatenate([array, np.repeat(array[-1:], length - len(array), axis=0)])
+
+    np.savez_compressed(
+        PLAYBOOK_FILE,
+        keys=np.array([play[0] for play in plays], dtype=np.int8),
+        lengths=np.array([len(play[3]) for play in plays], dtype=np.int32),
+        contact_times=np.array([play[1] for play in plays], dtype=np.float32),
+        we_touch=np.array([play[2] for play in plays]),
+        controls=np.array([padded(play[3]) for play in plays]),
+        my_paths=np.array([padded(play[4]) for play in plays]),
+        opp_paths=np.array([padded(play[5]) for play in plays]),
+    )
+    print(f"{len(plays)} plays written to {PLAYBOOK_FILE}")
+
+
+def check():
+    """
+    Plays every kickoff again with the playbook, after a countdown like the game's, and reports how the touches
+    compare to the recording
+    """
+    playbook = kickoff_playbook.load_playbook()
+    kickoff_playbook.PLAYBOOK = playbook
+    kickoff_playbook.ENABLED = True
+    for blue_spawn in range(len(SPAWNS)):
+        for orange_spawn in range(len(SPAWNS)):
+            touch_time, toucher, _, _, followed = play_kickoff(blue_spawn, orange_spawn, COUNTDOWN)
+            expected = playbook[(0, blue_spawn, orange_spawn)]
+            print(f"blue {blue_spawn} vs orange {orange_spawn}: touched by car {toucher} after {touch_time:.3f} s, "
+                  f"recorded {expected.contact_time:.3f} s by car {0 if expected.we_touch else 1}, "
+                  f"plays followed {followed}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record the kickoff playbook")
+    parser.add_argument("--check", action="store_true", help="replay the recorded plays and compare")
+    args = parser.parse_args()
+    if args.check:
+        check()
+    else:
+        record()
@@ -0,0 +1,130 @@
+# Runs training playlists on the headless simulator instead of the game. Exercises are set up with their
+# make_game_state and graded by their Grader, like rlbottraining does, but they run in parallel worker processes and
+# much faster than realtime. Every exercise gets its own seed, so a run can be reproduced.
+#
+# Usage, from the AdubBot1 directory:
+#   python training/offline_runner.py                               # hello_world_training's default playlist
+#   python training/offline_runner.py --playlist example_playlist  # any module with make_default_playlist()
+#   python training/offline_runner.py --workers 4 --seed 7 --repeat 10
+
+import argparse
+import copy
+import importlib
+import random
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).absolute().parent.parent))
+
+import headless  # Puts src/ on the path
+from headless.simulator import Simulator, TICK_RATE
+
+from rlbot.matchconfig.match_config import Team
+from rlbot.training.training import Pass, Fail
+from rlbottraining.grading.training_tick_packet import TrainingTickPacket
+from rlbottraining.rng import SeededRandomNumberGenerator
+from rlbottraining.training_exercise import TrainingExercise
+
+MAX_SECONDS = 60.0  # Exercises whose grader hasn't decided after this long fail
+
+
+class OfflineResult:
+    def __init__(self, name: str, seed: int):
+        self.name = name
+        self.seed = seed
+        self.grade = None
+        self.error: Optional[str] = None  # Set if the exercise could not be run
+        self.bot_errors = 0  # Number of ticks where a bot raised an exception
+        self.first_bot_error: Optional[str] = None
+        self.sim_time = 0.0
+        self.wall_time = 0.0
+
+    @property
+    def passed(self) -> bool:
+        return isinstance(self.grade, Pass)
+
+    @property
+    def status(self) -> str:
+        if self.error is not None:
+            return "ERROR"
+        return "PASS" if self.passed else "FAIL"
+
+
+def run_exercise(exercise: TrainingExercise, seed: int) -> OfflineResult:
+    """ Plays one exercise on a fresh simulator. The exercise is copied, so its grader starts from scratch """
+    exercise = copy.deepcopy(exercise)
+    result = OfflineResult(exercise.name, seed)
+    start = time.perf_counter()
+    try:
+        players = exercise.match_config.player_configs
+        num_blue = sum(1 for player in players if player.team == Team.BLUE.value)
+        sim = Simulator(num_blue, len(players) - num_blue, seed=seed)
+        sim.apply_game_state(exercise.make_game_state(SeededRandomNumberGenerator(random.Random(seed))))
+
+        tick = TrainingTickPacket()
+        for _ in range(int(MAX_SECONDS * TICK_RATE)):
+            sim.step()
+            tick.update(sim.packet())
+            result.grade = exercise.grader.on_tick(tick)
+            if result.grade is not None:
+                break
+        else:
+            result.grade = Fail()
+        result.sim_time = sim.time
+        result.bot_errors = sum(host.error_count for host in sim.hosts)
+        result.first_bot_error = next((host.errors[0] for host in sim.hosts if host.errors), None)
+        sim.retire()
+    except Exception:
+        result.error = traceback.format_exc()
+    result.wall_time = time.perf_counter() - start
+    return result
+
+
+def run_playlist_offline(playlist: List[TrainingExercise], seed: int=4, workers: int=None,
+                         repeat: int=1) -> List[OfflineResult]:
+    """
+    Runs every exercise of the playlist repeat times, spread over worker processes. Run i of exercise j uses the seed
+    derived from (seed, i, j), so the results only depend on the seed.
+    """
+    jobs = [(exercise, random.Random(f"{seed}-{i}-{j}").getrandbits(31))
+            for i in range(repeat) for j, exercise in enumerate(playlist)]
+    if workers == 1:
+        return [run_exercise(exercise, job_seed) for exercise, job_seed in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_exercise, *zip(*jobs)))
+
+
+def print_report(results: List[OfflineResult], wall_time: float):
+    name_width = max(len(result.name) for result in results)
+    print(f"{'Exercise':<{name_width}}  Result  Game time  Wall time  Bot errors  Grade")
+    for result in results:
+        grade = result.error.strip().splitlines()[-1] if result.error else repr(result.grade)
+        print(f"{result.name:<{name_width}}  {result.status:<6}  {result.sim_time:8.2f}s  {result.wall_time:8.2f}s  "
+              f"{result.bot_errors:10}  {grade}")
+    passed = sum(1 for result in results if result.passed)
+    sim_time = sum(result.sim_time for result in results)
+    errors = [result.first_bot_error for result in results if result.first_bot_error]
+    if errors:
+        print(f"\nFirst bot error:\n{errors[0]}")
+    print(f"\n{passed}/{len(results)} passed. {sim_time:.1f}s of game time in {wall_time:.1f}s "
+          f"({sim_time / max(wall_time, 1e-9):.1f}x realtime)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a training playlist on the headless simulator")
+    parser.add_argument("--playlist", default="hello_world_training",
+                        help="module in training/ with a make_default_playlist() function")
+    parser.add_argument("--seed", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, default is one per cpu")
+    parser.add_argument("--repeat", type=int, default=1, help="run each exercise this many times")
+    args = parser.parse_args()
+
+    playlist = importlib.import_module(args.playlist).make_default_playlist()
+    start = time.perf_counter()
+    results = run_playlist_offline(playlist, args.seed, args.workers, args.repeat)
+    print_report(results, time.perf_counter() - start)
+    sys.exit(0 if all(result.passed for result in results) else 1)
@@ -0,0 +1,321 @@
+# Tunes the bot's hand-picked constants on the headless simulator. Every candidate configuration plays the same set of
+# seeded attacking scenarios, spread over worker processes, and is scored by how often the bot scores and how fast.
+#
+# Three search strategies are available:
+#   grid     - every combination of evenly spaced values of the chosen parameters
+#   random   - configurations sampled uniformly from the parameter ranges
+#   halving  - successive halving: many random configurations play a few scenarios, the best third plays three times
+#              as many, and so on until one is left or every scenario has been played
+# The current defaults are always evaluated too, so the results show whether a configuration beats them.
+#
+# The full result table is written to results.csv, best first, and the best configuration to best.json.
+#
+# Usage, from the AdubBot1 directory:
+#   python training/sweep.py --strategy halving --configs 27
+#   python training/sweep.py --strategy grid --params Carry.wait_before_flick Carry.offset_bias --points 4
+#   python training/sweep.py --strategy random --configs 20 --scenarios 30 --workers 4
+
+import argparse
+import csv
+import importlib
+import itertools
+import json
+import math
+import random
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).absolute().parent.parent))
+
+import headless  # Puts src/ on the path
+from headless.simulator import Simulator, TICK_RATE, CAR_REST_HEIGHT
+
+from rlbot.agents.base_agent import BaseAgent, SimpleControllerState
+
+from util.info import Ball
+from util.vec import Vec3
+
+SCENARIO_SECONDS = 10.0  # Scenarios where the bot hasn't scored after this long are failures
+
+# Classes with tunable constants. A parameter named "Carry.offset_bias" is the class attribute offset_bias of Carry
+TUNABLE_CLASSES = {
+    "Carry": ("behaviors.carry", "Carry"),
+    "DodgeManeuver": ("maneuvers.dodge", "DodgeManeuver"),
+    "utilSystem": ("behaviors.utsystem", "utilSystem"),
+    "HandbrakeLimiter": ("controllers.drive", "HandbrakeLimiter"),
+}
+
+
+class Parameter:
+    def __init__(self, name: str, low: float, high: float, integer: bool=False):
+        self.name = name
+        self.low = low
+        self.high = high
+        self.integer = integer
+
+    def _round(self, value: float):
+        return int(round(value)) if self.integer else round(value, 4)
+
+    def grid(self, points: int) -> list:
+        values = [self._round(self.low + (self.high - self.low) * i / max(points - 1, 1)) for i in range(points)]
+        return sorted(set(values))
+
+    def sample(self, rng: random.Random):
+        if self.integer:
+            return rng.randint(int(self.low), int(self.high))
+        return self._round(rng.uniform(self.low, self.high))
+
+
+PARAMETERS = [
+    Parameter("Carry.wait_before_flick", 0.1, 0.5),
+    Parameter("Carry.offset_bias", 10, 70),
+    Parameter("DodgeManeuver.t_first_jump", 0.06, 0.2),
+    Parameter("DodgeManeuver.t_aim", 0.04, 0.14),
+    Parameter("DodgeManeuver.t_second_jump", 0.1, 0.4),
+    Parameter("DodgeManeuver.t_second_wait", 0.2, 0.5),
+    Parameter("utilSystem.prev_bias", 0.0, 0.3),
+    Parameter("HandbrakeLimiter.HANDBRAKE_FRAMES", 4, 16, integer=True),
+    Parameter("HandbrakeLimiter.WAIT_FRAMES", 8, 24, integer=True),
+]
+PARAMETERS_BY_NAME = {param.name: param for param in PARAMETERS}
+
+
+def _tunable(name: str):
+    class_name, attribute = name.split(".")
+    module, cls = TUNABLE_CLASSES[class_name]
+    return getattr(importlib.import_module(module), cls), attribute
+
+
+def current_config(names: List[str]) -> Dict[str, float]:
+    """ The values the parameters have in the code """
+    return {name: getattr(*_tunable(name)) for name in names}
+
+
+def apply_config(config: Dict[str, float]):
+    """ Sets the class attributes of the configuration. Objects created afterwards use the new values """
+    for name, value in config.items():
+        setattr(*_tunable(name), value)
+
+
+class IdleAgent(BaseAgent):
+    """ An opponent that sits in its goal """
+
+    def get_output(self, packet) -> SimpleControllerState:
+        return SimpleControllerState()
+
+
+class ScenarioOutcome:
+    def __init__(self, seed: int):
+        self.seed = seed
+        self.scored = False
+        self.time_to_goal: Optional[float] = None
+        self.bot_errors = 0
+        self.error: Optional[str] = None  # Set if the scenario could not be run
+
+
+def run_scenario(config: Dict[str, float], seed: int, bot_tick_rate: int=TICK_RATE) -> ScenarioOutcome:
+    """
+    Places the ball somewhere on the orange half, rolling or bouncing, and the blue bot behind it. An idle orange car
+    stands in its goal. The bot succeeds if it scores within SCENARIO_SECONDS.
+    """
+    outcome = ScenarioOutcome(seed)
+    try:
+        apply_config(config)
+        rng = random.Random(seed)
+        sim = Simulator(1, 1, [None, IdleAgent], seed, bot_tick_rate)
+
+        ball_pos = Vec3(rng.uniform(-2500, 2500), rng.uniform(0, 3000), rng.choice([Ball.RADIUS, rng.uniform(200, 800)]))
+        ball_vel = Vec3(rng.uniform(-500, 500), rng.uniform(-500, 500), rng.uniform(0, 500))
+        car_pos = ball_pos + Vec3(rng.uniform(-1500, 1500), -rng.uniform(1000, 2500), 0)
+        car_pos.z = CAR_REST_HEIGHT
+        yaw = math.atan2(ball_pos.y - car_pos.y, ball_pos.x - car_pos.x)
+        sim.set_ball(ball_pos, ball_vel)
+        sim.set_car(0, car_pos, yaw, boost=rng.uniform(0, 100))
+        sim.set_car(1, Vec3(0, 5000, CAR_REST_HEIGHT), -math.pi / 2)
+
+        result = sim.run(SCENARIO_SECONDS, stop_on_goal=True)
+        if result.goals and result.goals[0][1] == 0:
+            outcome.scored = True
+            outcome.time_to_goal = result.goals[0][0]
+        outcome.bot_errors = sim.hosts[0].error_count
+        sim.retire()
+    except Exception:
+        outcome.error = traceback.format_exc()
+    return outcome
+
+
+class ConfigResult:
+    def __init__(self, config: Dict[str, float]):
+        self.config = config
+        self.outcomes: List[ScenarioOutcome] = []
+
+    @property
+    def runs(self) -> int:
+        return len(self.outcomes)
+
+    @property
+    def successes(self) -> int:
+        return sum(1 for outcome in self.outcomes if outcome.scored)
+
+    @property
+    def success_rate(self) -> float:
+        return self.successes / self.runs if self.runs > 0 else 0.0
+
+    @property
+    def mean_time_to_goal(self) -> Optional[float]:
+        times = [outcome.time_to_goal for outcome in self.outcomes if outcome.scored]
+        return sum(times) / len(times) if times else None
+
+    @property
+    def bot_errors(self) -> int:
+        return sum(outcome.bot_errors for outcome in self.outcomes)
+
+    def sort_key(self):
+        """ Higher success rate first, then faster goals """
+        time_to_goal = self.mean_time_to_goal
+        return -self.success_rate, time_to_goal if time_to_goal is not None else math.inf
+
+
+class Sweep:
+    """
+    Evaluates configurations on a shared list of scenario seeds. Configurations that already played some of the
+    scenarios only play the missing ones.
+    """
+
+    def __init__(self, seed: int, max_scenarios: int, workers: int=None, bot_tick_rate: int=TICK_RATE):
+        self.seeds = [random.Random(f"{seed}-{i}").getrandbits(31) for i in range(max_scenarios)]
+        self.workers = workers
+        self.bot_tick_rate = bot_tick_rate
+        self.results: List[ConfigResult] = []
+        self._pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 else None
+
+    def add(self, configs: List[Dict[str, float]]) -> List[ConfigResult]:
+        new_results = [ConfigResult(config) for config in configs]
+        self.results += new_results
+        return new_results
+
+    def evaluate(self, results: List[ConfigResult], scenarios: int):
+        """ Makes every result have played the first scenarios scenarios """
+        jobs = [(result, seed) for result in results for seed in self.seeds[result.runs:scenarios]]
+        if not jobs:
+            return
+        configs = [result.config for result, _ in jobs]
+        seeds = [seed for _, seed in jobs]
+        rates = [self.bot_tick_rate] * len(jobs)
+        if self._pool is None:
+            outcomes = map(run_scenario, configs, seeds, rates)
+        else:
+            outcomes = self._pool.map(run_scenario, configs, seeds, rates)
+        for (result, _), outcome in zip(jobs, outcomes):
+            result.outcomes.append(outcome)
+
+    def best(self) -> ConfigResult:
+        # Prefer results that played the most scenarios, since successive halving stops evaluating the worse ones early
+        most_runs = max(result.runs for result in self.results)
+        return min((result for result in self.results if result.runs == most_runs), key=ConfigResult.sort_key)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+
+
+def grid_search(sweep: Sweep, params: List[Parameter], points: int, scenarios: int):
+    configs = [dict(zip((param.name for param in params), values))
+               for values in itertools.product(*(param.grid(points) for param in params))]
+    sweep.evaluate(sweep.add(configs), scenarios)
+
+
+def random_search(sweep: Sweep, params: List[Parameter], count: int, scenarios: int, rng: random.Random):
+    configs = [{param.name: param.sample(rng) for param in params} for _ in range(count)]
+    sweep.evaluate(sweep.add(configs), scenarios)
+
+
+def successive_halving(sweep: Sweep, params: List[Parameter], count: int, min_scenarios: int, max_scenarios: int,
+                       rng: random.Random, eta: int=3):
+    configs = [{param.name: param.sample(rng) for param in params} for _ in range(count)]
+    candidates = sweep.add(configs)
+    scenarios = min_scenarios
+    while True:
+        sweep.evaluate(candidates, scenarios)
+        if len(candidates) <= 1 or scenarios >= max_scenarios:
+            break
+        candidates = sorted(candidates, key=ConfigResult.sort_key)[:max(1, len(candidates) // eta)]
+        scenarios = min(scenarios * eta, max_scenarios)
+
+
+def write_results(sweep: Sweep, directory: Path, strategy: str, seed: int, names: List[str]):
+    directory.mkdir(parents=True, exist_ok=True)
+    ranked = sorted(sweep.results, key=lambda result: (-result.runs, result.sort_key()))
+    with open(directory / "results.csv", "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(names + ["runs", "successes", "success_rate", "mean_time_to_goal", "bot_errors"])
+        for result in ranked:
+            time_to_goal = result.mean_time_to_goal
+            writer.writerow([result.config[name] for name in names] + [
+                result.runs, result.successes, f"{result.success_rate:.4f}",
+                f"{time_to_goal:.3f}" if time_to_goal is not None else "", result.bot_errors])
+
+    best = sweep.best()
+    with open(directory / "best.json", "w") as file:
+        json.dump({
+            "strategy": strategy,
+            "seed": seed,
+            "config": best.config,
+            "runs": best.runs,
+            "success_rate": best.success_rate,
+            "mean_time_to_goal": best.mean_time_to_goal,
+        }, file, indent=4)
+
+
+def print_summary(sweep: Sweep, baseline: ConfigResult, wall_time: float, count: int=10):
+    ranked = sorted(sweep.results, key=lambda result: (-result.runs, result.sort_key()))
+    for result in ranked[:count]:
+        time_to_goal = result.mean_time_to_goal
+        marker = " (current)" if result is baseline else ""
+        print(f"{result.successes:4}/{result.runs:<4} scored, "
+              f"{f'{time_to_goal:5.2f}s' if time_to_goal is not None else '     -'} to goal  {result.config}{marker}")
+    errors = [outcome.error for result in sweep.results for outcome in result.outcomes if outcome.error]
+    if errors:
+        print(f"\n{len(errors)} scenarios could not be run. First error:\n{errors[0]}")
+    print(f"\n{len(sweep.results)} configurations, {sum(result.runs for result in sweep.results)} scenarios "
+          f"in {wall_time:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tune the bot's constants on the headless simulator")
+    parser.add_argument("--strategy", choices=["grid", "random", "halving"], default="halving")
+    parser.add_argument("--params", nargs="+", default=[param.name for param in PARAMETERS],
+                        choices=list(PARAMETERS_BY_NAME), metavar="PARAM", help="parameters to tune, default is all")
+    parser.add_argument("--points", type=int, default=3, help="values per parameter in a grid search")
+    parser.add_argument("--configs", type=int, default=27, help="configurations in a random search or successive halving")
+    parser.add_argument("--scenarios", type=int, default=27, help="scenarios per configuration, at most")
+    parser.add_argument("--min-scenarios", type=int, default=3, help="scenarios in the first round of halving")
+    parser.add_argument("--seed", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, default is one per cpu")
+    parser.add_argument("--bot-rate", type=int, default=TICK_RATE, help="bot ticks per second")
+    parser.add_argument("--out", type=Path, default=None, help="output directory")
+    args = parser.parse_args()
+
+    params = [PARAMETERS_BY_NAME[name] for name in args.params]
+    out = args.out or Path(f"sweep_{args.strategy}_{int(time.time())}")
+    rng = random.Random(args.seed)
+
+    start = time.perf_counter()
+    sweep = Sweep(args.seed, args.scenarios, args.workers, args.bot_rate)
+    baseline, = sweep.add([current_config(args.params)])
+    if args.strategy == "grid":
+        grid_search(sweep, params, args.points, args.scenarios)
+    elif args.strategy == "random":
+        random_search(sweep, params, args.configs, args.scenarios, rng)
+    else:
+        successive_halving(sweep, params, args.configs, args.min_scenarios, args.scenarios, rng)
+    sweep.evaluate([baseline], args.scenarios)
+    sweep.close()
+
+    print_summary(sweep, baseline, time.perf_counter() - start)
+    write_results(sweep, out, args.strategy, args.seed, args.params)
+    print(f"Results written to {out}")